@@ -1,21 +1,90 @@
+import argparse
+import json
 import logging
 import os
 import sys
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from application.services.benchmark.chunk_strategy_evaluation_service import SearchEvaluationService
-from application.services.indexing.indexing_service import IndexingService
+from application.services.benchmark.strategy_benchmark_runner import StrategyBenchmarkRunner
 from config.logging_config import setup_logging
 from config.settings import Settings
-from infrastructure.repositories.chroma_vector_search_repository import ChromaVectorSearchRepository
+from domain.repositories.faq_repository import FAQRepository
+from domain.repositories.product_repository import ProductRepository
+from domain.repositories.text_document_repository import TextDocumentRepository
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.embeddings.cached_embeddings import CachedEmbeddings
+from infrastructure.embeddings.embedding_factory import (
+    create_embedding_pipeline,
+    create_embeddings,
+)
+from infrastructure.embeddings.query_embedding_cache import QueryEmbeddingCache
 from infrastructure.repositories.json_faq_repository import JsonFAQRepository
 from infrastructure.repositories.json_product_repository import JsonProductRepository
+from infrastructure.repositories.plain_text_document_repository import (
+    PlainTextDocumentRepository,
+)
+from infrastructure.repositories.vector_search_repository_factory import (
+    create_vector_search_repository,
+)
+from infrastructure.rerankers.reranker_factory import create_reranker
+
+
+def create_data_repositories(
+    settings: Settings,
+) -> Tuple[ProductRepository, Optional[FAQRepository], Optional[TextDocumentRepository]]:
+    """商品・FAQ・サポート文書リポジトリを生成（ワーカープロセスからも呼ばれる）"""
+    return (
+        JsonProductRepository(settings),
+        JsonFAQRepository(settings),
+        PlainTextDocumentRepository(settings),
+    )
+
+
+def create_vector_repository(settings: Settings) -> VectorSearchRepository:
+    """組み合わせ専用のベクトル検索リポジトリを生成（ワーカープロセスからも呼ばれる）"""
+    return create_vector_search_repository(settings)
+
+
+def warm_embedding_cache(settings: Settings, texts: List[str]) -> Dict[str, Any]:
+    """全組み合わせで共通するテキストを一度だけ埋め込み、キャッシュに登録"""
+    embeddings = create_embeddings(settings)
+    if isinstance(embeddings, QueryEmbeddingCache):
+        embeddings = embeddings.embeddings
+    if not isinstance(embeddings, CachedEmbeddings):
+        return {}
+
+    pipeline = create_embedding_pipeline(settings, embeddings)
+    pipeline.run(((str(i), text, {}) for i, text in enumerate(texts)), lambda batch: None)
+    # ワーカーはキャッシュを読み取り専用で開くため、起動前に書き出しておく
+    embeddings.flush()
+    return embeddings.stats()
 
 
 def main():
     """FAQ＋商品データの統合チャンク戦略ベンチマークを実行するスクリプト"""
+    parser = argparse.ArgumentParser(description="統合チャンク戦略ベンチマーク")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="並列に評価する組み合わせ数（省略時は組み合わせ数とCPU数の小さい方）",
+    )
+    parser.add_argument(
+        "--reranker",
+        choices=["none", "lexical", "cross_encoder"],
+        default=None,
+        help="検索候補をリランキングして評価する（省略時はRERANKER）",
+    )
+    parser.add_argument(
+        "--report",
+        default=os.path.join("logs", "chunk_strategy_benchmark_report.json"),
+        help="統合レポート（JSON）の出力先",
+    )
+    args = parser.parse_args()
+
     try:
         log_dir = "logs"
         os.makedirs(log_dir, exist_ok=True)
@@ -31,34 +100,21 @@ def main():
         settings.chroma_persist_directory = str(
             Path(settings.chroma_persist_directory) / "benchmark"
         )
+        if args.reranker:
+            settings.reranker = args.reranker
         logger.info("Settings loaded successfully")
 
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
 
-        product_repo = JsonProductRepository(settings)
-        faq_repo = JsonFAQRepository(settings)
+        product_repo, faq_repo, _ = create_data_repositories(settings)
+        assert faq_repo is not None
 
         print("\n✅ データ読み込み完了")
         print(f"  - 商品数: {len(product_repo.get_all_products())}")
         print(f"  - FAQ数: {len(faq_repo.get_all_faqs())}")
         print(f"  - FAQカテゴリ: {', '.join(faq_repo.get_categories())}")
 
-        def create_vector_repo(
-            product_strategy: str, faq_strategy: str, clear_existing: bool = True
-        ):
-            collection_name = f"integrated_{product_strategy}_{faq_strategy}"
-            if clear_existing:
-                vector_repo = ChromaVectorSearchRepository(settings)
-                try:
-                    vector_repo.delete_collection()
-                    logger.info(f"Cleared existing collection: {collection_name}")
-                except Exception:
-                    pass
-                return ChromaVectorSearchRepository(settings)
-            else:
-                return ChromaVectorSearchRepository(settings)
-
         print("\n🚀 ベンチマーク開始...")
         print("以下の戦略組み合わせを比較評価します:")
 
@@ -72,66 +128,66 @@ def main():
         ]
         for product_strategy, faq_strategy in strategy_list:
             print(f"- 商品: {product_strategy.upper()} + FAQ: {faq_strategy.upper()}")
-        print("\nテストクエリ実行中...")
 
-        results = {}
-        indexing_results = {}
+        workers = args.workers or min(len(strategy_list), os.cpu_count() or 1)
+        use_shared_cache = (
+            settings.embedding_provider == "openai" and settings.embedding_cache_enabled
+        )
+        runner = StrategyBenchmarkRunner(
+            settings,
+            create_data_repositories,
+            create_vector_repository,
+            embedding_warmer=warm_embedding_cache if use_shared_cache else None,
+            max_workers=workers,
+            reranker_factory=create_reranker,
+        )
+        print(f"\n{workers}並列でインデキシングとテストクエリを実行中...")
+        report = runner.run(strategy_list, top_k=3)
 
-        for product_strategy, faq_strategy in strategy_list:
-            combination_name = f"{product_strategy}+{faq_strategy}"
+        if report["warmup"]:
+            print(
+                f"\n  - 事前埋め込み: API呼び出し {report['warmup']['api_calls']}回 "
+                f"(キャッシュヒット率: {report['warmup']['hit_rate']:.3f})"
+            )
+
+        results = report["results"]
+        for combination_name, error in report["failures"].items():
             print(f"\n--- {combination_name} ---")
-            try:
-                vector_repo = create_vector_repo(product_strategy, faq_strategy, True)
-                indexing_service = IndexingService(product_repo, settings, faq_repo)
-                print("  インデキシング中...")
-                indexing_result = indexing_service.index_data(
-                    vector_repo, product_strategy, faq_strategy
-                )
-                indexing_results[combination_name] = indexing_result
-                print(f"  - 総チャンク数: {indexing_result['total_chunks']}")
-                print(f"  - 商品チャンク: {indexing_result['product_chunks']}")
-                print(f"  - FAQチャンク: {indexing_result['faq_chunks']}")
-                print("  評価実行中...")
-                evaluation_service = SearchEvaluationService(settings)
-                eval_result = evaluation_service.evaluate_strategy(
-                    vector_repo, combination_name, top_k=3
-                )
-                results[combination_name] = eval_result
-                overall_metrics = eval_result["overall_metrics"]
-                print("  結果:")
-                print(f"    - F1スコア: {overall_metrics['avg_f1_score']:.3f}")
-                print(f"    - 精度: {overall_metrics['avg_precision']:.3f}")
-                print(f"    - 再現率: {overall_metrics['avg_recall']:.3f}")
-                print(f"    - ヒット率: {overall_metrics['hit_rate']:.3f}")
-            except Exception as e:
-                logger.error(f"Failed to benchmark {combination_name}: {e}")
-                print(f"  ❌ エラー: {e}")
-                continue
+            print(f"  ❌ エラー: {error}")
+
         print("\n📊 ベンチマーク結果分析")
-        if len(results) > 1:
-            evaluation_service = SearchEvaluationService(settings)
-            comparison = evaluation_service.compare_strategies(results)
+        comparison = report["comparison"]
+        if comparison:
             print("\n=== 最高性能戦略 ===")
             for metric, best in comparison["best_strategy"].items():
                 if isinstance(best, dict):
                     print(f"{metric}: {best['strategy']} ({best['value']:.3f})")
+        if results:
             print("\n=== 性能比較表 ===")
             print(
-                f"{'戦略組み合わせ':<20} {'F1':<6} {'精度':<6} {'再現率':<6} {'ヒット率':<6} {'チャンク数':<8}"
+                f"{'戦略組み合わせ':<20} {'F1':<6} {'精度':<6} {'再現率':<6} {'ヒット率':<6} "
+                f"{'チャンク数':<8} {'所要時間':<8}"
             )
-            print("-" * 60)
-            for combination_name, eval_result in results.items():
-                metrics = eval_result["overall_metrics"]
-                indexing_info = indexing_results.get(combination_name, {})
-                total_chunks = indexing_info.get("total_chunks", 0)
+            print("-" * 70)
+            for combination_name, result in results.items():
+                metrics = result["evaluation"]["overall_metrics"]
+                total_chunks = result["indexing"].get("total_chunks", 0)
                 print(
                     f"{combination_name:<20} "
                     f"{metrics['avg_f1_score']:<6.3f} "
                     f"{metrics['avg_precision']:<6.3f} "
                     f"{metrics['avg_recall']:<6.3f} "
                     f"{metrics['hit_rate']:<6.3f} "
-                    f"{total_chunks:<8}"
+                    f"{total_chunks:<8} "
+                    f"{result['elapsed_seconds']:<8.1f}"
                 )
+
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\n総所要時間: {report['wall_clock_seconds']:.1f}秒 ({report['workers']}並列)")
+        print(f"レポート: {args.report}")
         print("\n✅ ベンチマーク完了!")
 
     except KeyboardInterrupt:
@@ -139,7 +195,7 @@ def main():
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ エラーが発生しました: {e}")
-        logger.error(f"Integrated benchmark failed: {e}")
+        logging.getLogger(__name__).error(f"Integrated benchmark failed: {e}")
         sys.exit(1)
 
 
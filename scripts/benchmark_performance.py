@@ -0,0 +1,189 @@
+import argparse
+import dataclasses
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from application.services.benchmark.performance_benchmark_service import (
+    run_performance_benchmark,
+    summarize_results,
+)
+from application.services.benchmark.strategy_benchmark_runner import StrategyBenchmarkRunner
+from config.logging_config import setup_logging
+from config.settings import Settings
+from domain.repositories.faq_repository import FAQRepository
+from domain.repositories.product_repository import ProductRepository
+from domain.repositories.text_document_repository import TextDocumentRepository
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.repositories.json_faq_repository import JsonFAQRepository
+from infrastructure.repositories.json_product_repository import JsonProductRepository
+from infrastructure.repositories.plain_text_document_repository import (
+    PlainTextDocumentRepository,
+)
+from infrastructure.repositories.vector_search_repository_factory import (
+    create_vector_search_repository,
+)
+
+
+def create_data_repositories(
+    settings: Settings,
+) -> Tuple[ProductRepository, Optional[FAQRepository], Optional[TextDocumentRepository]]:
+    """商品・FAQ・サポート文書リポジトリを生成（ワーカープロセスからも呼ばれる）"""
+    return (
+        JsonProductRepository(settings),
+        JsonFAQRepository(settings),
+        PlainTextDocumentRepository(settings),
+    )
+
+
+def create_vector_repository(settings: Settings) -> VectorSearchRepository:
+    """組み合わせ専用のベクトル検索リポジトリを生成（ワーカープロセスからも呼ばれる）"""
+    return create_vector_search_repository(settings)
+
+
+def main():
+    """チャンク戦略ごとの検索性能（QPS・レイテンシ・資源）ベンチマークを実行するスクリプト"""
+    parser = argparse.ArgumentParser(description="検索性能ベンチマーク")
+    parser.add_argument(
+        "--embedding-provider",
+        choices=["fake", "openai"],
+        default="fake",
+        help="埋め込みプロバイダー（fakeはネットワーク不要で決定的）",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["chroma", "numpy"],
+        default=None,
+        help="ベクトルインデックスのバックエンド（省略時はVECTOR_BACKEND）",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=10,
+        help="テストクエリを言い換えで水増しする倍率",
+    )
+    parser.add_argument("--top-k", type=int, default=3, help="検索件数")
+    parser.add_argument(
+        "--report",
+        default=os.path.join("logs", "performance_benchmark_report.json"),
+        help="レポート（JSON）の出力先",
+    )
+    args = parser.parse_args()
+
+    try:
+        log_dir = "logs"
+        os.makedirs(log_dir, exist_ok=True)
+        setup_logging(log_file=os.path.join(log_dir, "performance_benchmark.log"))
+
+        print("=" * 60)
+        print("検索性能ベンチマーク実行")
+        print("=" * 60)
+
+        if args.embedding_provider == "fake":
+            # fake埋め込みはAPIを呼ばないため、キーが未設定でも実行できるようにする
+            os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+        settings = Settings.from_env()
+        settings = dataclasses.replace(
+            settings,
+            embedding_provider=args.embedding_provider,
+            # 同じクエリを繰り返し実行するため、クエリ埋め込みのキャッシュを使うと
+            # 2回目以降の検索が埋め込みを省いた値になり、戦略間の比較が歪む
+            query_embedding_cache_enabled=False,
+            vector_backend=args.backend or settings.vector_backend,
+            chroma_persist_directory=str(
+                Path(settings.chroma_persist_directory) / "performance_benchmark"
+            ),
+        )
+
+        strategy_list = [
+            ("unified", "qa_pair"),
+            ("section", "qa_pair"),
+            ("granular", "qa_pair"),
+            ("section", "qa_separate"),
+            ("granular", "qa_separate"),
+            ("unified", "category_unified"),
+        ]
+        print(
+            f"\n埋め込み: {settings.embedding_provider} / バックエンド: {settings.vector_backend} "
+            f"/ クエリ倍率: {args.scale}"
+        )
+
+        # ピークRSSを組み合わせごとに計測するため、組み合わせごとに新しいプロセスで
+        # 1つずつ実行する（並列実行するとレイテンシも互いに干渉する）
+        results: Dict[str, Dict[str, Any]] = {}
+        failures: Dict[str, str] = {}
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+            for product_strategy, faq_strategy in strategy_list:
+                name = StrategyBenchmarkRunner.combination_name(product_strategy, faq_strategy)
+                print(f"- {name} を計測中...")
+                future = executor.submit(
+                    run_performance_benchmark,
+                    create_data_repositories,
+                    create_vector_repository,
+                    settings,
+                    product_strategy,
+                    faq_strategy,
+                    args.scale,
+                    args.top_k,
+                )
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"  ❌ エラー: {e}")
+                    failures[name] = str(e)
+
+        if results:
+            print("\n=== 性能比較表 ===")
+            print(
+                f"{'戦略組み合わせ':<24} {'チャンク':>8} {'構築(s)':>8} {'サイズ(KB)':>10} "
+                f"{'QPS':>8} {'一括QPS':>9} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} "
+                f"{'RSS(MB)':>8}"
+            )
+            print("-" * 109)
+            for name, result in results.items():
+                latency = result["latency_ms"]
+                print(
+                    f"{name:<24} "
+                    f"{result['total_chunks']:>8} "
+                    f"{result['build_seconds']:>8.2f} "
+                    f"{result['index_size_bytes'] / 1024:>10.1f} "
+                    f"{result['qps']:>8.1f} "
+                    f"{result['batch_qps']:>9.1f} "
+                    f"{latency['p50_ms']:>8.2f} "
+                    f"{latency['p95_ms']:>8.2f} "
+                    f"{latency['p99_ms']:>8.2f} "
+                    f"{result['peak_rss_mb']:>8.1f}"
+                )
+
+        report = {
+            "embedding_provider": settings.embedding_provider,
+            "vector_backend": settings.vector_backend,
+            "scale": args.scale,
+            "top_k": args.top_k,
+            "results": results,
+            "failures": failures,
+            "summary": summarize_results(results),
+        }
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\nレポート: {args.report}")
+        print("\n✅ ベンチマーク完了!")
+
+    except KeyboardInterrupt:
+        print("\n❌ ベンチマークが中断されました")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラーが発生しました: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
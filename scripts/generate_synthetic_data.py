@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from application.services.benchmark.synthetic_catalog_generator import SyntheticCatalogGenerator
+from infrastructure.repositories.json_stream_writer import write_json_records
+
+
+def main():
+    """
+    スケールテスト用の合成データ生成スクリプト
+
+    - products_master.json / faq_database.json / test_queries.json と同じ形式で出力する
+    - 商品・FAQは逐次書き出すため、100万件規模でもメモリ使用量は一定
+    - 同じシードからは常に同じデータが生成される
+    """
+    parser = argparse.ArgumentParser(description="TechMart 合成カタログ生成")
+    parser.add_argument("--products", type=int, default=10000, help="生成する商品数")
+    parser.add_argument(
+        "--faqs",
+        type=int,
+        default=None,
+        help="生成する商品FAQ数（省略時は商品10件につき1件、固定FAQは別に追加）",
+    )
+    parser.add_argument("--queries", type=int, default=100, help="生成するテストクエリ数")
+    parser.add_argument("--seed", type=int, default=42, help="乱数シード")
+    parser.add_argument(
+        "--output-dir",
+        default=os.path.join("data", "synthetic"),
+        help="出力先ディレクトリ（DATA_DIRに指定して利用する）",
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="商品・FAQをJSON Lines形式（.jsonl）で出力する",
+    )
+    args = parser.parse_args()
+
+    try:
+        start = time.perf_counter()
+        output_dir = Path(args.output_dir)
+        suffix = ".jsonl" if args.jsonl else ".json"
+        products_path = output_dir / f"products_master{suffix}"
+        faqs_path = output_dir / f"faq_database{suffix}"
+
+        generator = SyntheticCatalogGenerator(args.products, args.faqs, seed=args.seed)
+
+        print(f"商品を生成中... ({args.products:,}件)")
+        product_count = write_json_records(products_path, "products", generator.iter_products())
+
+        print(f"FAQを生成中... ({generator.total_faq_count:,}件)")
+        faq_count = write_json_records(faqs_path, "faqs", generator.iter_faqs())
+
+        print(f"テストクエリを生成中... ({args.queries:,}件)")
+        test_queries_path = output_dir / "test_queries.json"
+        with open(test_queries_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"test_queries": generator.generate_test_queries(args.queries)},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+        print(f"\n✅ 生成完了 ({time.perf_counter() - start:.1f}秒)")
+        print(f"  - 商品: {products_path} ({product_count:,}件)")
+        print(f"  - FAQ: {faqs_path} ({faq_count:,}件)")
+        print(f"  - テストクエリ: {test_queries_path}")
+        print(
+            f"\n利用例: DATA_DIR={output_dir} PRODUCTS_FILE={products_path.name} "
+            f"FAQ_FILE={faqs_path.name} python scripts/benchmark_performance.py"
+        )
+
+    except KeyboardInterrupt:
+        print("\n❌ 生成が中断されました")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラーが発生しました: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
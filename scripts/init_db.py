@@ -1,10 +1,17 @@
+import argparse
 import logging
+from pathlib import Path
 
 from application.services.indexing.indexing_service import IndexingService
 from config.settings import Settings
-from infrastructure.repositories.chroma_vector_search_repository import ChromaVectorSearchRepository
 from infrastructure.repositories.json_faq_repository import JsonFAQRepository
 from infrastructure.repositories.json_product_repository import JsonProductRepository
+from infrastructure.repositories.plain_text_document_repository import (
+    PlainTextDocumentRepository,
+)
+from infrastructure.repositories.vector_search_repository_factory import (
+    create_vector_search_repository,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,26 +22,67 @@ def main():
     DB初期化スクリプト
 
     - 既存Chromaコレクションを削除し、再生成する
+    - --incremental指定時は削除せず、前回のマニフェストとの差分のみを反映する
     - 実行後、DBはアプリケーションのエントリポイントからそのまま利用可能な状態になる
+    - --snapshot指定時は構築したインデックスのスナップショットを書き出す
+      （INDEX_SNAPSHOT_DIRに指定すると、他の環境で再インデックスなしに起動できる）
     """
+    parser = argparse.ArgumentParser(description="TechMart ベクトルDB初期化")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="コレクションを削除せず、変更のあったチャンクのみを再インデックス化する",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        default=None,
+        help="インデックス化後にスナップショットを書き出すディレクトリ",
+    )
+    args = parser.parse_args()
+
     logger.info("初期化処理を開始します...")
     settings = Settings.from_env()
     product_repo = JsonProductRepository(settings)
     faq_repo = JsonFAQRepository(settings)
-    vector_repo = ChromaVectorSearchRepository(settings)
-    indexing_service = IndexingService(product_repo, settings, faq_repo)
+    vector_repo = create_vector_search_repository(settings)
+    support_repo = PlainTextDocumentRepository(settings)
+    indexing_service = IndexingService(product_repo, settings, faq_repo, support_repo)
 
-    logger.info("既存Chromaコレクションを削除します...")
-    vector_repo.delete_collection()
+    if not args.incremental:
+        logger.info("既存コレクションを削除します...")
+        vector_repo.delete_collection()
+        vector_repo = create_vector_search_repository(settings)
 
     logger.info("GRANULAR商品戦略xQA_PAIR FAQ戦略でインデックス化を実行します...")
     result = indexing_service.index_data(
-        vector_repo, product_strategy="granular", faq_strategy="qa_pair"
+        vector_repo,
+        product_strategy="granular",
+        faq_strategy="qa_pair",
+        incremental=args.incremental,
     )
     logger.info(f"インデックス化完了: {result}")
     print("DB初期化が完了しました。詳細:")
+    print(
+        f"  追加: {result['added_chunks']}, 更新: {result['updated_chunks']}, "
+        f"削除: {result['deleted_chunks']}, 変更なし: {result['unchanged_chunks']}"
+    )
+    print(
+        f"  商品: {result['product_chunks']}, FAQ: {result['faq_chunks']}, "
+        f"サポート: {result['support_chunks']}"
+    )
+    for phase, seconds in result["phase_timings"].items():
+        print(f"  {phase}: {seconds:.3f}s")
     print(result)
 
+    if args.snapshot:
+        logger.info(f"スナップショットを作成します: {args.snapshot}")
+        snapshot = indexing_service.create_snapshot(vector_repo, args.snapshot)
+        print(
+            f"スナップショットを作成しました: {snapshot['directory']} "
+            f"({snapshot['document_count']}件, {snapshot['size_bytes'] / 1024 / 1024:.1f}MB)"
+        )
+
 
 if __name__ == "__main__":
     main()
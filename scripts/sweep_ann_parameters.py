@@ -0,0 +1,362 @@
+import argparse
+import dataclasses
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from application.services.benchmark.chunk_strategy_evaluation_service import (
+    SearchEvaluationService,
+)
+from application.services.indexing.indexing_service import IndexingService
+from config.logging_config import setup_logging
+from config.settings import Settings
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.embeddings.embedding_factory import create_embeddings
+from infrastructure.repositories.json_faq_repository import JsonFAQRepository
+from infrastructure.repositories.json_product_repository import JsonProductRepository
+from infrastructure.repositories.plain_text_document_repository import (
+    PlainTextDocumentRepository,
+)
+from infrastructure.repositories.vector_search_repository_factory import (
+    create_vector_search_repository,
+)
+
+PLOT_WIDTH = 60
+PLOT_HEIGHT = 16
+POINT_MARKS = "123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def parse_ints(value: str) -> List[int]:
+    """カンマ区切りの整数リストを解析"""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def parse_names(value: str) -> List[str]:
+    """カンマ区切りの名前リストを解析"""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class SweepIndexes:
+    """スイープ用のインデックスを構築・再利用する
+
+    構築時にのみ反映されるパラメーター（HNSWの M / ef_construction）の組み合わせごとに
+    インデックスを1回だけ構築し、検索時のパラメーター（ef_search / nprobe）は
+    構築済みのリポジトリに設定して切り替える。NumPyバックエンドのIVFは全件探索用の
+    インデックスを読み込んで学習するため、再構築は不要。量子化も同様に全件探索用の
+    インデックスを読み込み、読み込み時にコードを作成する
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        product_strategy: str,
+        faq_strategy: str,
+    ):
+        self.settings = settings
+        self.product_strategy = product_strategy
+        self.faq_strategy = faq_strategy
+        self.embeddings = create_embeddings(settings)
+        self.product_repo = JsonProductRepository(settings)
+        self.faq_repo = JsonFAQRepository(settings)
+        self.support_repo = PlainTextDocumentRepository(settings)
+        self._repositories: Dict[Tuple[Any, ...], VectorSearchRepository] = {}
+
+    def repository(self, parameters: Dict[str, Any]) -> VectorSearchRepository:
+        """スイープの1設定で検索するリポジトリを取得"""
+        if parameters.get("index") == "exact":
+            return self.exact()
+        if "hnsw_m" in parameters:
+            return self.hnsw(parameters)
+        if "vector_quantization" in parameters:
+            return self.quantized(parameters)
+        return self.ivf(parameters)
+
+    def exact(self) -> VectorSearchRepository:
+        """全件探索（NumPy）のインデックスを取得（再現率の基準）"""
+        key: Tuple[Any, ...] = ("exact",)
+        if key not in self._repositories:
+            self._repositories[key] = self._build(
+                "exact", {"vector_backend": "numpy", "numpy_index_type": "flat"}
+            )
+        return self._repositories[key]
+
+    def hnsw(self, parameters: Dict[str, Any]) -> VectorSearchRepository:
+        """指定したHNSWパラメーターのChromaコレクションを取得"""
+        m, ef_construction = parameters["hnsw_m"], parameters["hnsw_ef_construction"]
+        key = ("hnsw", m, ef_construction)
+        if key not in self._repositories:
+            self._repositories[key] = self._build(
+                f"hnsw_m{m}_efc{ef_construction}",
+                {
+                    "vector_backend": "chroma",
+                    "hnsw_m": m,
+                    "hnsw_ef_construction": ef_construction,
+                    "hnsw_ef_search": parameters["hnsw_ef_search"],
+                },
+            )
+        vector_repo = self._repositories[key]
+        vector_repo.set_ef_search(parameters["hnsw_ef_search"])  # type: ignore[attr-defined]
+        return vector_repo
+
+    def ivf(self, parameters: Dict[str, Any]) -> VectorSearchRepository:
+        """全件探索用のインデックスを読み込み、指定したクラスタ数でIVFを構成"""
+        nlist = parameters["ivf_nlist"]
+        key = ("ivf", nlist)
+        if key not in self._repositories:
+            exact_settings = self._index_settings("exact", {})
+            self.exact()
+            self._repositories[key] = create_vector_search_repository(
+                dataclasses.replace(
+                    exact_settings,
+                    vector_backend="numpy",
+                    numpy_index_type="ivf",
+                    ivf_nlist=nlist,
+                    ivf_nprobe=parameters["ivf_nprobe"],
+                ),
+                self.embeddings,
+            )
+        vector_repo = self._repositories[key]
+        vector_repo.set_nprobe(parameters["ivf_nprobe"])  # type: ignore[attr-defined]
+        return vector_repo
+
+    def quantized(self, parameters: Dict[str, Any]) -> VectorSearchRepository:
+        """全件探索用のインデックスを読み込み、指定した量子化で検索するリポジトリを取得"""
+        key = (
+            "quantized",
+            parameters["vector_quantization"],
+            parameters["vector_quantization_dimensions"],
+            parameters["vector_rescore_multiplier"],
+        )
+        if key not in self._repositories:
+            exact_settings = self._index_settings("exact", {})
+            self.exact()
+            self._repositories[key] = create_vector_search_repository(
+                dataclasses.replace(
+                    exact_settings,
+                    vector_backend="numpy",
+                    numpy_index_type="flat",
+                    vector_quantization=parameters["vector_quantization"],
+                    vector_quantization_dimensions=parameters["vector_quantization_dimensions"],
+                    vector_rescore_multiplier=parameters["vector_rescore_multiplier"],
+                ),
+                self.embeddings,
+            )
+        return self._repositories[key]
+
+    def _index_settings(self, name: str, overrides: Dict[str, Any]) -> Settings:
+        """インデックスごとの保存先・コレクション名を持つ設定を作成"""
+        return dataclasses.replace(
+            self.settings,
+            chroma_persist_directory=str(Path(self.settings.chroma_persist_directory) / name),
+            chroma_collection_name=f"ann_sweep_{name}",
+            numpy_index_directory="",
+            **overrides,
+        )
+
+    def _build(self, name: str, overrides: Dict[str, Any]) -> VectorSearchRepository:
+        """インデックスを作り直して構築"""
+        settings = self._index_settings(name, overrides)
+        print(f"- インデックスを構築中: {name}")
+        create_vector_search_repository(settings, self.embeddings).delete_collection()
+        vector_repo = create_vector_search_repository(settings, self.embeddings)
+        IndexingService(self.product_repo, settings, self.faq_repo, self.support_repo).index_data(
+            vector_repo, self.product_strategy, self.faq_strategy
+        )
+        return vector_repo
+
+
+def render_plot(points: List[Dict[str, Any]], quality_key: str) -> List[str]:
+    """p50レイテンシ（横軸）と再現率・ヒット率（縦軸）の散布図をテキストで描画"""
+    latencies = [point["latency_ms"]["p50_ms"] for point in points]
+    qualities = [point[quality_key] for point in points]
+    min_x, max_x = min(latencies), max(latencies)
+    min_y, max_y = min(min(qualities), 1.0), max(qualities)
+    span_x = (max_x - min_x) or 1.0
+    span_y = (max_y - min_y) or 1.0
+
+    grid = [[" "] * PLOT_WIDTH for _ in range(PLOT_HEIGHT)]
+    for i, (x, y) in enumerate(zip(latencies, qualities)):
+        column = round((x - min_x) / span_x * (PLOT_WIDTH - 1))
+        row = PLOT_HEIGHT - 1 - round((y - min_y) / span_y * (PLOT_HEIGHT - 1))
+        grid[row][column] = POINT_MARKS[i % len(POINT_MARKS)]
+
+    lines = []
+    for row, cells in enumerate(grid):
+        label = f"{max_y:6.3f}" if row == 0 else f"{min_y:6.3f}" if row == PLOT_HEIGHT - 1 else ""
+        lines.append(f"{label:>6} |{''.join(cells)}")
+    lines.append(f"{'':>6} +{'-' * PLOT_WIDTH}")
+    lines.append(f"{'':>6}  {min_x:<.2f}ms{max_x:>{PLOT_WIDTH - 8}.2f}ms  (p50レイテンシ)")
+    return lines
+
+
+def main():
+    """ANNインデックスのパラメーターごとの再現率とレイテンシを比較するスクリプト"""
+    parser = argparse.ArgumentParser(description="ANNパラメータースイープ")
+    parser.add_argument(
+        "--backend",
+        choices=["chroma", "numpy"],
+        default=None,
+        help="スイープするバックエンド（chroma: HNSW / numpy: IVF。省略時はVECTOR_BACKEND）",
+    )
+    parser.add_argument("--product-strategy", default="granular", help="商品のチャンク戦略")
+    parser.add_argument("--faq-strategy", default="qa_pair", help="FAQのチャンク戦略")
+    parser.add_argument("--m", type=parse_ints, default="8,16,32", help="HNSWの M（カンマ区切り）")
+    parser.add_argument(
+        "--ef-construction", type=parse_ints, default="100", help="HNSWの ef_construction"
+    )
+    parser.add_argument(
+        "--ef-search", type=parse_ints, default="10,20,50,100,200", help="HNSWの ef_search"
+    )
+    parser.add_argument(
+        "--nlist", type=parse_ints, default="0", help="IVFのクラスタ数（0は行数から自動決定）"
+    )
+    parser.add_argument(
+        "--nprobe", type=parse_ints, default="1,2,4,8,16,32", help="IVFの探索クラスタ数"
+    )
+    parser.add_argument(
+        "--quantization",
+        type=parse_names,
+        default=None,
+        help="量子化の比較（none,float16,int8,binary のカンマ区切り。指定時はnumpyバックエンド）",
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=parse_ints,
+        default="0",
+        help="量子化時に使う先頭の次元数（Matryoshka。0は全次元）",
+    )
+    parser.add_argument(
+        "--rescore",
+        type=parse_ints,
+        default="0,4",
+        help="全精度で再スコアリングする候補の倍率（0は再スコアリングなし）",
+    )
+    parser.add_argument("--top-k", type=int, default=3, help="検索件数")
+    parser.add_argument("--repeats", type=int, default=3, help="レイテンシ計測の繰り返し回数")
+    parser.add_argument(
+        "--report",
+        default=os.path.join("logs", "ann_sweep_report.json"),
+        help="レポート（JSON）の出力先",
+    )
+    args = parser.parse_args()
+
+    try:
+        log_dir = "logs"
+        os.makedirs(log_dir, exist_ok=True)
+        setup_logging(log_file=os.path.join(log_dir, "ann_sweep.log"))
+
+        print("=" * 60)
+        print("ANNパラメータースイープ実行")
+        print("=" * 60)
+
+        settings = Settings.from_env()
+        backend = "numpy" if args.quantization else args.backend or settings.vector_backend
+        settings = dataclasses.replace(
+            settings,
+            hybrid_search_enabled=False,
+            index_snapshot_directory="",
+            chroma_persist_directory=str(Path(settings.chroma_persist_directory) / "ann_sweep"),
+        )
+        indexes = SweepIndexes(settings, args.product_strategy, args.faq_strategy)
+
+        exact = {"index": "exact"}
+        if args.quantization:
+            grid = [exact] + [
+                {
+                    "vector_quantization": method,
+                    "vector_quantization_dimensions": dimensions,
+                    "vector_rescore_multiplier": multiplier,
+                }
+                for method in args.quantization
+                for dimensions in args.dimensions
+                for multiplier in args.rescore
+                if method != "none" or dimensions
+            ]
+        elif backend == "chroma":
+            grid = [exact] + [
+                {"hnsw_m": m, "hnsw_ef_construction": ef_construction, "hnsw_ef_search": ef}
+                for m in args.m
+                for ef_construction in args.ef_construction
+                for ef in args.ef_search
+            ]
+        else:
+            grid = [exact] + [
+                {"ivf_nlist": nlist, "ivf_nprobe": nprobe}
+                for nlist in args.nlist
+                for nprobe in args.nprobe
+            ]
+        print(f"\nバックエンド: {backend} / 設定数: {len(grid)} / 基準: 全件探索（index=exact）")
+
+        evaluation_service = SearchEvaluationService(settings)
+        sweep = evaluation_service.sweep_search_parameters(
+            indexes.repository,
+            grid,
+            top_k=args.top_k,
+            reference_parameters=exact,
+            repeats=args.repeats,
+        )
+        points = sweep["points"]
+
+        print("\n=== 再現率とレイテンシ ===")
+        print(
+            f"{'#':<3} {'設定':<48} {'再現率@k':>9} {'ヒット率':>8} "
+            f"{'p50(ms)':>8} {'p95(ms)':>8} {'QPS':>8}"
+        )
+        print("-" * 100)
+        for i, point in enumerate(points):
+            latency = point["latency_ms"]
+            print(
+                f"{POINT_MARKS[i % len(POINT_MARKS)]:<3} {point['label']:<48} "
+                f"{point['recall_at_k']:>9.3f} {point['hit_rate']:>8.3f} "
+                f"{latency['p50_ms']:>8.2f} {latency['p95_ms']:>8.2f} {point['qps']:>8.1f}"
+            )
+
+        if all(point.get("deltas") and point["memory"] for point in points):
+            print("\n=== 基準（全件探索）との差分 ===")
+            print(
+                f"{'#':<3} {'設定':<48} {'メモリ(MB)':>10} {'圧縮率':>7} "
+                f"{'再現率差':>9} {'ヒット率差':>10}"
+            )
+            print("-" * 100)
+            for i, point in enumerate(points):
+                memory, deltas = point["memory"], point["deltas"]
+                print(
+                    f"{POINT_MARKS[i % len(POINT_MARKS)]:<3} {point['label']:<48} "
+                    f"{memory['search_bytes'] / 1024 / 1024:>10.2f} "
+                    f"{memory['compression_ratio']:>6.1f}x "
+                    f"{deltas['recall_at_k']:>+9.3f} {deltas['hit_rate']:>+10.3f}"
+                )
+
+        print(f"\n=== 再現率@{args.top_k} とp50レイテンシ ===")
+        for line in render_plot(points, "recall_at_k"):
+            print(line)
+        print("\n=== ヒット率とp50レイテンシ ===")
+        for line in render_plot(points, "hit_rate"):
+            print(line)
+
+        print("\nパレート最適な設定（速い順）:")
+        for label in sweep["pareto_front"]:
+            print(f"  - {label}")
+
+        report = {"backend": backend, **sweep}
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"\nレポート: {args.report}")
+        print("\n✅ スイープ完了!")
+
+    except KeyboardInterrupt:
+        print("\n❌ スイープが中断されました")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラーが発生しました: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from application.services.rag.query_cache_warm_up import warm_up_query_cache
+from config.logging_config import setup_logging
+from config.settings import Settings
+from infrastructure.embeddings.embedding_factory import create_embeddings
+from infrastructure.embeddings.query_embedding_cache import QueryEmbeddingCache
+
+
+def main():
+    """
+    クエリ埋め込みのキャッシュを事前に作成するスクリプト
+
+    - 過去の頻出クエリ上位N件と test_queries.json のクエリを埋め込み、永続キャッシュに保存する
+    - 起動直後の検索でも埋め込みAPIの往復を省けるよう、デプロイ時に実行しておく
+    """
+    parser = argparse.ArgumentParser(description="クエリ埋め込みキャッシュのウォームアップ")
+    parser.add_argument(
+        "--top-n",
+        type=int,
+        default=None,
+        help="事前に埋め込む頻出クエリの件数（省略時はQUERY_WARM_UP_TOP_N）",
+    )
+    parser.add_argument(
+        "--no-test-queries",
+        action="store_true",
+        help="test_queries.json のクエリを含めない",
+    )
+    args = parser.parse_args()
+
+    try:
+        log_dir = "logs"
+        os.makedirs(log_dir, exist_ok=True)
+        setup_logging(log_file=os.path.join(log_dir, "warm_query_cache.log"))
+
+        settings = Settings.from_env()
+        embeddings = create_embeddings(settings)
+        if not isinstance(embeddings, QueryEmbeddingCache):
+            print("❌ クエリ埋め込みのキャッシュが無効です（QUERY_EMBEDDING_CACHE_ENABLED）")
+            sys.exit(1)
+        if embeddings.store is None:
+            print("⚠️  永続キャッシュが無効のため、結果はこのプロセス内でのみ有効です")
+
+        result = warm_up_query_cache(
+            settings, embeddings, args.top_n, include_test_queries=not args.no_test_queries
+        )
+        stats = embeddings.stats()
+
+        print(f"対象クエリ: {result['queries']}件")
+        print(
+            f"新たに埋め込み: {result['embedded']}件 / キャッシュ済み: {result['already_cached']}件"
+        )
+        print(f"所要時間: {result['elapsed_ms']:.0f}ms")
+        print(f"キャッシュ件数: {stats['persistent_entries'] or stats['entries']}件")
+        if stats["avg_remote_ms"]:
+            print(
+                "1クエリあたりの埋め込み時間（削減できる検索レイテンシ）: "
+                f"{stats['avg_remote_ms']:.1f}ms"
+            )
+        print("\n✅ ウォームアップ完了!")
+
+    except KeyboardInterrupt:
+        print("\n❌ ウォームアップが中断されました")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ エラーが発生しました: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from application.services.rag.rerank_service import RerankService
 from config.settings import Settings
 from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.tracing.tracer import LatencyHistogram
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +42,17 @@ class SearchEvaluationService:
             raise RuntimeError(f"Failed to load test queries: {e}")
 
     def evaluate_strategy(
-        self, vector_repo: VectorSearchRepository, strategy_name: str, top_k: int = 3
+        self,
+        vector_repo: VectorSearchRepository,
+        strategy_name: str,
+        top_k: int = 3,
+        rerank_service: Optional[RerankService] = None,
     ) -> Dict[str, Any]:
-        """指定戦略の検索精度を評価"""
+        """指定戦略の検索精度を評価
+
+        rerank_serviceを指定した場合、rerank_candidates 件の候補をリランキングした
+        上位 top_k 件で評価する
+        """
         try:
             logger.info(f"Evaluating strategy: {strategy_name}")
 
@@ -51,7 +62,19 @@ class SearchEvaluationService:
             total_f1 = 0.0
             relevant_found = 0
 
-            for test_query in self.test_queries:
+            queries = [test_query["query"] for test_query in self.test_queries]
+            if rerank_service is None:
+                batch_results = vector_repo.search_batch(queries, top_k)
+            else:
+                candidates = vector_repo.search_batch(
+                    queries, max(self.settings.rerank_candidates, top_k)
+                )
+                batch_results = [
+                    rerank_service.rerank(query, documents, top_k)
+                    for query, documents in zip(queries, candidates)
+                ]
+
+            for test_query, search_results in zip(self.test_queries, batch_results):
                 query_id = test_query["query_id"]
                 query_text = test_query["query"]
                 query_type = test_query["query_type"]
@@ -60,8 +83,6 @@ class SearchEvaluationService:
                 expected_faqs = set(test_query.get("expected_faqs", []))
 
                 try:
-                    search_results = vector_repo.search(query_text, top_k)
-
                     found_products = set()
                     found_faqs = set()
 
@@ -109,6 +130,7 @@ class SearchEvaluationService:
                                 "data_type": doc.metadata.get("data_type", "product"),
                                 "chunk_section": doc.metadata.get("chunk_section", "unknown"),
                                 "score": doc.score,
+                                "rerank_score": doc.metadata.get("rerank_score"),
                                 "text_preview": doc.page_content[:100] + "...",
                             }
                             for doc in search_results
@@ -131,6 +153,7 @@ class SearchEvaluationService:
                 "strategy": strategy_name,
                 "total_queries": num_queries,
                 "top_k": top_k,
+                "reranker": rerank_service.reranker.name if rerank_service else None,
                 "overall_metrics": {
                     "avg_precision": (total_precision / num_queries if num_queries > 0 else 0.0),
                     "avg_recall": (total_recall / num_queries if num_queries > 0 else 0.0),
@@ -140,6 +163,8 @@ class SearchEvaluationService:
                 "query_type_breakdown": self._analyze_by_query_type(query_results),
                 "detailed_results": query_results,
             }
+            if rerank_service is not None:
+                evaluation_result["rerank_stats"] = rerank_service.stats()
 
             logger.info(
                 f"Strategy {strategy_name} evaluation completed - "
@@ -153,6 +178,158 @@ class SearchEvaluationService:
             logger.error(f"Failed to evaluate strategy {strategy_name}: {e}")
             raise RuntimeError(f"Evaluation failed: {e}")
 
+    def sweep_search_parameters(
+        self,
+        repository_factory: Callable[[Dict[str, Any]], VectorSearchRepository],
+        parameter_grid: List[Dict[str, Any]],
+        top_k: int = 3,
+        reference_parameters: Optional[Dict[str, Any]] = None,
+        repeats: int = 3,
+    ) -> Dict[str, Any]:
+        """検索パラメーター（ANNの探索幅など）ごとのヒット率とレイテンシを計測
+
+        repository_factory にパラメーターを渡し、その設定で検索するリポジトリを受け取る。
+        各設定でテストクエリを1件ずつ repeats 回検索したレイテンシ（クエリ埋め込みは
+        キャッシュ済み）と、evaluate_strategy のヒット率・F1を記録する。
+        reference_parameters（全件探索など）を指定した場合、その検索結果の上位 top_k 件の
+        うち各設定で見つかった割合を recall_at_k として記録する。
+        リポジトリが memory_stats() を持つ場合（NumPyバックエンド）は検索時に走査する
+        ベクトルのバイト数も記録し、reference_parameters と同じ設定がグリッドにあれば
+        各設定の基準からのヒット率・再現率・メモリの差分を deltas として記録する。
+        再現率（recall_at_k、なければヒット率）とp50レイテンシのパレート最適な設定も返す
+        """
+        try:
+            queries = [test_query["query"] for test_query in self.test_queries]
+            if not queries:
+                raise ValueError("No test queries to sweep")
+
+            reference_ids: Optional[List[List[str]]] = None
+            if reference_parameters is not None:
+                reference_repo = repository_factory(reference_parameters)
+                reference_ids = [
+                    [doc.doc_id for doc in documents]
+                    for documents in reference_repo.search_batch(queries, top_k)
+                ]
+
+            points = []
+            for parameters in parameter_grid:
+                label = self.parameters_label(parameters)
+                vector_repo = repository_factory(parameters)
+
+                # インデックスの学習・読み込みとクエリ埋め込みを計測から除くため一巡しておく
+                for query in queries:
+                    vector_repo.search(query, top_k)
+
+                histogram = LatencyHistogram(window_size=len(queries) * repeats)
+                latencies_ms = []
+                results: List[List[str]] = []
+                for repeat in range(repeats):
+                    for query in queries:
+                        start = time.perf_counter()
+                        documents = vector_repo.search(query, top_k)
+                        latency_ms = (time.perf_counter() - start) * 1000
+                        histogram.record(latency_ms)
+                        latencies_ms.append(latency_ms)
+                        if repeat == 0:
+                            results.append([doc.doc_id for doc in documents])
+
+                evaluation = self.evaluate_strategy(vector_repo, label, top_k=top_k)
+                point: Dict[str, Any] = {
+                    "label": label,
+                    "parameters": dict(parameters),
+                    "hit_rate": evaluation["overall_metrics"]["hit_rate"],
+                    "avg_f1_score": evaluation["overall_metrics"]["avg_f1_score"],
+                    "recall_at_k": (
+                        self._overlap_rate(reference_ids, results)
+                        if reference_ids is not None
+                        else None
+                    ),
+                    "latency_ms": {
+                        "mean": sum(latencies_ms) / len(latencies_ms),
+                        **histogram.summary(),
+                    },
+                    "qps": len(latencies_ms) / (sum(latencies_ms) / 1000),
+                }
+                memory_stats = getattr(vector_repo, "memory_stats", None)
+                point["memory"] = memory_stats() if callable(memory_stats) else None
+                points.append(point)
+                logger.info(
+                    f"Sweep point {label} - Hit Rate: {point['hit_rate']:.3f}, "
+                    f"p50: {point['latency_ms']['p50_ms']:.2f}ms"
+                )
+
+            reference_point = next(
+                (point for point in points if point["parameters"] == reference_parameters), None
+            )
+            if reference_point is not None:
+                for point in points:
+                    point["deltas"] = self._deltas(point, reference_point)
+
+            return {
+                "top_k": top_k,
+                "queries": len(queries),
+                "repeats": repeats,
+                "reference": reference_parameters,
+                "points": points,
+                "pareto_front": self._pareto_front(points),
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to sweep search parameters: {e}")
+            raise RuntimeError(f"Search parameter sweep failed: {e}")
+
+    @staticmethod
+    def parameters_label(parameters: Dict[str, Any]) -> str:
+        """パラメーターの表示名を取得"""
+        return ", ".join(f"{name}={value}" for name, value in parameters.items()) or "default"
+
+    @staticmethod
+    def _deltas(point: Dict[str, Any], reference: Dict[str, Any]) -> Dict[str, Any]:
+        """基準の設定からのヒット率・再現率・メモリの差分"""
+        deltas: Dict[str, Any] = {
+            "hit_rate": point["hit_rate"] - reference["hit_rate"],
+            "recall_at_k": (
+                point["recall_at_k"] - reference["recall_at_k"]
+                if point["recall_at_k"] is not None and reference["recall_at_k"] is not None
+                else None
+            ),
+            "search_bytes": None,
+            "memory_ratio": None,
+        }
+        if point["memory"] and reference["memory"]:
+            deltas["search_bytes"] = (
+                point["memory"]["search_bytes"] - reference["memory"]["search_bytes"]
+            )
+            if reference["memory"]["search_bytes"]:
+                deltas["memory_ratio"] = (
+                    point["memory"]["search_bytes"] / reference["memory"]["search_bytes"]
+                )
+        return deltas
+
+    @staticmethod
+    def _overlap_rate(reference_ids: List[List[str]], result_ids: List[List[str]]) -> float:
+        """基準の検索結果のうち、見つかったドキュメントの割合の平均"""
+        rates = [
+            len(set(reference) & set(result)) / len(reference)
+            for reference, result in zip(reference_ids, result_ids)
+            if reference
+        ]
+        return sum(rates) / len(rates) if rates else 0.0
+
+    @staticmethod
+    def _pareto_front(points: List[Dict[str, Any]]) -> List[str]:
+        """再現率を下げずにこれ以上速くできない設定を、速い順に取得"""
+        front = []
+        best_quality = -1.0
+        for point in sorted(points, key=lambda p: p["latency_ms"]["p50_ms"]):
+            quality = (
+                point["recall_at_k"] if point["recall_at_k"] is not None else point["hit_rate"]
+            )
+            if quality > best_quality:
+                front.append(point["label"])
+                best_quality = quality
+        return front
+
     def _calculate_metrics(self, expected: set, found: set) -> Tuple[float, float, float]:
         """Precision, Recall, F1スコアを計算"""
         if len(found) == 0:
@@ -0,0 +1,196 @@
+import logging
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from application.services.benchmark.chunk_strategy_evaluation_service import (
+    SearchEvaluationService,
+)
+from application.services.benchmark.strategy_benchmark_runner import (
+    DataRepositoryFactory,
+    StrategyBenchmarkRunner,
+    VectorRepositoryFactory,
+)
+from application.services.indexing.indexing_service import IndexingService
+from config.settings import Settings
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.tracing.tracer import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# テストクエリを水増しする際の言い換えテンプレート
+QUERY_VARIANT_TEMPLATES = [
+    "{query}",
+    "{query}について教えてください",
+    "{query}を詳しく知りたい",
+    "{query}？",
+    "質問です。{query}",
+    "{query}はどうなっていますか",
+    "{query} 比較",
+    "{query}の注意点",
+]
+
+
+class PerformanceBenchmarkService:
+    """検索性能（速度・資源）のベンチマークサービス
+
+    test_queries.json（および言い換えで水増ししたクエリ）を任意の
+    VectorSearchRepositoryに対して実行し、QPS・レイテンシのパーセンタイル・
+    インデックス構築時間・ディスク上のサイズ・ピークRSSを計測する
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.test_queries = [
+            test_query["query"] for test_query in SearchEvaluationService(settings).test_queries
+        ]
+
+    def build_query_set(self, scale: int = 1) -> List[str]:
+        """テストクエリを scale 倍に水増ししたクエリ集合を作成（決定的）"""
+        if scale < 1:
+            raise ValueError("scale must be at least 1")
+
+        queries = []
+        for i in range(scale):
+            round_number, template_index = divmod(i, len(QUERY_VARIANT_TEMPLATES))
+            template = QUERY_VARIANT_TEMPLATES[template_index]
+            # テンプレートを一巡した後は番号を付けて重複しないクエリにする
+            suffix = f" ({round_number})" if round_number else ""
+            queries.extend(template.format(query=query) + suffix for query in self.test_queries)
+        return queries
+
+    def benchmark_search(
+        self,
+        vector_repo: VectorSearchRepository,
+        queries: List[str],
+        n_results: int = 3,
+        warmup_queries: int = 5,
+    ) -> Dict[str, Any]:
+        """クエリを1件ずつ実行した場合と一括実行した場合の検索性能を計測"""
+        try:
+            if not queries:
+                raise ValueError("No queries to benchmark")
+
+            for query in queries[:warmup_queries]:
+                vector_repo.search(query, n_results)
+
+            latencies_ms = []
+            start = time.perf_counter()
+            for query in queries:
+                query_start = time.perf_counter()
+                vector_repo.search(query, n_results)
+                latencies_ms.append((time.perf_counter() - query_start) * 1000)
+            sequential_seconds = time.perf_counter() - start
+
+            batch_start = time.perf_counter()
+            vector_repo.search_batch(queries, n_results)
+            batch_seconds = time.perf_counter() - batch_start
+
+            return {
+                "queries": len(queries),
+                "n_results": n_results,
+                "qps": len(queries) / sequential_seconds if sequential_seconds > 0 else 0.0,
+                "batch_qps": len(queries) / batch_seconds if batch_seconds > 0 else 0.0,
+                "latency_ms": self.latency_summary(latencies_ms),
+            }
+
+        except Exception as e:
+            logger.error(f"Search benchmark failed: {e}")
+            raise RuntimeError(f"Search benchmark failed: {e}")
+
+    @staticmethod
+    def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+        """レイテンシの統計値（平均・最大・p50 / p95 / p99）を計算"""
+        histogram = LatencyHistogram(window_size=max(1, len(latencies_ms)))
+        for latency_ms in latencies_ms:
+            histogram.record(latency_ms)
+
+        return {
+            "mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+            "max": max(latencies_ms, default=0.0),
+            **histogram.summary(),
+        }
+
+    @staticmethod
+    def directory_size_bytes(path: Path) -> int:
+        """ディレクトリ配下のファイルサイズの合計を取得"""
+        if not path.exists():
+            return 0
+        if path.is_file():
+            return path.stat().st_size
+        return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+    @staticmethod
+    def peak_rss_mb() -> float:
+        """プロセスのピークRSS（MB）を取得"""
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linuxはキロバイト、macOSはバイト単位
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_performance_benchmark(
+    data_repository_factory: DataRepositoryFactory,
+    vector_repository_factory: VectorRepositoryFactory,
+    settings: Settings,
+    product_strategy: str,
+    faq_strategy: str,
+    scale: int = 1,
+    n_results: int = 3,
+) -> Dict[str, Any]:
+    """1つの戦略組み合わせのインデックス構築と検索性能を計測
+
+    ピークRSSを組み合わせごとに計測するため、組み合わせごとに新しいプロセスで実行する
+    """
+    settings = StrategyBenchmarkRunner.combination_settings(
+        settings, product_strategy, faq_strategy
+    )
+    service = PerformanceBenchmarkService(settings)
+
+    product_repo, faq_repo, support_repo = data_repository_factory(settings)
+    vector_repository_factory(settings).delete_collection()
+
+    build_start = time.perf_counter()
+    vector_repo = vector_repository_factory(settings)
+    indexing_result = IndexingService(product_repo, settings, faq_repo, support_repo).index_data(
+        vector_repo, product_strategy, faq_strategy
+    )
+    build_seconds = time.perf_counter() - build_start
+
+    search_result = service.benchmark_search(
+        vector_repo, service.build_query_set(scale), n_results=n_results
+    )
+
+    result = {
+        "product_strategy": product_strategy,
+        "faq_strategy": faq_strategy,
+        "vector_backend": settings.vector_backend,
+        "embedding_provider": settings.embedding_provider,
+        "total_chunks": indexing_result["total_chunks"],
+        "build_seconds": build_seconds,
+        "index_size_bytes": service.directory_size_bytes(Path(settings.chroma_persist_directory)),
+        "peak_rss_mb": service.peak_rss_mb(),
+        "pid": os.getpid(),
+        **search_result,
+    }
+
+    logger.info(
+        f"Performance benchmark for {product_strategy}+{faq_strategy} - "
+        f"QPS: {result['qps']:.1f}, p95: {result['latency_ms']['p95_ms']:.2f}ms, "
+        f"build: {build_seconds:.2f}s"
+    )
+    return result
+
+
+def summarize_results(results: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """最速・最小の戦略組み合わせを抽出"""
+    if not results:
+        return None
+    return {
+        "highest_qps": max(results, key=lambda name: results[name]["qps"]),
+        "lowest_p95": min(results, key=lambda name: results[name]["latency_ms"]["p95_ms"]),
+        "fastest_build": min(results, key=lambda name: results[name]["build_seconds"]),
+        "smallest_index": min(results, key=lambda name: results[name]["index_size_bytes"]),
+    }
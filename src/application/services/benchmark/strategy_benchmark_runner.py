@@ -0,0 +1,234 @@
+import dataclasses
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from application.services.benchmark.chunk_strategy_evaluation_service import (
+    SearchEvaluationService,
+)
+from application.services.chunk.faq_chunk_service import FAQChunkService
+from application.services.chunk.product_chunk_service import ProductChunkService
+from application.services.chunk.support_chunk_service import SupportChunkService
+from application.services.indexing.indexing_service import IndexingService
+from application.services.rag.rerank_service import RerankService
+from config.settings import Settings
+from domain.repositories.faq_repository import FAQRepository
+from domain.repositories.product_repository import ProductRepository
+from domain.repositories.text_document_repository import TextDocumentRepository
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from domain.services.reranker import Reranker
+
+logger = logging.getLogger(__name__)
+
+
+DataRepositoryFactory = Callable[
+    [Settings],
+    Tuple[ProductRepository, Optional[FAQRepository], Optional[TextDocumentRepository]],
+]
+VectorRepositoryFactory = Callable[[Settings], VectorSearchRepository]
+EmbeddingWarmer = Callable[[Settings, List[str]], Dict[str, Any]]
+RerankerFactory = Callable[[Settings], Optional[Reranker]]
+
+
+class StrategyBenchmarkRunner:
+    """チャンク戦略の組み合わせを並列に評価するベンチマークランナー
+
+    - 組み合わせごとに専用のディレクトリ・コレクションへインデックスを構築し、
+      プロセスプールで並列に評価する
+    - embedding_warmer を指定した場合、全組み合わせのチャンクとテストクエリの
+      和集合を親プロセスで一度だけ埋め込みキャッシュに登録し、
+      ワーカーはキャッシュを読み取り専用で共有する
+    - reranker_factory を指定した場合、各ワーカーでリランカーを生成し、
+      リランキング後の検索結果で評価する
+
+    各ファクトリと embedding_warmer はワーカープロセスに渡すため、
+    モジュールのトップレベルで定義された関数である必要がある
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        data_repository_factory: DataRepositoryFactory,
+        vector_repository_factory: VectorRepositoryFactory,
+        embedding_warmer: Optional[EmbeddingWarmer] = None,
+        max_workers: Optional[int] = None,
+        reranker_factory: Optional[RerankerFactory] = None,
+    ):
+        self.settings = settings
+        self.data_repository_factory = data_repository_factory
+        self.vector_repository_factory = vector_repository_factory
+        self.embedding_warmer = embedding_warmer
+        self.max_workers = max_workers
+        self.reranker_factory = reranker_factory
+
+    def run(self, combinations: List[Tuple[str, str]], top_k: int = 3) -> Dict[str, Any]:
+        """全組み合わせを評価し、統合した比較レポートを返す"""
+        try:
+            start = time.perf_counter()
+
+            warmup_stats: Dict[str, Any] = {}
+            worker_settings = self.settings
+            if self.embedding_warmer is not None:
+                texts = self._collect_texts(combinations)
+                logger.info(f"Pre-embedding {len(texts)} unique texts for benchmark")
+                warmup_stats = self.embedding_warmer(self.settings, texts)
+                worker_settings = dataclasses.replace(self.settings, embedding_cache_read_only=True)
+
+            max_workers = self.max_workers or len(combinations)
+            max_workers = max(1, min(max_workers, len(combinations)))
+
+            results: Dict[str, Dict[str, Any]] = {}
+            failures: Dict[str, str] = {}
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        run_combination,
+                        self.data_repository_factory,
+                        self.vector_repository_factory,
+                        self.combination_settings(worker_settings, product_strategy, faq_strategy),
+                        product_strategy,
+                        faq_strategy,
+                        top_k,
+                        self.reranker_factory,
+                    ): self.combination_name(product_strategy, faq_strategy)
+                    for product_strategy, faq_strategy in combinations
+                }
+
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                        logger.info(
+                            f"Benchmark finished for {name} "
+                            f"in {results[name]['elapsed_seconds']:.1f}s"
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to benchmark {name}: {e}")
+                        failures[name] = str(e)
+
+            ordered_names = [
+                self.combination_name(product_strategy, faq_strategy)
+                for product_strategy, faq_strategy in combinations
+            ]
+            ordered_results = {name: results[name] for name in ordered_names if name in results}
+
+            evaluations = {name: result["evaluation"] for name, result in ordered_results.items()}
+            comparison = (
+                SearchEvaluationService(self.settings).compare_strategies(evaluations)
+                if len(evaluations) > 1
+                else {}
+            )
+
+            return {
+                "workers": max_workers,
+                "wall_clock_seconds": time.perf_counter() - start,
+                "warmup": warmup_stats,
+                "results": ordered_results,
+                "failures": failures,
+                "comparison": comparison,
+            }
+
+        except Exception as e:
+            logger.error(f"Strategy benchmark failed: {e}")
+            raise RuntimeError(f"Strategy benchmark failed: {e}")
+
+    @staticmethod
+    def combination_name(product_strategy: str, faq_strategy: str) -> str:
+        """組み合わせの表示名を取得"""
+        return f"{product_strategy}+{faq_strategy}"
+
+    @staticmethod
+    def combination_settings(
+        settings: Settings, product_strategy: str, faq_strategy: str
+    ) -> Settings:
+        """組み合わせ専用の保存先・コレクション名を持つ設定を作成"""
+        collection_name = f"integrated_{product_strategy}_{faq_strategy}"
+        return dataclasses.replace(
+            settings,
+            chroma_persist_directory=str(Path(settings.chroma_persist_directory) / collection_name),
+            chroma_collection_name=collection_name,
+            numpy_index_directory="",
+            bm25_index_path="",
+        )
+
+    def _collect_texts(self, combinations: List[Tuple[str, str]]) -> List[str]:
+        """全組み合わせのチャンク本文とテストクエリの和集合を取得"""
+        product_repo, faq_repo, support_repo = self.data_repository_factory(self.settings)
+        texts: Dict[str, None] = {}
+
+        for product_strategy in dict.fromkeys(strategy for strategy, _ in combinations):
+            chunk_service = ProductChunkService(product_strategy)
+            for chunk in chunk_service.iter_chunks_for_products(product_repo.iter_products()):
+                texts[chunk.text] = None
+
+        if faq_repo is not None:
+            for faq_strategy in dict.fromkeys(strategy for _, strategy in combinations):
+                faq_chunk_service = FAQChunkService(faq_strategy)
+                for chunk in faq_chunk_service.iter_chunks_for_faqs(faq_repo.iter_faqs()):
+                    texts[chunk.text] = None
+
+        if support_repo is not None:
+            support_chunk_service = SupportChunkService(
+                max_chars=self.settings.support_chunk_max_chars,
+                overlap_lines=self.settings.support_chunk_overlap_lines,
+            )
+            for chunk in support_chunk_service.iter_chunks_for_document(support_repo):
+                texts[chunk.text] = None
+
+        for test_query in SearchEvaluationService(self.settings).test_queries:
+            texts[test_query["query"]] = None
+
+        return list(texts)
+
+
+def run_combination(
+    data_repository_factory: DataRepositoryFactory,
+    vector_repository_factory: VectorRepositoryFactory,
+    settings: Settings,
+    product_strategy: str,
+    faq_strategy: str,
+    top_k: int,
+    reranker_factory: Optional[RerankerFactory] = None,
+) -> Dict[str, Any]:
+    """1つの組み合わせのインデックス構築と評価を実行（ワーカープロセスで実行される）"""
+    start = time.perf_counter()
+    name = StrategyBenchmarkRunner.combination_name(product_strategy, faq_strategy)
+
+    product_repo, faq_repo, support_repo = data_repository_factory(settings)
+    vector_repository_factory(settings).delete_collection()
+    vector_repo = vector_repository_factory(settings)
+
+    indexing_service = IndexingService(product_repo, settings, faq_repo, support_repo)
+    indexing_result = indexing_service.index_data(vector_repo, product_strategy, faq_strategy)
+
+    rerank_service = None
+    reranker = reranker_factory(settings) if reranker_factory is not None else None
+    if reranker is not None:
+        rerank_service = RerankService(
+            reranker,
+            batch_size=settings.rerank_batch_size,
+            latency_budget_ms=settings.rerank_latency_budget_ms,
+            cache_max_entries=settings.rerank_cache_max_entries,
+        )
+
+    evaluation_service = SearchEvaluationService(settings)
+    evaluation = evaluation_service.evaluate_strategy(
+        vector_repo, name, top_k=top_k, rerank_service=rerank_service
+    )
+
+    embedding_stats: Dict[str, Any] = {}
+    stats = getattr(getattr(vector_repo, "embeddings", None), "stats", None)
+    if callable(stats):
+        embedding_stats = stats()
+
+    return {
+        "product_strategy": product_strategy,
+        "faq_strategy": faq_strategy,
+        "collection_name": settings.chroma_collection_name,
+        "indexing": indexing_result,
+        "evaluation": evaluation,
+        "embedding_stats": embedding_stats,
+        "elapsed_seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,487 @@
+import math
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# テストクエリ等の対象を全体に分散させるためのステップ幅の比率（黄金比）
+SAMPLING_STRIDE_RATIO = 0.6180339887
+
+
+def _earphone_specs(rng: random.Random) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """ワイヤレスイヤホンの仕様・特徴・タグを生成"""
+    anc_db = rng.choice([0, 25, 30, 35, 38, 42])
+    hours = rng.choice([18, 24, 28, 30, 35, 40])
+    waterproof = rng.choice(["IPX4", "IPX5", "IPX7"])
+    codecs = ["SBC", "AAC"] + rng.sample(
+        ["aptX", "aptX Adaptive", "LDAC", "LC3"], rng.randint(0, 3)
+    )
+    specs = {
+        "driver": f"{rng.choice([6, 8, 10, 11, 12])}mm ダイナミック型",
+        "frequency_response": f"20Hz - {rng.choice([20, 40])}kHz",
+        "bluetooth_version": rng.choice(["5.2", "5.3", "5.4"]),
+        "supported_codecs": codecs,
+        "charging_time": {
+            "earphones": f"{rng.choice([1, 1.5, 2])}時間",
+            "case": f"{rng.choice([1.5, 2, 2.5])}時間",
+        },
+        "weight": {
+            "earphone_single": f"{rng.uniform(4.0, 9.0):.1f}g",
+            "case": f"{rng.randint(35, 70)}g",
+        },
+        "available_colors": rng.sample(
+            [
+                "ミッドナイトブラック",
+                "パールホワイト",
+                "スペースグレー",
+                "ネイビー",
+                "ローズゴールド",
+            ],
+            rng.randint(1, 3),
+        ),
+    }
+    features = [
+        f"最大{hours}時間の連続再生（ケース込み）",
+        f"{waterproof}防水規格で運動時も安心",
+    ]
+    tags = ["防水", "長時間再生"]
+    if anc_db:
+        features.insert(0, f"アクティブノイズキャンセリング（-{anc_db}dB）")
+        tags.append("ノイズキャンセリング")
+    if "LDAC" in codecs:
+        features.append("LDAC対応でハイレゾ音源も高音質再生")
+        tags.append("ハイレゾ")
+    if rng.random() < 0.5:
+        features.append("マルチポイント接続で2台同時接続可能")
+        tags.append("マルチポイント")
+    return specs, features, tags
+
+
+def _smartwatch_specs(rng: random.Random) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """スマートウォッチの仕様・特徴・タグを生成"""
+    days = rng.choice([2, 5, 7, 10, 14, 21])
+    size = rng.choice(["1.4", "1.6", "1.8", "1.9"])
+    sensors = ["心拍", "加速度"] + rng.sample(
+        ["血中酸素", "ジャイロ", "GPS", "気圧計", "皮膚温", "心電図"], rng.randint(1, 4)
+    )
+    specs = {
+        "display": {
+            "size": f"{size}インチ",
+            "type": rng.choice(["AMOLED", "LCD", "MIP"]),
+            "resolution": rng.choice(["390×450ピクセル", "454×454ピクセル", "466×466ピクセル"]),
+        },
+        "os": f"TechOS {rng.choice(['1.5', '2.0', '2.1'])}",
+        "sensors": sensors,
+        "battery": {"capacity": f"{rng.randint(250, 600)}mAh", "life": f"最大{days}日間"},
+        "charging_time": f"約{rng.choice([1, 1.5, 2])}時間",
+        "weight": f"{rng.randint(25, 60)}g（バンド除く）",
+        "compatibility": {"ios": "13以降", "android": "8.0以降"},
+    }
+    features = [
+        f"{size}インチディスプレイ",
+        f"最大{days}日間のバッテリー持続",
+        f"{rng.choice([50, 100, 150])}種類以上のワークアウトモード",
+    ]
+    tags = ["健康管理", "フィットネス"]
+    if "血中酸素" in sensors:
+        features.append("血中酸素濃度、心拍数、睡眠の24時間モニタリング")
+    if "GPS" in sensors:
+        features.append("GPS内蔵でスマホなしでもルート記録")
+        tags.append("GPS")
+    if rng.random() < 0.6:
+        features.append("5ATM防水でスイミング対応")
+        tags.append("5ATM防水")
+    return specs, features, tags
+
+
+def _battery_specs(rng: random.Random) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """モバイルバッテリーの仕様・特徴・タグを生成"""
+    mah = rng.choice([5000, 10000, 15000, 20000, 26800])
+    max_power = rng.choice([20, 30, 45, 65, 100])
+    specs = {
+        "capacity": {"mah": mah, "wh": round(mah * 3.7 / 1000)},
+        "input": {"type": "USB-C", "max_power": f"{min(max_power, 65)}W"},
+        "output": {
+            "usb_c": {"ports": rng.randint(1, 2), "max_power": f"{max_power}W"},
+            "usb_a": {"ports": rng.randint(0, 2), "max_power": "22.5W"},
+        },
+        "dimensions": f"{rng.randint(90, 160)}×{rng.randint(60, 80)}×{rng.randint(15, 30)}mm",
+        "weight": f"{mah // 60 + rng.randint(-20, 40)}g",
+        "included_accessories": rng.sample(["USB-C to Cケーブル", "収納ポーチ", "取扱説明書"], 2),
+    }
+    features = [
+        f"{mah}mAhの大容量（スマホ約{max(1, mah // 4000)}回分充電）",
+        f"USB PD {max_power}W急速充電対応",
+    ]
+    tags = ["大容量", "急速充電", "PD対応"]
+    if rng.random() < 0.5:
+        features.append("パススルー充電対応")
+        tags.append("パススルー")
+    if rng.random() < 0.5:
+        features.append("残量デジタル表示")
+        tags.append("デジタル表示")
+    return specs, features, tags
+
+
+def _headphone_specs(rng: random.Random) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """ヘッドホンの仕様・特徴・タグを生成"""
+    hours = rng.choice([30, 40, 50, 60, 80])
+    specs = {
+        "driver": f"{rng.choice([30, 40, 50])}mm ダイナミック型",
+        "frequency_response": f"{rng.choice([4, 10, 20])}Hz - 40kHz",
+        "bluetooth_version": rng.choice(["5.2", "5.3"]),
+        "supported_codecs": ["SBC", "AAC"] + rng.sample(["aptX", "LDAC"], rng.randint(0, 2)),
+        "battery": {"life": f"最大{hours}時間", "quick_charge": "10分で5時間再生"},
+        "weight": f"{rng.randint(180, 320)}g",
+        "foldable": rng.random() < 0.6,
+    }
+    features = [f"最大{hours}時間の連続再生", "有線接続にも対応"]
+    tags = ["長時間再生", "高音質"]
+    if rng.random() < 0.7:
+        features.insert(0, "アダプティブノイズキャンセリング搭載")
+        tags.append("ノイズキャンセリング")
+    if specs["foldable"]:
+        features.append("折りたたみ可能で持ち運びに便利")
+        tags.append("折りたたみ")
+    return specs, features, tags
+
+
+def _speaker_specs(rng: random.Random) -> Tuple[Dict[str, Any], List[str], List[str]]:
+    """ポータブルスピーカーの仕様・特徴・タグを生成"""
+    output = rng.choice([5, 10, 16, 20, 30, 40])
+    waterproof = rng.choice(["IPX4", "IP67"])
+    specs = {
+        "output": f"{output}W",
+        "bluetooth_version": rng.choice(["5.0", "5.3"]),
+        "battery": {"life": f"最大{rng.choice([10, 12, 16, 24])}時間"},
+        "waterproof": waterproof,
+        "dimensions": f"{rng.randint(80, 220)}×{rng.randint(60, 100)}×{rng.randint(50, 100)}mm",
+        "weight": f"{rng.randint(300, 1200)}g",
+    }
+    features = [f"{output}Wの迫力あるサウンド", f"{waterproof}防水・防塵でアウトドアでも安心"]
+    tags = ["防水", "アウトドア"]
+    if rng.random() < 0.5:
+        features.append("2台ペアリングでステレオ再生")
+        tags.append("ステレオペアリング")
+    return specs, features, tags
+
+
+# カテゴリごとの商品生成プロファイル
+CATEGORY_PROFILES: List[Dict[str, Any]] = [
+    {
+        "prefix": "WE",
+        "category": "ワイヤレスイヤホン",
+        "series": ["TechPods", "SoundBuds", "AirBeat", "SportsBuds", "ClearPods"],
+        "variants": ["Pro", "Air", "Lite", "Max", "X", "Mini"],
+        "manufacturers": ["AudioTech Industries", "FitAudio", "SoundWave Japan"],
+        "price_range": (3980, 39800),
+        "use_cases": ["通勤・通学", "ランニング", "オンライン会議", "音楽鑑賞"],
+        "specs": _earphone_specs,
+    },
+    {
+        "prefix": "SW",
+        "category": "スマートウォッチ",
+        "series": ["TechWatch", "FitBand", "PulseWatch", "ActiveTime"],
+        "variants": ["Ultra", "Lite", "Sport", "Classic", "S"],
+        "manufacturers": ["TechMart Original", "WearLab", "FitGear"],
+        "price_range": (6980, 69800),
+        "use_cases": ["健康管理", "ランニング", "ビジネス", "睡眠改善"],
+        "specs": _smartwatch_specs,
+    },
+    {
+        "prefix": "MB",
+        "category": "モバイルバッテリー",
+        "series": ["PowerBank", "ChargeGo", "VoltMate", "EnergyCube"],
+        "variants": ["Pro", "Slim", "Max", "Mini"],
+        "manufacturers": ["ChargeTech", "VoltWorks", "TechMart Original"],
+        "price_range": (1980, 14800),
+        "use_cases": ["出張", "旅行", "災害への備え", "ノートPCの充電"],
+        "specs": _battery_specs,
+    },
+    {
+        "prefix": "HP",
+        "category": "ヘッドホン",
+        "series": ["StudioSound", "QuietMax", "BassHead", "TechPhones"],
+        "variants": ["Pro", "Wireless", "Studio", "Travel"],
+        "manufacturers": ["AudioTech Industries", "SoundWave Japan", "StudioWorks"],
+        "price_range": (5980, 59800),
+        "use_cases": ["在宅勤務", "飛行機での移動", "音楽制作", "ゲーム"],
+        "specs": _headphone_specs,
+    },
+    {
+        "prefix": "SP",
+        "category": "ポータブルスピーカー",
+        "series": ["BoomBox", "WaveCube", "OutdoorBeat", "RoomSound"],
+        "variants": ["Go", "Plus", "Max", "Mini"],
+        "manufacturers": ["SoundWave Japan", "OutdoorAudio", "TechMart Original"],
+        "price_range": (2980, 29800),
+        "use_cases": ["キャンプ", "ホームパーティー", "お風呂", "リビング"],
+        "specs": _speaker_specs,
+    },
+]
+
+# 商品に依存しない固定のFAQ: (ID接頭辞, カテゴリ, 質問, 回答)
+STATIC_FAQS: List[Tuple[str, str, str, str]] = [
+    (
+        "GEN",
+        "一般",
+        "注文後どのくらいで届きますか？",
+        "通常、ご注文から1-3営業日以内に発送いたします。発送後1-2日でお届けします。",
+    ),
+    (
+        "GEN",
+        "一般",
+        "送料はいくらですか？",
+        "3,000円以上のご購入で送料無料です。3,000円未満の場合は全国一律500円です。",
+    ),
+    (
+        "GEN",
+        "一般",
+        "支払い方法は何が使えますか？",
+        "クレジットカード、PayPay、代金引換、銀行振込、コンビニ決済がご利用いただけます。",
+    ),
+    (
+        "GEN",
+        "一般",
+        "返品・交換はできますか？",
+        "商品到着後14日以内であれば、未開封・未使用品に限り返品・交換を承ります。",
+    ),
+    (
+        "GEN",
+        "一般",
+        "保証期間はどのくらいですか？",
+        "基本的にメーカー保証1年間が付いています。TechMartオリジナル商品は2年間です。",
+    ),
+    (
+        "TROUBLE",
+        "トラブルシューティング",
+        "Bluetoothの接続が不安定です",
+        "機器同士を近づけ、ペアリング情報を削除してから再接続してください。",
+    ),
+    (
+        "TROUBLE",
+        "トラブルシューティング",
+        "充電ができません",
+        "別のケーブルと電源アダプターでお試しください。改善しない場合はサポートまでご連絡ください。",
+    ),
+    (
+        "TROUBLE",
+        "トラブルシューティング",
+        "商品が動作しません",
+        "一度完全に充電してからリセットをお試しください。初期不良の場合は交換いたします。",
+    ),
+] + [
+    (
+        "GUIDE",
+        "購入ガイド",
+        f"{profile['category']}の選び方を教えてください",
+        f"{profile['category']}は、{'・'.join(profile['use_cases'][:2])}など"
+        "主な利用シーンと予算に合わせてお選びください。",
+    )
+    for profile in CATEGORY_PROFILES
+]
+
+
+class SyntheticCatalogGenerator:
+    """スケールテスト用の合成カタログ生成器
+
+    products_master.json / faq_database.json と同じ形式の商品・FAQと、
+    期待IDつきのテストクエリを生成する。各レコードはシードとインデックスから
+    決定的に生成されるため、全件をメモリに保持せずに逐次書き出せ、
+    テストクエリ生成時も対象の商品・FAQだけを再生成すればよい
+    """
+
+    def __init__(self, product_count: int, faq_count: Optional[int] = None, seed: int = 42):
+        if product_count < 1:
+            raise ValueError("product_count must be at least 1")
+
+        self.product_count = product_count
+        # 商品FAQ数（省略時は商品10件につき1件）。固定FAQは別に生成される
+        self.faq_count = faq_count if faq_count is not None else max(10, product_count // 10)
+        self.seed = seed
+
+        products_per_category = -(-product_count // len(CATEGORY_PROFILES))
+        self._id_width = max(3, len(str(products_per_category)))
+        self._faq_id_width = max(3, len(str(self.faq_count + len(STATIC_FAQS))))
+
+    @property
+    def total_faq_count(self) -> int:
+        """固定FAQを含むFAQの総数"""
+        return len(STATIC_FAQS) + self.faq_count
+
+    def iter_products(self) -> Iterator[Dict[str, Any]]:
+        """全商品を逐次生成"""
+        for index in range(self.product_count):
+            yield self.product(index)
+
+    def iter_faqs(self) -> Iterator[Dict[str, Any]]:
+        """全FAQを逐次生成"""
+        for index in range(self.total_faq_count):
+            yield self.faq(index)
+
+    def product(self, index: int) -> Dict[str, Any]:
+        """指定インデックスの商品を生成"""
+        profile = CATEGORY_PROFILES[index % len(CATEGORY_PROFILES)]
+        rng = self._rng("product", index)
+
+        specifications, features, tags = profile["specs"](rng)
+        product_name = self._product_name(profile, index, rng)
+        low, high = profile["price_range"]
+        use_cases = rng.sample(profile["use_cases"], 2)
+
+        return {
+            "product_id": self._product_id(profile, index),
+            "product_name": product_name,
+            "category": profile["category"],
+            "price": rng.randrange(low, high + 1, 1000),
+            "stock_quantity": rng.randint(0, 1000),
+            "release_date": f"{rng.randint(2021, 2025)}-{rng.randint(1, 12):02d}-"
+            f"{rng.randint(1, 28):02d}",
+            "manufacturer": rng.choice(profile["manufacturers"]),
+            "description": (
+                f"{product_name}は、{use_cases[0]}や{use_cases[1]}に最適な"
+                f"{profile['category']}です。{features[0]}、{features[1]}などの"
+                "特徴を備えています。"
+            ),
+            "features": features,
+            "specifications": specifications,
+            "tags": tags,
+        }
+
+    def faq(self, index: int) -> Dict[str, Any]:
+        """指定インデックスのFAQを生成（先頭は固定FAQ、以降は商品に関するFAQ）"""
+        faq_id_number = f"{index + 1:0{self._faq_id_width}d}"
+        if index < len(STATIC_FAQS):
+            prefix, category, question, answer = STATIC_FAQS[index]
+            return {
+                "faq_id": f"{prefix}-{faq_id_number}",
+                "category": category,
+                "question": question,
+                "answer": answer,
+            }
+
+        rng = self._rng("faq", index)
+        product_index = self._sample_index(index - len(STATIC_FAQS), self.product_count)
+        product = self.product(product_index)
+        profile = CATEGORY_PROFILES[product_index % len(CATEGORY_PROFILES)]
+        question, answer = self._product_faq(product, rng)
+
+        return {
+            "faq_id": f"{profile['prefix']}-{faq_id_number}",
+            "category": product["category"],
+            "question": question,
+            "answer": answer,
+        }
+
+    def generate_test_queries(self, count: int) -> List[Dict[str, Any]]:
+        """期待IDつきのテストクエリを生成（商品クエリとFAQクエリを半数ずつ）"""
+        product_query_count = (count + 1) // 2
+        faq_query_count = count - product_query_count
+
+        queries = []
+        for i in range(product_query_count):
+            product = self.product(self._sample_index(i, self.product_count))
+            query, query_type, description = self._product_query(product, i)
+            queries.append(
+                {
+                    "query_id": f"Q{i + 1:05d}",
+                    "query": query,
+                    "expected_products": [product["product_id"]],
+                    "query_type": query_type,
+                    "description": description,
+                }
+            )
+
+        for i in range(faq_query_count):
+            faq = self.faq(self._sample_index(i, self.total_faq_count))
+            queries.append(
+                {
+                    "query_id": f"F{i + 1:05d}",
+                    "query": self._paraphrase_question(faq["question"]),
+                    "expected_faqs": [faq["faq_id"]],
+                    "query_type": "general_faq" if faq["category"] == "一般" else "product_faq",
+                    "description": f"{faq['category']}のFAQ",
+                }
+            )
+
+        return queries
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        """レコードごとに独立した乱数生成器を作成"""
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    def _product_id(self, profile: Dict[str, Any], index: int) -> str:
+        number = index // len(CATEGORY_PROFILES) + 1
+        return f"{profile['prefix']}-{number:0{self._id_width}d}"
+
+    @staticmethod
+    def _product_name(profile: Dict[str, Any], index: int, rng: random.Random) -> str:
+        """インデックスを型番に含めて一意な商品名を生成"""
+        series = rng.choice(profile["series"])
+        variant = rng.choice(profile["variants"])
+        return f"{series} {variant} {rng.choice('ABCDEFGHKMNRSTVXZ')}{index + 1}"
+
+    @staticmethod
+    def _sample_index(i: int, size: int) -> int:
+        """0〜size-1 の範囲に分散したインデックスを（size件までは）重複なく選ぶ"""
+        stride = max(1, round(size * SAMPLING_STRIDE_RATIO))
+        while math.gcd(stride, size) != 1:
+            stride += 1
+        return (i * stride) % size
+
+    @staticmethod
+    def _product_faq(product: Dict[str, Any], rng: random.Random) -> Tuple[str, str]:
+        """商品に関するFAQの質問と回答を生成"""
+        name = product["product_name"]
+        templates = [
+            (
+                f"{name}の価格はいくらですか？",
+                f"{name}の価格は{product['price']:,}円（税込）です。"
+                "3,000円以上のご購入で送料無料となります。",
+            ),
+            (
+                f"{name}はどんな人におすすめですか？",
+                f"{name}は{'・'.join(product['tags'][:2])}を重視する方におすすめです。"
+                f"主な特徴: {product['features'][0]}。",
+            ),
+            (
+                f"{name}の主な機能を教えてください",
+                f"{name}の主な機能は次の通りです：" + "、".join(product["features"]) + "。",
+            ),
+            (
+                f"{name}の在庫はありますか？",
+                (
+                    f"{name}は現在在庫がございます。ご注文から1-3営業日以内に発送いたします。"
+                    if product["stock_quantity"]
+                    else f"{name}は現在在庫切れです。入荷次第ご案内いたします。"
+                ),
+            ),
+        ]
+        return rng.choice(templates)
+
+    @staticmethod
+    def _product_query(product: Dict[str, Any], i: int) -> Tuple[str, str, str]:
+        """商品に対するテストクエリを生成: (クエリ, 種別, 説明)"""
+        name = product["product_name"]
+        queries = [
+            (f"{name}の価格は？", "direct_product_query", "商品名による直接検索"),
+            (f"{name}の仕様を教えて", "spec_query", "商品名による仕様の検索"),
+            (
+                f"{product['manufacturer']}の{name}の特徴は？",
+                "feature_query",
+                "メーカー名と商品名による特徴の検索",
+            ),
+        ]
+        return queries[i % len(queries)]
+
+    @staticmethod
+    def _paraphrase_question(question: str) -> str:
+        """FAQの質問文を簡単に言い換える"""
+        for suffix, replacement in [
+            ("を教えてください", "を知りたい"),
+            ("はいくらですか？", "はいくら？"),
+            ("はありますか？", "ある？"),
+            ("ですか？", "？"),
+            ("できますか？", "できる？"),
+        ]:
+            if question.endswith(suffix):
+                return question[: -len(suffix)] + replacement
+        return question
@@ -1,6 +1,12 @@
 import logging
-from typing import Dict, List
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+from application.services.chunk.parallel_chunking import (
+    ChunkingProgress,
+    iter_ordered_parallel,
+    resolve_workers,
+)
 from domain.entities.chunk import Chunk
 from domain.entities.faq import FAQ
 from domain.services.faq_chunk_strategies.category_unified_chunk_strategy import (
@@ -16,13 +22,20 @@ logger = logging.getLogger(__name__)
 class FAQChunkService:
     """FAQ用チャンク生成サービス
 
-    異なるFAQチャンク戦略を使用してFAQからチャンクを生成する
+    異なるFAQチャンク戦略を使用してFAQからチャンクを生成する。
+    workers が2以上（0はCPU数）の場合、FAQを batch_size 件ずつワーカープロセスに分配し、
+    生成したチャンクをFAQの入力順のまま返す（category_unified戦略を除く）
     """
 
-    def __init__(self, strategy_name: str = "qa_pair"):
+    def __init__(self, strategy_name: str = "qa_pair", workers: int = 1, batch_size: int = 500):
         self._strategies = self._initialize_strategies()
         self._current_strategy = self._get_strategy(strategy_name)
-        logger.info(f"Initialized FAQChunkService with strategy: {strategy_name}")
+        self.workers = resolve_workers(workers)
+        self.batch_size = batch_size
+        logger.info(
+            f"Initialized FAQChunkService with strategy: {strategy_name}"
+            + (f" ({self.workers} workers)" if self.workers > 1 else "")
+        )
 
     def _initialize_strategies(self) -> Dict[str, FAQChunkStrategy]:
         """利用可能な戦略を初期化"""
@@ -46,7 +59,7 @@ class FAQChunkService:
         """FAQからチャンクを生成"""
         try:
             chunks = self._current_strategy.create_chunks_for_faq(faq)
-            logger.info(
+            logger.debug(
                 f"Generated {len(chunks)} chunks for FAQ {faq.faq_id} "
                 f"using {self._current_strategy.strategy_name} strategy"
             )
@@ -55,29 +68,57 @@ class FAQChunkService:
             logger.error(f"Failed to generate chunks for FAQ {faq.faq_id}: {e}")
             raise RuntimeError(f"Chunk generation failed for FAQ {faq.faq_id}: {e}")
 
-    def generate_chunks_for_faqs(self, faqs: List[FAQ]) -> List[Chunk]:
+    def generate_chunks_for_faqs(self, faqs: Iterable[FAQ]) -> List[Chunk]:
         """複数FAQからチャンクを一括生成"""
+        return list(self.iter_chunks_for_faqs(faqs))
+
+    def iter_chunks_for_faqs(self, faqs: Iterable[FAQ]) -> Iterator[Chunk]:
+        """複数FAQからチャンクを逐次生成
+
+        category_unified戦略はカテゴリ単位で集約が必要なため、全FAQを読み込んでから生成する
+        """
         if self._current_strategy.strategy_name == "category_unified":
-            return self._generate_category_unified_chunks(faqs)
+            yield from self._generate_category_unified_chunks(faqs)
+            return
+
+        progress = ChunkingProgress("FAQs")
+
+        if self.workers > 1:
+            batch_results = iter_ordered_parallel(
+                partial(_chunk_faq_batch, self._current_strategy.strategy_name),
+                faqs,
+                self.workers,
+                self.batch_size,
+            )
+        else:
+            batch_results = (self._chunk_batch([faq]) for faq in faqs)
+
+        for chunks, faq_count, failures in batch_results:
+            for faq_id, error in failures:
+                logger.warning(f"Skipping FAQ {faq_id} due to error: {error}")
+            progress.update(faq_count, len(chunks))
+            yield from chunks
 
-        all_chunks = []
+        progress.finish()
 
+    def _chunk_batch(self, faqs: List[FAQ]) -> Tuple[List[Chunk], int, List[Tuple[str, str]]]:
+        """FAQのバッチからチャンクを生成（失敗したFAQはスキップしてIDとエラーを返す）"""
+        chunks: List[Chunk] = []
+        failures: List[Tuple[str, str]] = []
         for faq in faqs:
             try:
-                chunks = self.generate_chunks(faq)
-                all_chunks.extend(chunks)
+                chunks.extend(self.generate_chunks(faq))
             except Exception as e:
-                logger.warning(f"Skipping FAQ {faq.faq_id} due to error: {e}")
-                continue
+                failures.append((faq.faq_id, str(e)))
+        return chunks, len(faqs), failures
 
-        logger.info(f"Generated total {len(all_chunks)} chunks from {len(faqs)} FAQs")
-        return all_chunks
-
-    def _generate_category_unified_chunks(self, faqs: List[FAQ]) -> List[Chunk]:
+    def _generate_category_unified_chunks(self, faqs: Iterable[FAQ]) -> List[Chunk]:
         """カテゴリ統合戦略で複数FAQからチャンクを生成"""
-        faqs_by_category = {}
+        faqs_by_category: Dict[str, List[FAQ]] = {}
+        faq_count = 0
 
         for faq in faqs:
+            faq_count += 1
             if faq.category not in faqs_by_category:
                 faqs_by_category[faq.category] = []
             faqs_by_category[faq.category].append(faq)
@@ -87,7 +128,22 @@ class FAQChunkService:
 
         logger.info(
             f"Generated {len(chunks)} category-unified chunks from "
-            f"{len(faqs)} FAQs across {len(faqs_by_category)} categories"
+            f"{faq_count} FAQs across {len(faqs_by_category)} categories"
         )
 
         return chunks
+
+
+# ワーカープロセス内で戦略ごとに再利用するサービス
+_worker_services: Dict[str, FAQChunkService] = {}
+
+
+def _chunk_faq_batch(
+    strategy_name: str, faqs: List[FAQ]
+) -> Tuple[List[Chunk], int, List[Tuple[str, str]]]:
+    """ワーカープロセスでFAQのバッチからチャンクを生成"""
+    service = _worker_services.get(strategy_name)
+    if service is None:
+        service = FAQChunkService(strategy_name)
+        _worker_services[strategy_name] = service
+    return service._chunk_batch(faqs)
@@ -0,0 +1,85 @@
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ChunkingProgress:
+    """チャンク生成の進捗を集約してログ出力する
+
+    1件ごとにログを出すと大規模なカタログでは出力自体が処理時間の大半を占めるため、
+    interval_seconds ごとに件数と処理速度の要約を1行だけ出力する
+    """
+
+    def __init__(self, label: str, interval_seconds: float = 10.0):
+        self.label = label
+        self.interval_seconds = interval_seconds
+        self.items = 0
+        self.chunks = 0
+        self._start = time.perf_counter()
+        self._last_log = self._start
+
+    def update(self, items: int, chunks: int) -> None:
+        """処理済みの件数を加算し、前回の出力から一定時間経っていれば進捗を出力"""
+        self.items += items
+        self.chunks += chunks
+
+        now = time.perf_counter()
+        if now - self._last_log >= self.interval_seconds:
+            self._last_log = now
+            logger.info(
+                f"Chunking progress: {self.items} {self.label} -> {self.chunks} chunks "
+                f"({self.items / (now - self._start):.0f} {self.label}/s)"
+            )
+
+    def finish(self) -> None:
+        """合計件数と所要時間を出力"""
+        elapsed = time.perf_counter() - self._start
+        logger.info(
+            f"Generated total {self.chunks} chunks from {self.items} {self.label} "
+            f"in {elapsed:.2f}s"
+        )
+
+
+def resolve_workers(workers: int) -> int:
+    """ワーカー数を決定（0以下はCPU数）"""
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def iter_ordered_parallel(
+    func: Callable[[List[T]], R], items: Iterable[T], workers: int, batch_size: int
+) -> Iterator[R]:
+    """items を batch_size 件ずつワーカープロセスで処理し、入力順に結果を返す
+
+    実行中のバッチは workers の2倍までに制限するため、入力はストリームのまま消費され、
+    メモリ使用量は入力の件数によらず一定に保たれる。func はワーカープロセスへ
+    渡せるよう、モジュールのトップレベルに定義された関数（またはそのpartial）とする
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[Future] = deque()
+    try:
+        batch: List[T] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                pending.append(executor.submit(func, batch))
+                batch = []
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+        if batch:
+            pending.append(executor.submit(func, batch))
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # 途中で打ち切られた場合は未着手のバッチを破棄する
+        executor.shutdown(wait=True, cancel_futures=True)
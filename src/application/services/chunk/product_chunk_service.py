@@ -1,6 +1,12 @@
 import logging
-from typing import Dict, List
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+from application.services.chunk.parallel_chunking import (
+    ChunkingProgress,
+    iter_ordered_parallel,
+    resolve_workers,
+)
 from domain.entities.chunk import Chunk
 from domain.entities.product import Product
 from domain.services.product_chunk_strategies.granular_chunk_strategy import GranularChunkStrategy
@@ -14,13 +20,20 @@ logger = logging.getLogger(__name__)
 class ProductChunkService:
     """商品チャンク生成サービス
 
-    異なるチャンク戦略を使用して商品からチャンクを生成する
+    異なるチャンク戦略を使用して商品からチャンクを生成する。
+    workers が2以上（0はCPU数）の場合、商品を batch_size 件ずつワーカープロセスに分配し、
+    生成したチャンクを商品の入力順のまま返す
     """
 
-    def __init__(self, strategy_name: str = "unified"):
+    def __init__(self, strategy_name: str = "unified", workers: int = 1, batch_size: int = 500):
         self._strategies = self._initialize_strategies()
         self._current_strategy = self._get_strategy(strategy_name)
-        logger.info(f"Initialized ProductChunkService with strategy: {strategy_name}")
+        self.workers = resolve_workers(workers)
+        self.batch_size = batch_size
+        logger.info(
+            f"Initialized ProductChunkService with strategy: {strategy_name}"
+            + (f" ({self.workers} workers)" if self.workers > 1 else "")
+        )
 
     def _initialize_strategies(self) -> Dict[str, ProductChunkStrategy]:
         """利用可能な戦略を初期化"""
@@ -44,7 +57,7 @@ class ProductChunkService:
         """商品からチャンクを生成"""
         try:
             chunks = self._current_strategy.create_chunks(product)
-            logger.info(
+            logger.debug(
                 f"Generated {len(chunks)} chunks for product {product.product_id} "
                 f"using {self._current_strategy.strategy_name} strategy"
             )
@@ -53,17 +66,56 @@ class ProductChunkService:
             logger.error(f"Failed to generate chunks for product {product.product_id}: {e}")
             raise RuntimeError(f"Chunk generation failed for product {product.product_id}: {e}")
 
-    def generate_chunks_for_products(self, products: List[Product]) -> List[Chunk]:
+    def generate_chunks_for_products(self, products: Iterable[Product]) -> List[Chunk]:
         """複数商品からチャンクを一括生成"""
-        all_chunks = []
+        return list(self.iter_chunks_for_products(products))
 
+    def iter_chunks_for_products(self, products: Iterable[Product]) -> Iterator[Chunk]:
+        """複数商品からチャンクを逐次生成（商品ストリームをそのまま消費する）"""
+        progress = ChunkingProgress("products")
+
+        if self.workers > 1:
+            batch_results = iter_ordered_parallel(
+                partial(_chunk_product_batch, self._current_strategy.strategy_name),
+                products,
+                self.workers,
+                self.batch_size,
+            )
+        else:
+            batch_results = (self._chunk_batch([product]) for product in products)
+
+        for chunks, product_count, failures in batch_results:
+            for product_id, error in failures:
+                logger.warning(f"Skipping product {product_id} due to error: {error}")
+            progress.update(product_count, len(chunks))
+            yield from chunks
+
+        progress.finish()
+
+    def _chunk_batch(
+        self, products: List[Product]
+    ) -> Tuple[List[Chunk], int, List[Tuple[str, str]]]:
+        """商品のバッチからチャンクを生成（失敗した商品はスキップしてIDとエラーを返す）"""
+        chunks: List[Chunk] = []
+        failures: List[Tuple[str, str]] = []
         for product in products:
             try:
-                chunks = self.generate_chunks(product)
-                all_chunks.extend(chunks)
+                chunks.extend(self.generate_chunks(product))
             except Exception as e:
-                logger.warning(f"Skipping product {product.product_id} due to error: {e}")
-                continue
+                failures.append((product.product_id, str(e)))
+        return chunks, len(products), failures
+
+
+# ワーカープロセス内で戦略ごとに再利用するサービス
+_worker_services: Dict[str, ProductChunkService] = {}
+
 
-        logger.info(f"Generated total {len(all_chunks)} chunks from {len(products)} products")
-        return all_chunks
+def _chunk_product_batch(
+    strategy_name: str, products: List[Product]
+) -> Tuple[List[Chunk], int, List[Tuple[str, str]]]:
+    """ワーカープロセスで商品のバッチからチャンクを生成"""
+    service = _worker_services.get(strategy_name)
+    if service is None:
+        service = ProductChunkService(strategy_name)
+        _worker_services[strategy_name] = service
+    return service._chunk_batch(products)
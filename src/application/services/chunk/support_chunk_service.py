@@ -0,0 +1,38 @@
+import logging
+from typing import Iterator
+
+from application.services.chunk.parallel_chunking import ChunkingProgress
+from domain.entities.chunk import Chunk
+from domain.repositories.text_document_repository import TextDocumentRepository
+from domain.services.section_document_chunker import SectionDocumentChunker
+
+logger = logging.getLogger(__name__)
+
+
+class SupportChunkService:
+    """サポート文書チャンク生成サービス
+
+    見出し付きのテキスト文書をセクション単位でチャンク化する
+    """
+
+    def __init__(self, max_chars: int = 500, overlap_lines: int = 1):
+        self._chunker = SectionDocumentChunker(max_chars=max_chars, overlap_lines=overlap_lines)
+        logger.info(
+            f"Initialized SupportChunkService (max chars: {max_chars}, "
+            f"overlap lines: {overlap_lines})"
+        )
+
+    def iter_chunks_for_document(self, document_repo: TextDocumentRepository) -> Iterator[Chunk]:
+        """文書を1行ずつ読み込みながらチャンクを逐次生成"""
+        progress = ChunkingProgress("support sections")
+        sections = set()
+
+        for chunk in self._chunker.iter_chunks(
+            document_repo.iter_lines(), document_repo.document_id
+        ):
+            section = chunk.metadata["section"]
+            progress.update(0 if section in sections else 1, 1)
+            sections.add(section)
+            yield chunk
+
+        progress.finish()
@@ -0,0 +1,131 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from application.services.indexing.indexing_service import IndexingService
+from domain.repositories.faq_repository import FAQRepository
+from domain.repositories.product_repository import ProductRepository
+from domain.repositories.text_document_repository import TextDocumentRepository
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.repositories.file_watcher import FileWatcher
+
+logger = logging.getLogger(__name__)
+
+
+class DataReloadService:
+    """商品・FAQデータファイル（とサポート文書）のホットリロードサービス
+
+    FileWatcher でデータファイルの更新を検知すると、バックグラウンドで
+    1. ファイルを再読み込みしてエンティティ単位の差分を計算し（load_changes）
+    2. 差分のあった商品・FAQのチャンクのみを再インデックス化し（reindex_changes）
+    3. 成功した場合にリポジトリのキャッシュをリストごと置き換える（apply_changes）
+    再インデックス化に失敗した場合はキャッシュを置き換えず、次のポーリングで再試行する。
+    サポート文書はキャッシュを持たないため、更新を検知すると再チャンク化して
+    変更のあったセクションのみを再インデックス化する。
+    ベクトルDBへの書き込み中の検索は、各リポジトリのロックにより一貫した状態を読む。
+    マニフェストの更新で回答キャッシュのインデックスバージョンも変わり、古い回答は使われない
+    """
+
+    def __init__(
+        self,
+        indexing_service: IndexingService,
+        vector_repo: VectorSearchRepository,
+        product_repo: ProductRepository,
+        faq_repo: Optional[FAQRepository] = None,
+        interval_seconds: float = 5.0,
+        support_repo: Optional[TextDocumentRepository] = None,
+    ):
+        self.indexing_service = indexing_service
+        self.vector_repo = vector_repo
+        self.product_repo = product_repo
+        self.faq_repo = faq_repo
+        self.support_repo = support_repo
+        self.watcher = FileWatcher(interval_seconds)
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.reload_count = 0
+        # 商品とFAQの更新が同時に検知されても、マニフェストの読み書きを直列化する
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        product_path: Path,
+        faq_path: Optional[Path] = None,
+        support_path: Optional[Path] = None,
+    ) -> None:
+        """現在のデータを基準として読み込み、データファイルの監視を開始"""
+        self.product_repo.get_all_products()
+        self.watcher.watch(product_path, self.reload_products)
+        if self.faq_repo is not None and faq_path is not None:
+            self.faq_repo.get_all_faqs()
+            self.watcher.watch(faq_path, self.reload_faqs)
+        if self.support_repo is not None and support_path is not None:
+            self.watcher.watch(support_path, self.reload_support)
+        self.watcher.start()
+
+    def stop(self) -> None:
+        """ファイルの監視を停止"""
+        self.watcher.stop()
+
+    def reload_products(self) -> bool:
+        """商品データを再読み込みし、差分を再インデックス化（成功した場合はTrue）"""
+        with self._lock:
+            try:
+                changes = self.product_repo.load_changes()
+                if changes.is_empty:
+                    logger.info("Products file changed, but no product was modified")
+                    return True
+
+                logger.info(f"Reloading products: {changes.summary()}")
+                self.last_result = self.indexing_service.reindex_changes(
+                    self.vector_repo, product_changes=changes
+                )
+                self.product_repo.apply_changes(changes)
+                self.reload_count += 1
+                return True
+
+            except Exception as e:
+                logger.error(f"Failed to reload products, keeping the current data: {e}")
+                return False
+
+    def reload_faqs(self) -> bool:
+        """FAQデータを再読み込みし、差分を再インデックス化（成功した場合はTrue）"""
+        if self.faq_repo is None:
+            return True
+
+        with self._lock:
+            try:
+                changes = self.faq_repo.load_changes()
+                if changes.is_empty:
+                    logger.info("FAQ file changed, but no FAQ was modified")
+                    return True
+
+                logger.info(f"Reloading FAQs: {changes.summary()}")
+                self.last_result = self.indexing_service.reindex_changes(
+                    self.vector_repo, faq_changes=changes
+                )
+                self.faq_repo.apply_changes(changes)
+                self.reload_count += 1
+                return True
+
+            except Exception as e:
+                logger.error(f"Failed to reload FAQs, keeping the current data: {e}")
+                return False
+
+    def reload_support(self) -> bool:
+        """サポート文書の変更されたセクションを再インデックス化（成功した場合はTrue）"""
+        if self.support_repo is None:
+            return True
+
+        with self._lock:
+            try:
+                logger.info("Reloading support document")
+                self.last_result = self.indexing_service.reindex_changes(
+                    self.vector_repo, support_changed=True
+                )
+                self.reload_count += 1
+                return True
+
+            except Exception as e:
+                logger.error(f"Failed to reload the support document: {e}")
+                return False
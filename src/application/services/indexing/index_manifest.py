@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config.settings import Settings
+from domain.entities.chunk import Chunk
+
+logger = logging.getLogger(__name__)
+
+
+class IndexManifest:
+    """インデックス済みチャンクの指紋（fingerprint）を管理するマニフェスト
+
+    chunk_id → 指紋 の対応を保持し、差分インデックス化の基準として使用する。
+    chunk_id → データ種別（product / faq / support）も保持し、一部のデータ源のみを
+    インデックス化した場合に、対象外の種別のチャンクを削除しないようにする
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fingerprints: Optional[Dict[str, str]] = None,
+        product_strategy: Optional[str] = None,
+        faq_strategy: Optional[str] = None,
+        version: Optional[str] = None,
+        data_types: Optional[Dict[str, str]] = None,
+    ):
+        self.path = path
+        self.fingerprints: Dict[str, str] = fingerprints or {}
+        self.data_types: Dict[str, str] = data_types or {}
+        self.product_strategy = product_strategy
+        self.faq_strategy = faq_strategy
+        self.version = version
+
+    @staticmethod
+    def path_for(settings: Settings) -> Path:
+        """設定からマニフェストファイルのパスを取得"""
+        return (
+            Path(settings.chroma_persist_directory)
+            / f"{settings.chroma_collection_name}_manifest.json"
+        )
+
+    @classmethod
+    def version_token(cls, settings: Settings) -> Optional[str]:
+        """マニフェストの更新を検知するための軽量なトークンを取得（ファイル未作成ならNone）
+
+        ファイル本体は読まずにstat情報のみを使うため、クエリごとに呼び出しても安価
+        """
+        try:
+            stat = cls.path_for(settings).stat()
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    @staticmethod
+    def fingerprint(chunk: Chunk) -> str:
+        """チャンクのテキストとメタデータから指紋を計算"""
+        metadata_json = json.dumps(chunk.metadata, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(f"{chunk.text}\0{metadata_json}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def data_type(chunk: Chunk) -> str:
+        """チャンクのデータ種別（メタデータにない場合は商品）"""
+        return chunk.metadata.get("data_type", "product")
+
+    def record(self, chunk: Chunk, fingerprint: str) -> None:
+        """チャンクの指紋とデータ種別を記録"""
+        self.fingerprints[chunk.chunk_id] = fingerprint
+        self.data_types[chunk.chunk_id] = self.data_type(chunk)
+
+    def remove(self, chunk_id: str) -> None:
+        """チャンクの記録を削除"""
+        self.fingerprints.pop(chunk_id, None)
+        self.data_types.pop(chunk_id, None)
+
+    @classmethod
+    def load(cls, settings: Settings) -> "IndexManifest":
+        """マニフェストを読み込む（存在しない場合は空のマニフェスト）"""
+        path = cls.path_for(settings)
+        if not path.exists():
+            return cls(path)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            return cls(
+                path,
+                fingerprints=data.get("chunks", {}),
+                product_strategy=data.get("product_strategy"),
+                faq_strategy=data.get("faq_strategy"),
+                version=data.get("version"),
+                data_types=data.get("data_types", {}),
+            )
+
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring corrupted index manifest {path}: {e}")
+            return cls(path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """マニフェストの保存形式（JSON）に変換"""
+        return {
+            "version": self.version,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "product_strategy": self.product_strategy,
+            "faq_strategy": self.faq_strategy,
+            "chunks": self.fingerprints,
+            "data_types": self.data_types,
+        }
+
+    def save(self) -> None:
+        """マニフェストを書き出す（バージョンを更新）"""
+        digest = hashlib.sha256()
+        for chunk_id in sorted(self.fingerprints):
+            digest.update(f"{chunk_id}:{self.fingerprints[chunk_id]}\n".encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+        data = self.to_dict()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+        logger.info(f"Saved index manifest with {len(self.fingerprints)} chunks to {self.path}")
@@ -1,30 +1,47 @@
 import logging
-from typing import Any, Dict, Optional
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
 
 from application.services.chunk.faq_chunk_service import FAQChunkService
 from application.services.chunk.product_chunk_service import ProductChunkService
+from application.services.chunk.support_chunk_service import SupportChunkService
+from application.services.indexing.index_manifest import IndexManifest
 from config.settings import Settings
+from domain.entities.chunk import Chunk
+from domain.entities.entity_changes import EntityChanges
+from domain.entities.faq import FAQ
+from domain.entities.product import Product
 from domain.repositories.faq_repository import FAQRepository
 from domain.repositories.product_repository import ProductRepository
+from domain.repositories.text_document_repository import TextDocumentRepository
 from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.repositories.index_snapshot import IndexSnapshot
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class IndexingService:
     """ベクトルDBへのインデックス化サービス
 
-    異なるチャンク戦略でデータをベクトルDBにインデックス化する
+    異なるチャンク戦略でデータをベクトルDBにインデックス化する。
+    support_repo を指定した場合、サポート文書のセクション単位のチャンクも index_data に含める
     """
 
+    DATA_TYPES = ("product", "faq", "support")
+
     def __init__(
         self,
         product_repo: ProductRepository,
         settings: Settings,
         faq_repo: Optional[FAQRepository] = None,
+        support_repo: Optional[TextDocumentRepository] = None,
     ):
         self.product_repo = product_repo
         self.faq_repo = faq_repo
+        self.support_repo = support_repo
         self.settings = settings
 
     def index_product_with_strategy(
@@ -188,50 +205,396 @@ class IndexingService:
         vector_repo: VectorSearchRepository,
         product_strategy: str,
         faq_strategy: str,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
-        """商品とFAQの両データを統合してインデックス化"""
+        """商品とFAQ（とサポート文書）のデータを統合してインデックス化
+
+        データはリポジトリからストリーミングで読み込み、チャンク生成・差分判定・
+        ベクトルDB登録までを indexing_batch_size 件ずつ流すため、
+        カタログの規模に関わらずメモリ使用量は一定に保たれる。
+        incremental=Trueの場合はマニフェストとの差分のみを反映する
+        （新規・変更チャンクのupsertと、消えたチャンクの削除）。
+        サポート文書のチャンクIDはセクションごとに決まるため、変更のあったセクションのみが
+        再インデックスの対象となる。
+        削除の対象は今回チャンクを生成したデータ種別のみで、FAQ・サポート文書のリポジトリを
+        指定していない場合、その種別の既存チャンクは削除せずマニフェストに引き継ぐ
+        """
         try:
-            logger.info(f"Starting indexing - Product: {product_strategy}, FAQ: {faq_strategy}")
+            logger.info(
+                f"Starting {'incremental' if incremental else 'full'} indexing - "
+                f"Product: {product_strategy}, FAQ: {faq_strategy}"
+            )
 
-            all_chunks = []
+            counts = {
+                "products": 0,
+                "faqs": 0,
+                "product_chunks": 0,
+                "faq_chunks": 0,
+                "support_chunks": 0,
+                "added": 0,
+                "updated": 0,
+                "unchanged": 0,
+            }
+            phase_timings = {"read_and_chunk": 0.0, "upsert": 0.0, "delete": 0.0, "manifest": 0.0}
 
-            products = self.product_repo.get_all_products()
-            if products:
-                chunk_service = ProductChunkService(product_strategy)
-                product_chunks = chunk_service.generate_chunks_for_products(products)
-                all_chunks.extend(product_chunks)
-
-            if self.faq_repo:
-                faqs = self.faq_repo.get_all_faqs()
-                if faqs:
-                    faq_chunk_service = FAQChunkService(faq_strategy)
-                    faq_chunks = faq_chunk_service.generate_chunks_for_faqs(faqs)
-                    all_chunks.extend(faq_chunks)
-
-            if not all_chunks:
-                raise ValueError("No data found to index")
+            previous = IndexManifest.load(self.settings) if incremental else None
+            manifest = IndexManifest(
+                IndexManifest.path_for(self.settings),
+                product_strategy=product_strategy,
+                faq_strategy=faq_strategy,
+            )
 
-            texts = [chunk.text for chunk in all_chunks]
-            metadatas = [chunk.metadata for chunk in all_chunks]
-            ids = [chunk.chunk_id for chunk in all_chunks]
+            chunk_stream = self._iter_changed_chunks(
+                self._iter_all_chunks(product_strategy, faq_strategy, counts),
+                previous,
+                manifest,
+                counts,
+            )
 
-            vector_repo.add_documents(texts, metadatas, ids)
+            phase_start = time.perf_counter()
+            for batch in self._iter_batches(chunk_stream, self.settings.indexing_batch_size):
+                phase_timings["read_and_chunk"] += time.perf_counter() - phase_start
+
+                phase_start = time.perf_counter()
+                vector_repo.add_documents(
+                    [chunk.text for chunk in batch],
+                    [chunk.metadata for chunk in batch],
+                    [chunk.chunk_id for chunk in batch],
+                )
+                phase_timings["upsert"] += time.perf_counter() - phase_start
+                phase_start = time.perf_counter()
+            phase_timings["read_and_chunk"] += time.perf_counter() - phase_start
+
+            if not manifest.fingerprints:
+                raise ValueError("No data found to index")
 
+            phase_start = time.perf_counter()
+            deleted_ids: List[str] = []
+            kept_ids: List[str] = []
+            if previous:
+                indexed_types = self._indexed_data_types()
+                for chunk_id in sorted(set(previous.fingerprints) - set(manifest.fingerprints)):
+                    data_type = previous.data_types.get(chunk_id)
+                    # 種別が記録されていない古いマニフェストは、全種別を生成した場合のみ削除する
+                    if data_type in indexed_types or (
+                        data_type is None and len(indexed_types) == len(self.DATA_TYPES)
+                    ):
+                        deleted_ids.append(chunk_id)
+                    else:
+                        manifest.fingerprints[chunk_id] = previous.fingerprints[chunk_id]
+                        if data_type is not None:
+                            manifest.data_types[chunk_id] = data_type
+                        kept_ids.append(chunk_id)
+            if deleted_ids:
+                vector_repo.delete_documents(deleted_ids)
+            phase_timings["delete"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            # 変更がない場合は書き出さない（マニフェストの更新はRAGの回答キャッシュを無効化する）
+            if self._index_changed(previous, manifest, counts, deleted_ids):
+                vector_repo.persist()
+                manifest.save()
+            else:
+                manifest.version = previous.version if previous else None
+            phase_timings["manifest"] = time.perf_counter() - phase_start
+
+            total_chunks = (
+                counts["product_chunks"] + counts["faq_chunks"] + counts["support_chunks"]
+            )
             result = {
                 "product_strategy": product_strategy,
                 "faq_strategy": faq_strategy,
-                "total_products": len(products),
-                "total_faqs": len(faqs) if self.faq_repo else 0,
-                "total_chunks": len(all_chunks),
-                "product_chunks": len(product_chunks) if products else 0,
-                "faq_chunks": len(faq_chunks) if self.faq_repo and faqs else 0,
+                "incremental": incremental,
+                "total_products": counts["products"],
+                "total_faqs": counts["faqs"],
+                "total_chunks": total_chunks,
+                "product_chunks": counts["product_chunks"],
+                "faq_chunks": counts["faq_chunks"],
+                "support_chunks": counts["support_chunks"],
+                "added_chunks": counts["added"],
+                "updated_chunks": counts["updated"],
+                "deleted_chunks": len(deleted_ids),
+                "unchanged_chunks": counts["unchanged"],
+                "kept_chunks": len(kept_ids),
+                "phase_timings": phase_timings,
+                "manifest_version": manifest.version,
                 "success": True,
             }
 
-            logger.info(f"Indexing completed - Total chunks: {len(all_chunks)}")
+            logger.info(
+                f"Indexing completed - Total chunks: {total_chunks}, "
+                f"Added: {counts['added']}, Updated: {counts['updated']}, "
+                f"Deleted: {len(deleted_ids)}, Unchanged: {counts['unchanged']}, "
+                f"Kept (not indexed in this run): {len(kept_ids)}"
+            )
 
             return result
 
         except Exception as e:
             logger.error(f"Failed to index data: {e}")
             raise RuntimeError(f"Indexing failed: {e}")
+
+    def reindex_changes(
+        self,
+        vector_repo: VectorSearchRepository,
+        product_changes: Optional[EntityChanges[Product]] = None,
+        faq_changes: Optional[EntityChanges[FAQ]] = None,
+        support_changed: bool = False,
+    ) -> Dict[str, Any]:
+        """変更のあった商品・FAQ（とサポート文書）のチャンクのみを再インデックス化
+
+        マニフェストに記録されたチャンク戦略で、変更前後のエンティティからチャンクを生成し、
+        指紋の変わったチャンクのupsertと、変更後に存在しなくなったチャンクの削除を行う。
+        category_unified戦略のFAQはカテゴリ単位のチャンクのため、変更のあったカテゴリを対象とする。
+        support_changed=True の場合はサポート文書を再チャンク化し、マニフェストの指紋と
+        比較して変更のあったセクションのみを反映する（support_repo が必要）
+        """
+        try:
+            start = time.perf_counter()
+            manifest = IndexManifest.load(self.settings)
+            if not manifest.fingerprints or not manifest.product_strategy:
+                raise ValueError("Index manifest is empty. Run index_data() first.")
+
+            old_ids: Set[str] = set()
+            new_chunks: List[Chunk] = []
+
+            if product_changes and not product_changes.is_empty:
+                chunk_service = ProductChunkService(manifest.product_strategy)
+                old_ids.update(
+                    chunk.chunk_id
+                    for chunk in chunk_service.generate_chunks_for_products(
+                        product_changes.removed + [old for old, _ in product_changes.updated]
+                    )
+                )
+                new_chunks.extend(
+                    chunk_service.generate_chunks_for_products(
+                        product_changes.added + [new for _, new in product_changes.updated]
+                    )
+                )
+
+            if faq_changes and not faq_changes.is_empty and manifest.faq_strategy:
+                faq_chunk_service = FAQChunkService(manifest.faq_strategy)
+                if manifest.faq_strategy == "category_unified":
+                    categories = {faq.category for faq in faq_changes.added + faq_changes.removed}
+                    for old, new in faq_changes.updated:
+                        categories.update((old.category, new.category))
+                    old_faqs = [faq for faq in faq_changes.previous if faq.category in categories]
+                    new_faqs = [faq for faq in faq_changes.entities if faq.category in categories]
+                else:
+                    old_faqs = faq_changes.removed + [old for old, _ in faq_changes.updated]
+                    new_faqs = faq_changes.added + [new for _, new in faq_changes.updated]
+                old_ids.update(
+                    chunk.chunk_id for chunk in faq_chunk_service.generate_chunks_for_faqs(old_faqs)
+                )
+                new_chunks.extend(faq_chunk_service.generate_chunks_for_faqs(new_faqs))
+
+            if support_changed:
+                if self.support_repo is None:
+                    raise ValueError("support_repo is required to reindex the support document")
+                old_ids.update(
+                    chunk_id
+                    for chunk_id, data_type in manifest.data_types.items()
+                    if data_type == "support"
+                )
+                new_chunks.extend(
+                    self._support_chunk_service().iter_chunks_for_document(self.support_repo)
+                )
+
+            counts = {"added": 0, "updated": 0, "unchanged": 0}
+            previous = IndexManifest(
+                manifest.path, dict(manifest.fingerprints), data_types=dict(manifest.data_types)
+            )
+            changed_chunks = list(self._iter_changed_chunks(new_chunks, previous, manifest, counts))
+            for batch in self._iter_batches(changed_chunks, self.settings.indexing_batch_size):
+                vector_repo.add_documents(
+                    [chunk.text for chunk in batch],
+                    [chunk.metadata for chunk in batch],
+                    [chunk.chunk_id for chunk in batch],
+                )
+
+            new_ids = {chunk.chunk_id for chunk in new_chunks}
+            deleted_ids = sorted((old_ids - new_ids) & set(manifest.fingerprints))
+            if deleted_ids:
+                vector_repo.delete_documents(deleted_ids)
+                for chunk_id in deleted_ids:
+                    manifest.remove(chunk_id)
+
+            if changed_chunks or deleted_ids:
+                vector_repo.persist()
+                manifest.save()
+
+            result = {
+                "product_changes": product_changes.summary() if product_changes else {},
+                "faq_changes": faq_changes.summary() if faq_changes else {},
+                "support_changed": support_changed,
+                "added_chunks": counts["added"],
+                "updated_chunks": counts["updated"],
+                "deleted_chunks": len(deleted_ids),
+                "unchanged_chunks": counts["unchanged"],
+                "manifest_version": manifest.version,
+                "elapsed_seconds": time.perf_counter() - start,
+                "success": True,
+            }
+
+            logger.info(
+                f"Reindexed changes - Added: {counts['added']}, Updated: {counts['updated']}, "
+                f"Deleted: {len(deleted_ids)}, Unchanged: {counts['unchanged']}"
+            )
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to reindex changes: {e}")
+            raise RuntimeError(f"Incremental reindexing failed: {e}")
+
+    @staticmethod
+    def _index_changed(
+        previous: Optional[IndexManifest],
+        manifest: IndexManifest,
+        counts: Dict[str, int],
+        deleted_ids: List[str],
+    ) -> bool:
+        """差分インデックス化でベクトルDBかマニフェストの内容が変わったか（全件の場合は常にTrue）"""
+        if previous is None:
+            return True
+        return bool(
+            counts["added"]
+            or counts["updated"]
+            or deleted_ids
+            or previous.product_strategy != manifest.product_strategy
+            or previous.faq_strategy != manifest.faq_strategy
+            or previous.data_types != manifest.data_types
+        )
+
+    def create_snapshot(
+        self, vector_repo: VectorSearchRepository, directory: Path
+    ) -> Dict[str, Any]:
+        """構築済みのインデックスからスナップショットを作成
+
+        index_data で構築したベクトルDBの埋め込み・メタデータと、マニフェスト（チャンクの指紋と
+        チャンク戦略）を1つの成果物にまとめる。新しいレプリカは再インデックスの代わりに
+        これを index_snapshot_directory に配置して起動する
+        """
+        try:
+            start = time.perf_counter()
+            manifest = IndexManifest.load(self.settings)
+            if not manifest.fingerprints:
+                raise ValueError("Index manifest is empty. Run index_data() first.")
+
+            snapshot = IndexSnapshot.write(
+                directory,
+                vector_repo.iter_indexed_documents(self.settings.indexing_batch_size),
+                manifest.to_dict(),
+                embedding_provider=self.settings.embedding_provider,
+                embedding_model=self.settings.embedding_model,
+            )
+            if snapshot.document_count != len(manifest.fingerprints):
+                logger.warning(
+                    f"Snapshot contains {snapshot.document_count} documents, "
+                    f"but the manifest lists {len(manifest.fingerprints)} chunks"
+                )
+
+            return {
+                "directory": str(directory),
+                "document_count": snapshot.document_count,
+                "dimension": snapshot.dimension,
+                "embedding_model": snapshot.embedding_model,
+                "product_strategy": manifest.product_strategy,
+                "faq_strategy": manifest.faq_strategy,
+                "manifest_version": manifest.version,
+                "size_bytes": sum(f["bytes"] for f in snapshot.info["files"].values()),
+                "elapsed_seconds": time.perf_counter() - start,
+                "success": True,
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to create index snapshot: {e}")
+            raise RuntimeError(f"Snapshot creation failed: {e}")
+
+    def _iter_all_chunks(
+        self, product_strategy: str, faq_strategy: str, counts: Dict[str, int]
+    ) -> Iterator[Chunk]:
+        """商品・FAQ・サポート文書のストリームからチャンクを逐次生成（件数はcountsに集計）"""
+
+        def count_items(items: Iterable[T], key: str) -> Iterator[T]:
+            for item in items:
+                counts[key] += 1
+                yield item
+
+        chunk_service = ProductChunkService(
+            product_strategy,
+            workers=self.settings.chunking_workers,
+            batch_size=self.settings.chunking_batch_size,
+        )
+        for chunk in chunk_service.iter_chunks_for_products(
+            count_items(self.product_repo.iter_products(), "products")
+        ):
+            counts["product_chunks"] += 1
+            yield chunk
+
+        if self.faq_repo:
+            faq_chunk_service = FAQChunkService(
+                faq_strategy,
+                workers=self.settings.chunking_workers,
+                batch_size=self.settings.chunking_batch_size,
+            )
+            for chunk in faq_chunk_service.iter_chunks_for_faqs(
+                count_items(self.faq_repo.iter_faqs(), "faqs")
+            ):
+                counts["faq_chunks"] += 1
+                yield chunk
+
+        if self.support_repo:
+            support_chunk_service = self._support_chunk_service()
+            for chunk in support_chunk_service.iter_chunks_for_document(self.support_repo):
+                counts["support_chunks"] += 1
+                yield chunk
+
+    def _support_chunk_service(self) -> SupportChunkService:
+        return SupportChunkService(
+            max_chars=self.settings.support_chunk_max_chars,
+            overlap_lines=self.settings.support_chunk_overlap_lines,
+        )
+
+    def _indexed_data_types(self) -> Set[str]:
+        """index_data でチャンクを生成するデータ種別（リポジトリを指定した種別）"""
+        data_types = {"product"}
+        if self.faq_repo:
+            data_types.add("faq")
+        if self.support_repo:
+            data_types.add("support")
+        return data_types
+
+    def _iter_changed_chunks(
+        self,
+        chunks: Iterable[Chunk],
+        previous: Optional[IndexManifest],
+        manifest: IndexManifest,
+        counts: Dict[str, int],
+    ) -> Iterator[Chunk]:
+        """前回マニフェストと比較し、新規・変更チャンクのみを返す"""
+        for chunk in chunks:
+            fingerprint = IndexManifest.fingerprint(chunk)
+            manifest.record(chunk, fingerprint)
+
+            previous_fingerprint = previous.fingerprints.get(chunk.chunk_id) if previous else None
+            if previous_fingerprint is None:
+                counts["added"] += 1
+                yield chunk
+            elif previous_fingerprint != fingerprint:
+                counts["updated"] += 1
+                yield chunk
+            else:
+                counts["unchanged"] += 1
+
+    @staticmethod
+    def _iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+        """イテラブルを指定件数ごとのリストに分割"""
+        batch: List[T] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,214 @@
+import dataclasses
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.query_result import QueryResult
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_PUNCTUATION = re.compile(r"[?？!！。．.、,\s]+$")
+# 数量とその向き（以下・以上など）。類似質問でも数量の条件が異なれば別の質問とみなす
+_QUANTITY_PATTERN = re.compile(
+    r"\d+(?:[.,]\d+)*\s*[万千]?\s*円?\s*"
+    r"(?:以下|以上|未満|まで|以内|超|より高い|前後|くらい|ぐらい|程度|から|〜|~)?"
+)
+# put の index_version を省略した場合（登録時のバージョンで判定しない）
+_UNSPECIFIED: Any = object()
+
+
+@dataclass
+class _CacheEntry:
+    """キャッシュエントリ"""
+
+    result: QueryResult
+    embedding: Optional[np.ndarray]
+    created_at: float
+    quantities: Tuple[str, ...] = ()
+
+
+class AnswerCache:
+    """RAG回答の2段キャッシュ
+
+    - Tier 1: 正規化した質問文の完全一致
+    - Tier 2: クエリ埋め込みのコサイン類似度が閾値以上の類似質問
+      （「3万円以下」と「5万円以下」のように数量の条件が異なる質問は一致とみなさない）
+
+    エントリはTTLで失効し、件数上限を超えるとLRUで追い出す。
+    index_version_provider の返す値が変わった場合（再インデックス時）は全エントリを破棄する。
+    検索前に index_version() で取得したバージョンを put に渡すと、回答の生成中に
+    再インデックスされた場合は古いドキュメントに基づく回答を登録しない
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 1000,
+        similarity_threshold: float = 0.95,
+        embed_query: Optional[Callable[[str], List[float]]] = None,
+        index_version_provider: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embed_query = embed_query
+        self.index_version_provider = index_version_provider
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._index_version = self._current_index_version()
+        self._last_embedding: Optional[Tuple[str, np.ndarray]] = None
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        """質問文を正規化（全角半角・大文字小文字・空白・末尾記号の揺れを吸収）"""
+        normalized = unicodedata.normalize("NFKC", question).lower()
+        normalized = " ".join(normalized.split())
+        return _TRAILING_PUNCTUATION.sub("", normalized)
+
+    def get(self, question: str) -> Optional[QueryResult]:
+        """キャッシュ済みの回答を取得（なければNone）"""
+        key = self.normalize(question)
+        with self._lock:
+            self._check_index_version()
+
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_expired(entry):
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return self._to_cached_result(entry, question)
+
+        if self.embed_query is None or not self._entries:
+            self.misses += 1
+            return None
+
+        embedding = self._embed(key)
+        with self._lock:
+            self._last_embedding = (key, embedding)
+            match_key = self._find_similar(embedding, self._quantities(key))
+            if match_key is not None:
+                self._entries.move_to_end(match_key)
+                self.semantic_hits += 1
+                return self._to_cached_result(self._entries[match_key], question)
+
+        self.misses += 1
+        return None
+
+    def index_version(self) -> Optional[str]:
+        """現在のインデックスのバージョン（回答の生成前に取得し、put に渡す）"""
+        return self._current_index_version()
+
+    def put(self, question: str, result: QueryResult, index_version: Any = _UNSPECIFIED) -> None:
+        """回答をキャッシュに登録
+
+        index_version を指定した場合、登録時点のバージョンと異なれば（回答の生成中に
+        再インデックスされた場合）登録しない
+        """
+        key = self.normalize(question)
+
+        embedding: Optional[np.ndarray] = None
+        if self.embed_query is not None:
+            last = self._last_embedding
+            embedding = last[1] if last is not None and last[0] == key else self._embed(key)
+
+        with self._lock:
+            self._check_index_version()
+            if index_version is not _UNSPECIFIED and index_version != self._index_version:
+                logger.info("Index changed while answering, not caching the answer")
+                return
+            self._entries[key] = _CacheEntry(
+                result=result,
+                embedding=embedding,
+                created_at=time.monotonic(),
+                quantities=self._quantities(key),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """全エントリを破棄"""
+        with self._lock:
+            self._entries.clear()
+            self._last_embedding = None
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報を取得"""
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups > 0 else 0.0,
+        }
+
+    def _embed(self, text: str) -> np.ndarray:
+        """正規化済みのクエリ埋め込みを計算"""
+        assert self.embed_query is not None
+        vector = np.asarray(self.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _find_similar(self, embedding: np.ndarray, quantities: Tuple[str, ...]) -> Optional[str]:
+        """類似度が閾値以上で最も近い、数量の条件が同じ有効エントリのキーを取得"""
+        best_key: Optional[str] = None
+        best_score = self.similarity_threshold
+
+        for key, entry in list(self._entries.items()):
+            if self._is_expired(entry):
+                del self._entries[key]
+                continue
+            if entry.embedding is None or entry.quantities != quantities:
+                continue
+            score = float(np.dot(entry.embedding, embedding))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        return best_key
+
+    @staticmethod
+    def _quantities(key: str) -> Tuple[str, ...]:
+        """正規化済みの質問文から数量の条件を抽出（空白・桁区切りは除く）"""
+        return tuple(re.sub(r"[\s,]", "", match) for match in _QUANTITY_PATTERN.findall(key))
+
+    def _is_expired(self, entry: _CacheEntry) -> bool:
+        return time.monotonic() - entry.created_at > self.ttl_seconds
+
+    def _current_index_version(self) -> Optional[str]:
+        if self.index_version_provider is None:
+            return None
+        return self.index_version_provider()
+
+    def _check_index_version(self) -> None:
+        """インデックスのバージョンが変わっていればキャッシュを破棄"""
+        version = self._current_index_version()
+        if version != self._index_version:
+            if self._entries:
+                logger.info("Index version changed, invalidating answer cache")
+                self.invalidations += 1
+            self._entries.clear()
+            self._last_embedding = None
+            self._index_version = version
+
+    @staticmethod
+    def _to_cached_result(entry: _CacheEntry, question: str) -> QueryResult:
+        """キャッシュエントリから返却用の結果を作成"""
+        return dataclasses.replace(entry.result, query=question, from_cache=True)
@@ -0,0 +1,227 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.entities.query_result import Document
+from infrastructure.tokenizer.token_counter import TokenCounter
+
+# ブロックの見出しに含めるため、本文から取り除く行のラベル
+PRODUCT_HEADER_LABELS = ("商品名", "価格")
+FAQ_HEADER_LABELS = ("カテゴリ", "FAQ ID")
+HEADER_LABELS = {"product": PRODUCT_HEADER_LABELS, "faq": FAQ_HEADER_LABELS, "support": ()}
+
+# 同じ質問文を表すラベル（QA分離型の質問チャンクと回答チャンクで重複する）
+QUESTION_LABELS = ("FAQ質問", "関連質問")
+
+BLOCK_SEPARATOR = "\n\n"
+
+
+@dataclass
+class PackedContext:
+    """トークン予算内に詰めたコンテキスト"""
+
+    text: str
+    tokens: int
+    raw_tokens: int
+    blocks: int
+    documents: int
+    dropped_documents: int
+
+    @property
+    def saved_tokens(self) -> int:
+        """そのまま連結した場合と比べて削減したトークン数"""
+        return max(self.raw_tokens - self.tokens, 0)
+
+    def usage(self) -> Dict[str, Any]:
+        """QueryResult.usage に含めるコンテキストの統計情報"""
+        return {
+            "context_tokens": self.tokens,
+            "context_raw_tokens": self.raw_tokens,
+            "context_saved_tokens": self.saved_tokens,
+            "context_blocks": self.blocks,
+            "context_dropped_documents": self.dropped_documents,
+        }
+
+
+@dataclass
+class _Block:
+    """同じ商品・FAQのチャンクをまとめたコンテキストのブロック"""
+
+    data_type: str
+    header: List[str]
+    lines: List[str]
+    documents: int
+
+
+class ContextPacker:
+    """検索結果をLLMに渡すコンテキストに詰めるサービス
+
+    細粒度の戦略では同じ商品の複数チャンクが上位に並び、各チャンクが商品名等の
+    見出しを繰り返すため、そのまま連結するとプロンプトのトークンを浪費する。
+    - product_id / faq_id / サポート文書のセクションごとにチャンクを1つのブロックにまとめる
+      （ブロックの順序は最上位のヒット順）
+    - 見出しに含めた項目の行と、ブロック内で重複する行を取り除く
+    - max_tokens（0は無制限）に収まるまで上位のブロックから詰める
+
+    トークン数はローカルのトークナイザーで計測し、そのまま連結した場合との差を削減量として報告する
+    """
+
+    def __init__(self, token_counter: TokenCounter, max_tokens: int = 0, enabled: bool = True):
+        self.token_counter = token_counter
+        self.max_tokens = max_tokens
+        self.enabled = enabled
+
+    def pack(self, documents: List[Document]) -> PackedContext:
+        """ドキュメントをコンテキストに詰める"""
+        raw_text = self.format_verbatim(documents)
+        raw_tokens = self.token_counter.count(raw_text)
+        if not self.enabled:
+            return PackedContext(
+                text=raw_text,
+                tokens=raw_tokens,
+                raw_tokens=raw_tokens,
+                blocks=len(documents),
+                documents=len(documents),
+                dropped_documents=0,
+            )
+
+        blocks = self._build_blocks(documents)
+        separator_tokens = self.token_counter.count(BLOCK_SEPARATOR)
+
+        rendered: List[str] = []
+        used_tokens = 0
+        packed_documents = 0
+        for block in blocks:
+            title = self._title(block.data_type, len(rendered) + 1)
+            text = self._render(title, block.header, block.lines)
+            tokens = self.token_counter.count(text) + (separator_tokens if rendered else 0)
+
+            if self.max_tokens <= 0 or used_tokens + tokens <= self.max_tokens:
+                rendered.append(text)
+                used_tokens += tokens
+                packed_documents += block.documents
+            elif not rendered:
+                # 最上位のブロックだけで予算を超える場合は、収まる行まで切り詰めて含める
+                text = self._truncate(title, block)
+                rendered.append(text)
+                used_tokens += self.token_counter.count(text)
+                packed_documents += block.documents
+
+        text = BLOCK_SEPARATOR.join(rendered)
+        return PackedContext(
+            text=text,
+            tokens=self.token_counter.count(text),
+            raw_tokens=raw_tokens,
+            blocks=len(rendered),
+            documents=packed_documents,
+            dropped_documents=len(documents) - packed_documents,
+        )
+
+    @classmethod
+    def format_verbatim(cls, documents: List[Document]) -> str:
+        """ドキュメントを1件ずつそのまま連結したコンテキストを作成"""
+        formatted_docs = []
+        for i, doc in enumerate(documents, 1):
+            metadata = doc.metadata
+            data_type = metadata.get("data_type", "product")
+
+            # サポート文書のチャンクは本文の先頭にセクション見出しを含む
+            header = "" if data_type == "support" else f"{cls._header(data_type, metadata)}\n"
+            formatted_docs.append(f"{cls._title(data_type, i)}\n{header}{doc.page_content}\n")
+
+        return "\n\n".join(formatted_docs)
+
+    def _build_blocks(self, documents: List[Document]) -> List[_Block]:
+        """ドキュメントを商品・FAQ・セクションごとのブロックにまとめる"""
+        blocks: Dict[Tuple[str, str], _Block] = {}
+        seen_lines: Dict[Tuple[str, str], set] = {}
+
+        for i, doc in enumerate(documents):
+            metadata = doc.metadata
+            data_type = metadata.get("data_type", "product")
+            key = self._group_key(doc, data_type, i)
+
+            block = blocks.get(key)
+            if block is None:
+                header = [self._header(data_type, metadata)]
+                block = _Block(data_type=data_type, header=header, lines=[], documents=0)
+                blocks[key] = block
+                # 本文中の見出しと同じ行（サポート文書のセクション見出し）は重複として除く
+                seen_lines[key] = set(header)
+
+            block.documents += 1
+            header_labels = HEADER_LABELS.get(data_type, PRODUCT_HEADER_LABELS)
+            seen = seen_lines[key]
+            for line in doc.page_content.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                label, _, value = line.partition(":")
+                label, value = label.strip(), value.strip()
+                if label in header_labels:
+                    continue
+
+                dedupe_key = f"question:{value}" if label in QUESTION_LABELS else line
+                if dedupe_key in seen:
+                    continue
+                seen.add(dedupe_key)
+                block.lines.append(line)
+
+        return list(blocks.values())
+
+    def _truncate(self, title: str, block: _Block) -> str:
+        """ブロックを max_tokens に収まる行まで切り詰める"""
+        lines: List[str] = []
+        for line in block.lines:
+            candidate = self._render(title, block.header, lines + [line])
+            if self.token_counter.count(candidate) > self.max_tokens:
+                break
+            lines.append(line)
+        return self._render(title, block.header, lines)
+
+    @staticmethod
+    def _group_key(doc: Document, data_type: str, position: int) -> Tuple[str, str]:
+        """ブロックにまとめる単位のキー（商品ID・FAQ ID・セクション、なければドキュメント単位）"""
+        metadata = doc.metadata
+        if data_type == "faq" and metadata.get("faq_id"):
+            return "faq", str(metadata["faq_id"])
+        if data_type == "support" and metadata.get("section"):
+            return "support", f"{metadata.get('document_id', '')}:{metadata['section']}"
+        if data_type not in ("faq", "support") and metadata.get("product_id"):
+            return "product", str(metadata["product_id"])
+        return "document", doc.doc_id or str(position)
+
+    @staticmethod
+    def _render(title: str, header: List[str], lines: List[str]) -> str:
+        """ブロックをテキストに変換"""
+        return "\n".join([title] + header + lines)
+
+    @staticmethod
+    def _title(data_type: str, index: int) -> str:
+        """ブロックの見出し"""
+        if data_type == "faq":
+            return f"【FAQ情報{index}】"
+        if data_type == "support":
+            return f"【サポート情報{index}】"
+        return f"【商品情報{index}】"
+
+    @classmethod
+    def _header(cls, data_type: str, metadata: Dict[str, Any]) -> str:
+        """ブロックの見出し行（商品名と価格・FAQのカテゴリ・サポート文書のセクション）"""
+        if data_type == "faq":
+            return f"カテゴリ: {metadata.get('category', '不明')}"
+        if data_type == "support":
+            return f"■ {metadata.get('section', '不明')}"
+        return cls._product_header(metadata)
+
+    @staticmethod
+    def _product_header(metadata: Dict[str, Any]) -> str:
+        """商品名と価格の見出し行"""
+        product_name = metadata.get("product_name", "不明")
+        return f"商品名: {product_name}, 価格: {ContextPacker._price_text(metadata.get('price'))}"
+
+    @staticmethod
+    def _price_text(price: Optional[Any]) -> str:
+        """価格の表示用文字列"""
+        if isinstance(price, (int, float)) and not isinstance(price, bool):
+            return f"¥{price:,}"
+        return str(price) if price is not None else "不明"
@@ -0,0 +1,48 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from application.services.benchmark.chunk_strategy_evaluation_service import (
+    SearchEvaluationService,
+)
+from config.settings import Settings
+from infrastructure.embeddings.query_embedding_cache import QueryEmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+
+def collect_warm_up_queries(
+    settings: Settings,
+    cache: QueryEmbeddingCache,
+    top_n: int,
+    include_test_queries: bool = True,
+) -> List[str]:
+    """事前に埋め込むクエリを収集（過去の頻出クエリ上位 top_n 件とテストクエリ）"""
+    queries = cache.top_queries(top_n) if top_n > 0 else []
+    if include_test_queries:
+        try:
+            test_queries = SearchEvaluationService(settings).test_queries
+            queries.extend(test_query["query"] for test_query in test_queries)
+        except RuntimeError as e:
+            logger.warning(f"Skipping test queries for warm-up: {e}")
+    return queries
+
+
+def warm_up_query_cache(
+    settings: Settings,
+    embeddings: Embeddings,
+    top_n: Optional[int] = None,
+    include_test_queries: bool = True,
+) -> Dict[str, Any]:
+    """頻出クエリとテストクエリを埋め込み、クエリ埋め込みのキャッシュに登録
+
+    クエリ埋め込みのキャッシュが無効な場合は何もせず空の辞書を返す
+    """
+    if not isinstance(embeddings, QueryEmbeddingCache):
+        return {}
+
+    if top_n is None:
+        top_n = settings.query_warm_up_top_n
+    queries = collect_warm_up_queries(settings, embeddings, top_n, include_test_queries)
+    return embeddings.warm_up(queries)
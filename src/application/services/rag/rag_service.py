@@ -1,30 +1,66 @@
+import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from langchain_core.output_parsers import StrOutputParser
+from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
 from langchain_openai import ChatOpenAI
 
+from application.services.rag.answer_cache import AnswerCache
+from application.services.rag.context_packer import ContextPacker, PackedContext
+from application.services.rag.rerank_service import RerankService
 from config.settings import Settings
-from domain.entities.query_result import Document, QueryResult
+from domain.entities.query_result import AnswerStreamEvent, Document, QueryResult
+from domain.entities.search_filter import SearchFilter
 from domain.repositories.vector_search_repository import VectorSearchRepository
+from domain.services.query_filter_parser import QueryFilterParser
+from infrastructure.tokenizer.token_counter import TokenCounter
+from infrastructure.tracing.cost import estimate_cost
+from infrastructure.tracing.tracer import Span, get_tracer
 
 logger = logging.getLogger(__name__)
 
+NO_DOCUMENTS_ANSWER = "申し訳ございません。お探しの商品情報やFAQが見つかりませんでした。別の言葉で質問を言い換えていただくか、カテゴリを指定してお試しください。"
+
 
 class RAGService:
-    """RAGを使用した質問応答サービス"""
+    """RAGを使用した質問応答サービス
+
+    answer_cacheを指定した場合、同一・類似の質問には検索とLLM呼び出しを行わず
+    キャッシュ済みの回答を返す。各段階（キャッシュ参照・検索・コンテキスト整形・LLM）は
+    トレーサーのスパンとして計測し、QueryResult.timings / usage に内訳を格納する
+
+    query_filter_enabled の場合、質問文から抽出した価格帯・カテゴリで検索対象を絞り込む。
+    絞り込み結果が検索件数に満たない場合は、絞り込みなしの検索結果で補う。
+
+    rerank_serviceを指定した場合、rerank_candidates 件の候補を検索して
+    リランキングした上位 default_search_results 件をLLMに渡す
+
+    検索結果は ContextPacker で商品・FAQごとにまとめ、context_max_tokens に収まるよう
+    詰めてからLLMに渡す。削減したトークン数は QueryResult.usage に格納する
+    """
 
-    def __init__(self, vector_search_repo: VectorSearchRepository, settings: Settings):
+    def __init__(
+        self,
+        vector_search_repo: VectorSearchRepository,
+        settings: Settings,
+        answer_cache: Optional[AnswerCache] = None,
+        rerank_service: Optional[RerankService] = None,
+    ):
         self.vector_search_repo = vector_search_repo
         self.settings = settings
+        self.answer_cache = answer_cache
+        self.rerank_service = rerank_service
+        self.query_filter_parser = QueryFilterParser() if settings.query_filter_enabled else None
 
         try:
             self.llm = ChatOpenAI(
                 model=settings.llm_model,
                 temperature=settings.temperature,
+                stream_usage=True,
             )
+            self._token_counter: Optional[TokenCounter] = None
+            self._context_packer: Optional[ContextPacker] = None
 
             self.prompt = ChatPromptTemplate.from_messages(
                 [
@@ -45,12 +81,7 @@ class RAGService:
                 ]
             )
 
-            self.chain = (
-                {"context": self._format_documents, "question": RunnablePassthrough()}
-                | self.prompt
-                | self.llm
-                | StrOutputParser()
-            )
+            self.chain = self.prompt | self.llm
 
             logger.info("Initialized RAG service")
 
@@ -64,54 +95,394 @@ class RAGService:
             if not question or not question.strip():
                 raise ValueError("Question cannot be empty")
 
-            documents = self.vector_search_repo.search(
-                query=question, n_results=self.settings.default_search_results
-            )
+            documents: List[Document] = []
+            answer = ""
+            usage: Dict[str, Any] = {}
+
+            tracer = get_tracer()
+            with tracer.span("rag.answer") as root:
+                index_version = self._index_version()
+                cached_result = self._get_cached(question)
+                if cached_result is None:
+                    documents = self._retrieve(question)
+                    if documents:
+                        prompt_inputs, packed = self._build_prompt_inputs(documents, question)
+                        with tracer.span("llm", model=self.settings.llm_model) as llm_span:
+                            message = self.chain.invoke(prompt_inputs)
+                            answer = self._message_text(message)
+                            usage = self._record_usage(
+                                llm_span, message, prompt_inputs, answer, packed
+                            )
+
+            if cached_result is not None:
+                cached_result.timings = self._collect_timings(root)
+                return cached_result
 
             if not documents:
-                logger.warning(f"No documents found for query: {question}")
-                return QueryResult(
-                    query=question,
-                    answer="申し訳ございません。お探しの商品情報やFAQが見つかりませんでした。別の言葉で質問を言い換えていただくか、カテゴリを指定してお試しください。",
-                    source_documents=[],
-                )
+                return self._no_documents_result(question, root)
+
+            logger.info(f"Generated answer for question: {question[:50]}...")
+
+            result = QueryResult(
+                query=question,
+                answer=answer,
+                source_documents=documents,
+                timings=self._collect_timings(root),
+                usage=usage,
+            )
+            if self.answer_cache is not None:
+                self.answer_cache.put(question, result, index_version)
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to generate answer: {e}")
+            raise RuntimeError(f"Failed to generate answer: {e}")
 
-            answer = self.chain.invoke({"documents": documents, "question": question})
+    async def aanswer(self, question: str) -> QueryResult:
+        """質問に対する回答を非同期で生成
+
+        検索とLLM呼び出しを待機中にイベントループを解放するため、
+        1プロセスで多数の質問を並行して処理できる
+        """
+        try:
+            if not question or not question.strip():
+                raise ValueError("Question cannot be empty")
+
+            documents: List[Document] = []
+            answer = ""
+            usage: Dict[str, Any] = {}
+
+            tracer = get_tracer()
+            with tracer.span("rag.answer") as root:
+                index_version = self._index_version()
+                # 類似質問の判定でクエリ埋め込みを計算する場合があるためスレッドで実行する
+                cached_result = await asyncio.to_thread(self._get_cached, question)
+                if cached_result is None:
+                    documents = await self._aretrieve(question)
+                    if documents:
+                        prompt_inputs, packed = self._build_prompt_inputs(documents, question)
+                        with tracer.span("llm", model=self.settings.llm_model) as llm_span:
+                            message = await self.chain.ainvoke(prompt_inputs)
+                            answer = self._message_text(message)
+                            usage = self._record_usage(
+                                llm_span, message, prompt_inputs, answer, packed
+                            )
+
+            if cached_result is not None:
+                cached_result.timings = self._collect_timings(root)
+                return cached_result
+
+            if not documents:
+                return self._no_documents_result(question, root)
 
             logger.info(f"Generated answer for question: {question[:50]}...")
 
-            return QueryResult(query=question, answer=answer, source_documents=documents)
+            result = QueryResult(
+                query=question,
+                answer=answer,
+                source_documents=documents,
+                timings=self._collect_timings(root),
+                usage=usage,
+            )
+            if self.answer_cache is not None:
+                await asyncio.to_thread(self.answer_cache.put, question, result, index_version)
+
+            return result
 
         except Exception as e:
             logger.error(f"Failed to generate answer: {e}")
             raise RuntimeError(f"Failed to generate answer: {e}")
 
-    def _format_documents(self, inputs: Dict[str, Any]) -> str:
-        """ドキュメントをコンテキスト用にフォーマット"""
-        documents: List[Document] = inputs.get("documents", [])
+    def answer_stream(self, question: str) -> Iterator[AnswerStreamEvent]:
+        """質問に対する回答をストリーミングで生成
+
+        検索したドキュメントを最初に返し、その後LLMが生成したトークンを逐次返す。
+        最後に完成した回答（QueryResult）を "done" イベントで返す
+        """
+        tracer = get_tracer()
+        root: Optional[Span] = None
+        llm_span: Optional[Span] = None
+        completed = False
+        try:
+            if not question or not question.strip():
+                raise ValueError("Question cannot be empty")
+
+            # yieldをまたいで現在のスパンが残らないよう、スパンの有効化は区間ごとに行う
+            root = tracer.start_span("rag.answer_stream")
+            index_version = self._index_version()
+            with tracer.use_span(root):
+                cached_result = self._get_cached(question)
+
+            if cached_result is not None:
+                tracer.end_span(root)
+                cached_result.timings = self._collect_timings(root)
+                cached_result.timings["first_token_ms"] = cached_result.timings["total_ms"]
+                yield AnswerStreamEvent("documents", documents=cached_result.source_documents)
+                yield AnswerStreamEvent("token", token=cached_result.answer)
+                yield AnswerStreamEvent("done", result=cached_result)
+                return
+
+            with tracer.use_span(root):
+                documents = self._retrieve(question)
+            yield AnswerStreamEvent("documents", documents=documents)
 
-        if not documents:
-            return ""
+            if not documents:
+                result = self._no_documents_result(question, root)
+                result.timings["first_token_ms"] = result.timings["total_ms"]
+                yield AnswerStreamEvent("token", token=NO_DOCUMENTS_ANSWER)
+                yield AnswerStreamEvent("done", result=result)
+                return
+
+            with tracer.use_span(root):
+                prompt_inputs, packed = self._build_prompt_inputs(documents, question)
+                llm_span = tracer.start_span("llm", model=self.settings.llm_model)
+
+            tokens: List[str] = []
+            message: Optional[BaseMessage] = None
+            first_token_ms: Optional[float] = None
+            for chunk in self.chain.stream(prompt_inputs):
+                message = chunk if message is None else message + chunk
+                token = self._message_text(chunk)
+                if not token:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = root.duration_ms
+                tokens.append(token)
+                yield AnswerStreamEvent("token", token=token)
+
+            answer = "".join(tokens)
+            usage = self._record_usage(llm_span, message, prompt_inputs, answer, packed)
+            completed = True
+            tracer.end_span(llm_span)
+            tracer.end_span(root)
+
+            timings = self._collect_timings(root)
+            timings["first_token_ms"] = (
+                first_token_ms if first_token_ms is not None else timings["total_ms"]
+            )
+
+            logger.info(
+                f"Streamed answer for question: {question[:50]}... "
+                f"(first token: {timings['first_token_ms']:.0f}ms, "
+                f"total: {timings['total_ms']:.0f}ms)"
+            )
+
+            result = QueryResult(
+                query=question,
+                answer=answer,
+                source_documents=documents,
+                timings=timings,
+                usage=usage,
+            )
+            if self.answer_cache is not None:
+                self.answer_cache.put(question, result, index_version)
 
-        formatted_docs = []
-        for i, doc in enumerate(documents, 1):
-            metadata = doc.metadata
-            data_type = metadata.get("data_type", "product")
+            yield AnswerStreamEvent("done", result=result)
 
-            if data_type == "faq":
-                title = f"【FAQ情報{i}】"
-                category = metadata.get("category", "不明")
-                formatted_docs.append(
-                    f"{title}\n" f"カテゴリ: {category}\n" f"{doc.page_content}\n"
+        except Exception as e:
+            if llm_span is not None:
+                llm_span.set_attribute("error", str(e))
+            logger.error(f"Failed to generate answer: {e}")
+            raise RuntimeError(f"Failed to generate answer: {e}")
+        finally:
+            # LLMの呼び出しが失敗した場合や、利用側が途中で読むのをやめた場合（GeneratorExit）も
+            # スパンを終了してエクスポートする（end_span は終了済みのスパンでは何もしない）
+            if llm_span is not None:
+                if not completed:
+                    llm_span.set_attribute("completed", False)
+                tracer.end_span(llm_span)
+            if root is not None:
+                tracer.end_span(root)
+
+    def _index_version(self) -> Optional[str]:
+        """検索前のインデックスのバージョン（回答キャッシュへの登録時の判定用）"""
+        return self.answer_cache.index_version() if self.answer_cache is not None else None
+
+    def _get_cached(self, question: str) -> Optional[QueryResult]:
+        """回答キャッシュを参照（キャッシュ未設定ならNone）"""
+        if self.answer_cache is None:
+            return None
+
+        with get_tracer().span("answer_cache") as span:
+            cached_result = self.answer_cache.get(question)
+            span.set_attribute("hit", cached_result is not None)
+
+        if cached_result is not None:
+            logger.info(f"Answer cache hit for question: {question[:50]}...")
+        return cached_result
+
+    def _retrieve(self, question: str) -> List[Document]:
+        """質問に関連するドキュメントを検索"""
+        n_results = self._candidate_count()
+        with get_tracer().span("retrieval") as span:
+            filters = self._parse_filters(question, span)
+            documents = self.vector_search_repo.search(
+                query=question, n_results=n_results, filters=filters
+            )
+            if filters is not None and len(documents) < n_results:
+                documents = self._merge_documents(
+                    documents,
+                    self.vector_search_repo.search(query=question, n_results=n_results),
+                    n_results,
                 )
-            else:
-                title = f"【商品情報{i}】"
-                product_name = metadata.get("product_name", "不明")
-                price = metadata.get("price", "不明")
-                formatted_docs.append(
-                    f"{title}\n" f"商品名: {product_name}, 価格: ¥{price:,}\n"
-                    if isinstance(price, (int, float))
-                    else f"商品名: {product_name}, 価格: {price}\n" f"{doc.page_content}\n"
+            span.set_attribute("documents", len(documents))
+        return self._rerank(question, documents)
+
+    async def _aretrieve(self, question: str) -> List[Document]:
+        """質問に関連するドキュメントを非同期で検索"""
+        n_results = self._candidate_count()
+        with get_tracer().span("retrieval") as span:
+            filters = self._parse_filters(question, span)
+            documents = await self.vector_search_repo.asearch(
+                query=question, n_results=n_results, filters=filters
+            )
+            if filters is not None and len(documents) < n_results:
+                documents = self._merge_documents(
+                    documents,
+                    await self.vector_search_repo.asearch(query=question, n_results=n_results),
+                    n_results,
                 )
+            span.set_attribute("documents", len(documents))
+        # クロスエンコーダー等の計算でイベントループを止めないようスレッドで実行する
+        return await asyncio.to_thread(self._rerank, question, documents)
+
+    def _candidate_count(self) -> int:
+        """検索する候補数（リランキングする場合は多めに取得する）"""
+        if self.rerank_service is None:
+            return self.settings.default_search_results
+        return max(self.settings.rerank_candidates, self.settings.default_search_results)
+
+    def _rerank(self, question: str, documents: List[Document]) -> List[Document]:
+        """候補をリランキングして上位を返す"""
+        if self.rerank_service is None:
+            return documents
+        return self.rerank_service.rerank(question, documents, self.settings.default_search_results)
+
+    def _parse_filters(self, question: str, span: Span) -> Optional[SearchFilter]:
+        """質問文から検索フィルターを抽出"""
+        if self.query_filter_parser is None:
+            return None
+
+        filters = self.query_filter_parser.parse(question)
+        if filters is not None:
+            span.set_attribute("filter", str(filters))
+            logger.info(f"Applying search filter: {filters}")
+        return filters
+
+    @staticmethod
+    def _merge_documents(
+        filtered: List[Document], unfiltered: List[Document], n_results: int
+    ) -> List[Document]:
+        """絞り込み結果を優先し、不足分を絞り込みなしの結果で補う"""
+        documents = list(filtered)
+        seen = {doc.doc_id or doc.page_content for doc in documents}
+        for doc in unfiltered:
+            if len(documents) >= n_results:
+                break
+            key = doc.doc_id or doc.page_content
+            if key not in seen:
+                seen.add(key)
+                documents.append(doc)
+        return documents
+
+    def _build_prompt_inputs(
+        self, documents: List[Document], question: str
+    ) -> Tuple[Dict[str, str], PackedContext]:
+        """プロンプトに渡すコンテキストと質問を作成"""
+        with get_tracer().span("format_documents") as span:
+            packed = self._format_documents(documents)
+            span.set_attribute("context_chars", len(packed.text))
+            for key, value in packed.usage().items():
+                span.set_attribute(key, value)
+
+        if packed.saved_tokens:
+            logger.info(
+                f"Packed context into {packed.tokens} tokens "
+                f"(saved {packed.saved_tokens} of {packed.raw_tokens}, "
+                f"dropped {packed.dropped_documents} documents)"
+            )
+        return {"context": packed.text, "question": question}, packed
 
-        return "\n\n".join(formatted_docs)
+    def _no_documents_result(self, question: str, root: Span) -> QueryResult:
+        """ドキュメントが見つからなかった場合の結果を作成"""
+        logger.warning(f"No documents found for query: {question}")
+        return QueryResult(
+            query=question,
+            answer=NO_DOCUMENTS_ANSWER,
+            source_documents=[],
+            timings=self._collect_timings(root),
+        )
+
+    def _record_usage(
+        self,
+        span: Span,
+        message: Optional[BaseMessage],
+        prompt_inputs: Dict[str, str],
+        answer: str,
+        packed: PackedContext,
+    ) -> Dict[str, Any]:
+        """LLM呼び出しのトークン数と概算コストをスパンに記録
+
+        APIが返す使用量（usage_metadata）を優先し、得られない場合はローカルで概算する。
+        コンテキストの詰め込みで削減したトークン数も併せて返す
+        """
+        usage_metadata = getattr(message, "usage_metadata", None)
+        if usage_metadata:
+            input_tokens = int(usage_metadata.get("input_tokens", 0))
+            output_tokens = int(usage_metadata.get("output_tokens", 0))
+            estimated = False
+        else:
+            token_counter = self._get_token_counter()
+            prompt_text = self.prompt.format(**prompt_inputs)
+            input_tokens = token_counter.count(prompt_text)
+            output_tokens = token_counter.count(answer)
+            estimated = True
+
+        usage = {
+            "llm_model": self.settings.llm_model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "tokens_estimated": estimated,
+            "estimated_cost_usd": estimate_cost(
+                self.settings.llm_model, input_tokens, output_tokens
+            ),
+        }
+        for key, value in usage.items():
+            span.set_attribute(key, value)
+        usage.update(packed.usage())
+        return usage
+
+    def _get_token_counter(self) -> TokenCounter:
+        """LLMモデルのトークナイザーを取得（初回利用時に読み込む）"""
+        if self._token_counter is None:
+            self._token_counter = TokenCounter(self.settings.llm_model)
+        return self._token_counter
+
+    @staticmethod
+    def _collect_timings(root: Span) -> Dict[str, float]:
+        """トレースのスパンから段階ごとの所要時間（ミリ秒）を集計"""
+        timings: Dict[str, float] = {}
+        for span in root.trace_spans:
+            if span is root:
+                continue
+            key = f"{span.name}_ms"
+            timings[key] = timings.get(key, 0.0) + span.duration_ms
+        timings["total_ms"] = root.duration_ms
+        return timings
+
+    @staticmethod
+    def _message_text(message: BaseMessage) -> str:
+        """LLMの応答メッセージから本文を取り出す"""
+        content = message.content
+        return content if isinstance(content, str) else "".join(str(part) for part in content)
+
+    def _format_documents(self, documents: List[Document]) -> PackedContext:
+        """ドキュメントをコンテキスト用にフォーマット"""
+        if self._context_packer is None:
+            self._context_packer = ContextPacker(
+                self._get_token_counter(),
+                max_tokens=self.settings.context_max_tokens,
+                enabled=self.settings.context_packing_enabled,
+            )
+        return self._context_packer.pack(documents)
@@ -0,0 +1,142 @@
+import dataclasses
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from domain.entities.query_result import Document
+from domain.services.reranker import Reranker
+from infrastructure.tracing.tracer import get_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class RerankService:
+    """検索候補のリランキングサービス
+
+    ベクトル検索で多めに取得した候補をリランカーで再スコアリングし、上位を返す。
+    - (クエリ, チャンク) ごとのスコアをLRUキャッシュし、未計算の候補だけをスコアリングする
+    - スコアリングは batch_size 件ずつまとめて呼び出す
+    - 経過時間が latency_budget_ms を超えた時点で残りのバッチを打ち切り、
+      検索時の順序（ベクトル検索順）の上位をそのまま返す。計算済みのスコアはキャッシュに残る
+
+    リランク後のドキュメントは元のスコアを保持し、metadata["rerank_score"] にスコアを格納する
+    """
+
+    def __init__(
+        self,
+        reranker: Reranker,
+        batch_size: int = 16,
+        latency_budget_ms: float = 500.0,
+        cache_max_entries: int = 10000,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.reranker = reranker
+        self.batch_size = batch_size
+        self.latency_budget_ms = latency_budget_ms
+        self.cache_max_entries = cache_max_entries
+
+        self._lock = threading.Lock()
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+        self.calls = 0
+        self.cache_hits = 0
+        self.scored = 0
+        self.fallbacks = 0
+
+    def rerank(self, query: str, documents: List[Document], top_k: int) -> List[Document]:
+        """候補をリランキングして上位 top_k 件を返す"""
+        if not documents:
+            return []
+
+        with get_tracer().span(
+            "rerank", reranker=self.reranker.name, candidates=len(documents)
+        ) as span:
+            start = time.perf_counter()
+            normalized_query = self._normalize(query)
+            keys = [self._cache_key(normalized_query, doc) for doc in documents]
+
+            scores: Dict[int, float] = {}
+            pending: List[int] = []
+            with self._lock:
+                self.calls += 1
+                for i, key in enumerate(keys):
+                    cached = self._scores.get(key)
+                    if cached is None:
+                        pending.append(i)
+                    else:
+                        self._scores.move_to_end(key)
+                        scores[i] = cached
+                self.cache_hits += len(scores)
+
+            for batch_start in range(0, len(pending), self.batch_size):
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if elapsed_ms > self.latency_budget_ms:
+                    with self._lock:
+                        self.fallbacks += 1
+                    span.set_attribute("fallback", True)
+                    logger.warning(
+                        f"Rerank latency budget exceeded ({elapsed_ms:.1f}ms > "
+                        f"{self.latency_budget_ms:.1f}ms), falling back to retrieval order"
+                    )
+                    return documents[:top_k]
+
+                batch = pending[batch_start : batch_start + self.batch_size]
+                batch_scores = self.reranker.score(
+                    query, [documents[i].page_content for i in batch]
+                )
+                with self._lock:
+                    for i, score in zip(batch, batch_scores):
+                        scores[i] = score
+                        self._store(keys[i], score)
+                    self.scored += len(batch)
+
+            span.set_attribute("cache_hits", len(documents) - len(pending))
+            order = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
+            return [
+                dataclasses.replace(
+                    documents[i], metadata={**documents[i].metadata, "rerank_score": scores[i]}
+                )
+                for i in order[:top_k]
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        """リランキングの統計情報を取得"""
+        with self._lock:
+            total = self.cache_hits + self.scored
+            return {
+                "reranker": self.reranker.name,
+                "calls": self.calls,
+                "cache_hits": self.cache_hits,
+                "scored": self.scored,
+                "cache_hit_rate": self.cache_hits / total if total else 0.0,
+                "fallbacks": self.fallbacks,
+                "cache_entries": len(self._scores),
+            }
+
+    def _store(self, key: Tuple[str, str], score: float) -> None:
+        """スコアをキャッシュに登録（上限を超えたら古いものから追い出す）"""
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.cache_max_entries:
+            self._scores.popitem(last=False)
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        """クエリを正規化（全角半角・大文字小文字・空白の揺れを吸収）"""
+        return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+    @staticmethod
+    def _cache_key(normalized_query: str, document: Document) -> Tuple[str, str]:
+        """キャッシュキーを作成
+
+        再インデックスで同じIDのチャンク本文が変わった場合に古いスコアを使わないよう、
+        チャンクIDに本文のハッシュを加える
+        """
+        digest = hashlib.sha1(document.page_content.encode("utf-8")).hexdigest()[:16]
+        return normalized_query, f"{document.doc_id or ''}:{digest}"
@@ -13,8 +13,40 @@ class Settings:
     embedding_model: str = "text-embedding-3-large"
     temperature: float = 0.0
 
+    embedding_provider: str = "openai"
+    fake_embedding_dimension: int = 256
+    embedding_batch_max_tokens: int = 50000
+    embedding_batch_max_size: int = 256
+    embedding_concurrency: int = 4
+    embedding_max_retries: int = 5
+
+    embedding_cache_enabled: bool = True
+    embedding_cache_directory: str = "embedding_cache"
+    embedding_cache_max_entries: int = 200000
+    embedding_cache_read_only: bool = False
+    query_embedding_cache_enabled: bool = True
+    query_embedding_cache_max_entries: int = 10000
+    query_embedding_cache_directory: str = ""
+    query_embedding_cache_flush_interval_seconds: float = 60.0
+    query_warm_up_on_startup: bool = False
+    query_warm_up_top_n: int = 200
+
     chroma_persist_directory: str = "chroma_db"
     chroma_collection_name: str = "products"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 100
+    hnsw_ef_search: int = 100
+
+    vector_backend: str = "chroma"
+    numpy_index_directory: str = ""
+    numpy_index_type: str = "flat"
+    ivf_nlist: int = 0
+    ivf_nprobe: int = 8
+    vector_quantization: str = "none"
+    vector_quantization_dimensions: int = 0
+    vector_rescore_multiplier: int = 4
+    index_snapshot_directory: str = ""
+    index_snapshot_verify: bool = True
 
     data_directory: str = "data"
     products_file: str = "products_master.json"
@@ -22,6 +54,46 @@ class Settings:
     support_file: str = "support_info.txt"
 
     default_search_results: int = 3
+    hybrid_search_enabled: bool = False
+    hybrid_vector_weight: float = 0.5
+    hybrid_rrf_k: int = 60
+    hybrid_candidate_pool: int = 20
+    bm25_index_path: str = ""
+    query_filter_enabled: bool = True
+    indexing_batch_size: int = 2048
+    chunking_workers: int = 1
+    chunking_batch_size: int = 500
+    support_chunk_max_chars: int = 500
+    support_chunk_overlap_lines: int = 1
+    data_reload_enabled: bool = False
+    data_reload_interval_seconds: float = 5.0
+
+    reranker: str = "none"
+    rerank_candidates: int = 20
+    rerank_batch_size: int = 16
+    rerank_latency_budget_ms: float = 500.0
+    rerank_cache_max_entries: int = 10000
+    cross_encoder_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+    context_packing_enabled: bool = True
+    context_max_tokens: int = 3000
+
+    answer_cache_enabled: bool = True
+    answer_cache_ttl_seconds: float = 3600.0
+    answer_cache_max_entries: int = 1000
+    answer_cache_similarity_threshold: float = 0.95
+
+    http_host: str = "127.0.0.1"
+    http_port: int = 8000
+    http_max_concurrency: int = 32
+    http_max_queue: int = 64
+    http_request_timeout_seconds: float = 60.0
+
+    trace_export_path: str = ""
+
+    startup_warm_up: bool = True
+    startup_target_ms: float = 500.0
+
     chunk_strategy: str = "unified"
 
     @classmethod
@@ -38,8 +110,83 @@ class Settings:
             llm_model=os.getenv("LLM_MODEL", cls.llm_model),
             embedding_model=os.getenv("EMBEDDING_MODEL", cls.embedding_model),
             temperature=float(os.getenv("TEMPERATURE", str(cls.temperature))),
+            embedding_provider=os.getenv("EMBEDDING_PROVIDER", cls.embedding_provider),
+            fake_embedding_dimension=int(
+                os.getenv("FAKE_EMBEDDING_DIMENSION", str(cls.fake_embedding_dimension))
+            ),
+            embedding_batch_max_tokens=int(
+                os.getenv("EMBEDDING_BATCH_MAX_TOKENS", str(cls.embedding_batch_max_tokens))
+            ),
+            embedding_batch_max_size=int(
+                os.getenv("EMBEDDING_BATCH_MAX_SIZE", str(cls.embedding_batch_max_size))
+            ),
+            embedding_concurrency=int(
+                os.getenv("EMBEDDING_CONCURRENCY", str(cls.embedding_concurrency))
+            ),
+            embedding_max_retries=int(
+                os.getenv("EMBEDDING_MAX_RETRIES", str(cls.embedding_max_retries))
+            ),
+            embedding_cache_enabled=os.getenv(
+                "EMBEDDING_CACHE_ENABLED", str(cls.embedding_cache_enabled)
+            ).lower()
+            == "true",
+            embedding_cache_directory=os.getenv(
+                "EMBEDDING_CACHE_DIR", cls.embedding_cache_directory
+            ),
+            embedding_cache_max_entries=int(
+                os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", str(cls.embedding_cache_max_entries))
+            ),
+            embedding_cache_read_only=os.getenv(
+                "EMBEDDING_CACHE_READ_ONLY", str(cls.embedding_cache_read_only)
+            ).lower()
+            == "true",
+            query_embedding_cache_enabled=os.getenv(
+                "QUERY_EMBEDDING_CACHE_ENABLED", str(cls.query_embedding_cache_enabled)
+            ).lower()
+            == "true",
+            query_embedding_cache_max_entries=int(
+                os.getenv(
+                    "QUERY_EMBEDDING_CACHE_MAX_ENTRIES", str(cls.query_embedding_cache_max_entries)
+                )
+            ),
+            query_embedding_cache_directory=os.getenv(
+                "QUERY_EMBEDDING_CACHE_DIR", cls.query_embedding_cache_directory
+            ),
+            query_embedding_cache_flush_interval_seconds=float(
+                os.getenv(
+                    "QUERY_EMBEDDING_CACHE_FLUSH_INTERVAL",
+                    str(cls.query_embedding_cache_flush_interval_seconds),
+                )
+            ),
+            query_warm_up_on_startup=os.getenv(
+                "QUERY_WARM_UP_ON_STARTUP", str(cls.query_warm_up_on_startup)
+            ).lower()
+            == "true",
+            query_warm_up_top_n=int(os.getenv("QUERY_WARM_UP_TOP_N", str(cls.query_warm_up_top_n))),
             chroma_persist_directory=os.getenv("CHROMA_PERSIST_DIR", cls.chroma_persist_directory),
             chroma_collection_name=os.getenv("CHROMA_COLLECTION", cls.chroma_collection_name),
+            hnsw_m=int(os.getenv("HNSW_M", str(cls.hnsw_m))),
+            hnsw_ef_construction=int(
+                os.getenv("HNSW_EF_CONSTRUCTION", str(cls.hnsw_ef_construction))
+            ),
+            hnsw_ef_search=int(os.getenv("HNSW_EF_SEARCH", str(cls.hnsw_ef_search))),
+            vector_backend=os.getenv("VECTOR_BACKEND", cls.vector_backend),
+            numpy_index_directory=os.getenv("NUMPY_INDEX_DIR", cls.numpy_index_directory),
+            numpy_index_type=os.getenv("NUMPY_INDEX_TYPE", cls.numpy_index_type),
+            ivf_nlist=int(os.getenv("IVF_NLIST", str(cls.ivf_nlist))),
+            ivf_nprobe=int(os.getenv("IVF_NPROBE", str(cls.ivf_nprobe))),
+            vector_quantization=os.getenv("VECTOR_QUANTIZATION", cls.vector_quantization),
+            vector_quantization_dimensions=int(
+                os.getenv("VECTOR_QUANTIZATION_DIMENSIONS", str(cls.vector_quantization_dimensions))
+            ),
+            vector_rescore_multiplier=int(
+                os.getenv("VECTOR_RESCORE_MULTIPLIER", str(cls.vector_rescore_multiplier))
+            ),
+            index_snapshot_directory=os.getenv("INDEX_SNAPSHOT_DIR", cls.index_snapshot_directory),
+            index_snapshot_verify=os.getenv(
+                "INDEX_SNAPSHOT_VERIFY", str(cls.index_snapshot_verify)
+            ).lower()
+            == "true",
             data_directory=os.getenv("DATA_DIR", cls.data_directory),
             products_file=os.getenv("PRODUCTS_FILE", cls.products_file),
             faq_file=os.getenv("FAQ_FILE", cls.faq_file),
@@ -47,5 +194,80 @@ class Settings:
             default_search_results=int(
                 os.getenv("DEFAULT_SEARCH_RESULTS", str(cls.default_search_results))
             ),
+            hybrid_search_enabled=os.getenv(
+                "HYBRID_SEARCH_ENABLED", str(cls.hybrid_search_enabled)
+            ).lower()
+            == "true",
+            hybrid_vector_weight=float(
+                os.getenv("HYBRID_VECTOR_WEIGHT", str(cls.hybrid_vector_weight))
+            ),
+            hybrid_rrf_k=int(os.getenv("HYBRID_RRF_K", str(cls.hybrid_rrf_k))),
+            hybrid_candidate_pool=int(
+                os.getenv("HYBRID_CANDIDATE_POOL", str(cls.hybrid_candidate_pool))
+            ),
+            bm25_index_path=os.getenv("BM25_INDEX_PATH", cls.bm25_index_path),
+            query_filter_enabled=os.getenv(
+                "QUERY_FILTER_ENABLED", str(cls.query_filter_enabled)
+            ).lower()
+            == "true",
+            indexing_batch_size=int(os.getenv("INDEXING_BATCH_SIZE", str(cls.indexing_batch_size))),
+            chunking_workers=int(os.getenv("CHUNKING_WORKERS", str(cls.chunking_workers))),
+            chunking_batch_size=int(os.getenv("CHUNKING_BATCH_SIZE", str(cls.chunking_batch_size))),
+            support_chunk_max_chars=int(
+                os.getenv("SUPPORT_CHUNK_MAX_CHARS", str(cls.support_chunk_max_chars))
+            ),
+            support_chunk_overlap_lines=int(
+                os.getenv("SUPPORT_CHUNK_OVERLAP_LINES", str(cls.support_chunk_overlap_lines))
+            ),
+            data_reload_enabled=os.getenv(
+                "DATA_RELOAD_ENABLED", str(cls.data_reload_enabled)
+            ).lower()
+            == "true",
+            data_reload_interval_seconds=float(
+                os.getenv("DATA_RELOAD_INTERVAL_SECONDS", str(cls.data_reload_interval_seconds))
+            ),
+            reranker=os.getenv("RERANKER", cls.reranker),
+            rerank_candidates=int(os.getenv("RERANK_CANDIDATES", str(cls.rerank_candidates))),
+            rerank_batch_size=int(os.getenv("RERANK_BATCH_SIZE", str(cls.rerank_batch_size))),
+            rerank_latency_budget_ms=float(
+                os.getenv("RERANK_LATENCY_BUDGET_MS", str(cls.rerank_latency_budget_ms))
+            ),
+            rerank_cache_max_entries=int(
+                os.getenv("RERANK_CACHE_MAX_ENTRIES", str(cls.rerank_cache_max_entries))
+            ),
+            cross_encoder_model=os.getenv("CROSS_ENCODER_MODEL", cls.cross_encoder_model),
+            context_packing_enabled=os.getenv(
+                "CONTEXT_PACKING_ENABLED", str(cls.context_packing_enabled)
+            ).lower()
+            == "true",
+            context_max_tokens=int(os.getenv("CONTEXT_MAX_TOKENS", str(cls.context_max_tokens))),
+            answer_cache_enabled=os.getenv(
+                "ANSWER_CACHE_ENABLED", str(cls.answer_cache_enabled)
+            ).lower()
+            == "true",
+            answer_cache_ttl_seconds=float(
+                os.getenv("ANSWER_CACHE_TTL_SECONDS", str(cls.answer_cache_ttl_seconds))
+            ),
+            answer_cache_max_entries=int(
+                os.getenv("ANSWER_CACHE_MAX_ENTRIES", str(cls.answer_cache_max_entries))
+            ),
+            answer_cache_similarity_threshold=float(
+                os.getenv(
+                    "ANSWER_CACHE_SIMILARITY_THRESHOLD", str(cls.answer_cache_similarity_threshold)
+                )
+            ),
+            http_host=os.getenv("HTTP_HOST", cls.http_host),
+            http_port=int(os.getenv("HTTP_PORT", str(cls.http_port))),
+            http_max_concurrency=int(
+                os.getenv("HTTP_MAX_CONCURRENCY", str(cls.http_max_concurrency))
+            ),
+            http_max_queue=int(os.getenv("HTTP_MAX_QUEUE", str(cls.http_max_queue))),
+            http_request_timeout_seconds=float(
+                os.getenv("HTTP_REQUEST_TIMEOUT_SECONDS", str(cls.http_request_timeout_seconds))
+            ),
+            trace_export_path=os.getenv("TRACE_EXPORT_PATH", cls.trace_export_path),
+            startup_warm_up=os.getenv("STARTUP_WARM_UP", str(cls.startup_warm_up)).lower()
+            == "true",
+            startup_target_ms=float(os.getenv("STARTUP_TARGET_MS", str(cls.startup_target_ms))),
             chunk_strategy=os.getenv("CHUNK_STRATEGY", cls.chunk_strategy),
         )
@@ -0,0 +1,54 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class EntityChanges(Generic[T]):
+    """データファイルの再読み込みで検出したエンティティ単位の差分
+
+    entities は再読み込み後、previous は再読み込み前の全エンティティ。
+    updated は (変更前, 変更後) の組
+    """
+
+    entities: Sequence[T]
+    previous: Sequence[T] = field(default_factory=tuple)
+    added: List[T] = field(default_factory=list)
+    updated: List[Tuple[T, T]] = field(default_factory=list)
+    removed: List[T] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.updated or self.removed)
+
+    def summary(self) -> Dict[str, int]:
+        """件数の要約"""
+        return {
+            "added": len(self.added),
+            "updated": len(self.updated),
+            "removed": len(self.removed),
+        }
+
+    @classmethod
+    def compute(
+        cls, previous: Sequence[T], current: Sequence[T], key: Callable[[T], str]
+    ) -> "EntityChanges[T]":
+        """変更前後のエンティティをIDで突き合わせて差分を計算"""
+        previous_by_key = {key(entity): entity for entity in previous}
+        changes = cls(entities=current, previous=previous)
+        seen = set()
+
+        for entity in current:
+            entity_key = key(entity)
+            seen.add(entity_key)
+            old = previous_by_key.get(entity_key)
+            if old is None:
+                changes.added.append(entity)
+            elif old != entity:
+                changes.updated.append((old, entity))
+
+        changes.removed = [
+            entity for entity_key, entity in previous_by_key.items() if entity_key not in seen
+        ]
+        return changes
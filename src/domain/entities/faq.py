@@ -1,10 +1,11 @@
+import sys
 from dataclasses import dataclass
 from typing import Any, Dict
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FAQ:
-    """FAQ情報を表すドメインエンティティ"""
+    """FAQ情報を表すドメインエンティティ（不変・__slots__）"""
 
     faq_id: str
     category: str
@@ -25,7 +26,7 @@ class FAQ:
         """辞書からFAQインスタンスを作成"""
         return cls(
             faq_id=data["faq_id"],
-            category=data["category"],
+            category=sys.intern(data["category"]),
             question=data["question"],
             answer=data["answer"],
         )
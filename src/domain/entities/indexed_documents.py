@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass
+class IndexedDocuments:
+    """ベクトルDBに登録済みのドキュメントと埋め込みのバッチ"""
+
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    embeddings: List[List[float]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
@@ -1,17 +1,22 @@
+import sys
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Product:
-    """商品情報を表すドメインエンティティ"""
+    """商品情報を表すドメインエンティティ
+
+    不変（frozen）かつ __slots__ でインスタンスごとの __dict__ を持たない。
+    リポジトリのキャッシュをコピーせずに共有できるよう、特徴も不変のタプルで保持する
+    """
 
     product_id: str
     product_name: str
     category: str
     price: int
     description: str
-    features: list[str]
+    features: Tuple[str, ...]
     specifications: Dict[str, Any]
 
     @classmethod
@@ -20,10 +25,11 @@ class Product:
         return cls(
             product_id=data.get("product_id", ""),
             product_name=data.get("product_name", ""),
-            category=data.get("category", ""),
+            # カテゴリは多数の商品で同じ値のため、文字列を共有する
+            category=sys.intern(data.get("category", "")),
             price=data.get("price", 0),
             description=data.get("description", ""),
-            features=data.get("features", []),
+            features=tuple(data.get("features", ())),
             specifications=data.get("specifications", {}),
         )
 
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -9,6 +9,7 @@ class Document:
     page_content: str
     metadata: Dict[str, Any]
     score: float = 0.0
+    doc_id: Optional[str] = None
 
 
 @dataclass
@@ -18,6 +19,9 @@ class QueryResult:
     query: str
     answer: str
     source_documents: List[Document]
+    from_cache: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+    usage: Dict[str, Any] = field(default_factory=dict)
 
     @property
     def has_answer(self) -> bool:
@@ -28,3 +32,19 @@ class QueryResult:
     def document_count(self) -> int:
         """参照ドキュメント数を取得"""
         return len(self.source_documents)
+
+
+@dataclass
+class AnswerStreamEvent:
+    """ストリーミング回答のイベント
+
+    event_type は以下のいずれか
+    - "documents": 検索で取得したドキュメント（最初に1回）
+    - "token": 回答の断片（生成され次第）
+    - "done": 完成した回答（最後に1回）
+    """
+
+    event_type: str
+    documents: List[Document] = field(default_factory=list)
+    token: str = ""
+    result: Optional[QueryResult] = None
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+EQUALITY_OPERATORS = ("eq", "in")
+RANGE_OPERATORS = ("gt", "gte", "lt", "lte")
+
+
+@dataclass(frozen=True)
+class FilterCondition:
+    """メタデータに対する1つの条件
+
+    operator:
+    - eq: 値が一致する
+    - in: 値が候補のいずれかに一致する（value はタプル）
+    - gt / gte / lt / lte: 数値の範囲（メタデータが数値でない場合は一致しない）
+    """
+
+    field: str
+    operator: str
+    value: Any
+
+    def __post_init__(self):
+        if self.operator not in EQUALITY_OPERATORS + RANGE_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {self.operator}")
+        if self.operator == "in":
+            object.__setattr__(self, "value", tuple(self.value))
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """メタデータが条件を満たすか判定"""
+        if self.field not in metadata:
+            return False
+
+        actual = metadata[self.field]
+        if self.operator == "eq":
+            return actual == self.value
+        if self.operator == "in":
+            return actual in self.value
+        if not isinstance(actual, (int, float)) or isinstance(actual, bool):
+            return False
+        if self.operator == "gt":
+            return actual > self.value
+        if self.operator == "gte":
+            return actual >= self.value
+        if self.operator == "lt":
+            return actual < self.value
+        return actual <= self.value
+
+    def __str__(self) -> str:
+        symbols = {"eq": "=", "in": "in", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+        return f"{self.field} {symbols[self.operator]} {self.value!r}"
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """検索対象を絞り込むメタデータ条件（すべての条件のAND）"""
+
+    conditions: Tuple[FilterCondition, ...] = field(default_factory=tuple)
+
+    @classmethod
+    def where(
+        cls,
+        equals: Optional[Dict[str, Any]] = None,
+        one_of: Optional[Dict[str, List[Any]]] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    ) -> "SearchFilter":
+        """一致・候補・範囲（下限以上・上限以下、Noneは制限なし）の条件からフィルターを作成"""
+        conditions = [FilterCondition(key, "eq", value) for key, value in (equals or {}).items()]
+        conditions.extend(
+            FilterCondition(key, "in", values) for key, values in (one_of or {}).items()
+        )
+        for key, (minimum, maximum) in (ranges or {}).items():
+            if minimum is not None:
+                conditions.append(FilterCondition(key, "gte", minimum))
+            if maximum is not None:
+                conditions.append(FilterCondition(key, "lte", maximum))
+        return cls(tuple(conditions))
+
+    def and_(self, other: Optional["SearchFilter"]) -> "SearchFilter":
+        """別のフィルターとのANDを作成"""
+        if other is None:
+            return self
+        return SearchFilter(self.conditions + other.conditions)
+
+    @property
+    def is_empty(self) -> bool:
+        """条件がないか"""
+        return not self.conditions
+
+    @property
+    def fields(self) -> List[str]:
+        """条件に含まれるメタデータのキー"""
+        return list(dict.fromkeys(condition.field for condition in self.conditions))
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """メタデータがすべての条件を満たすか判定"""
+        return all(condition.matches(metadata) for condition in self.conditions)
+
+    def __str__(self) -> str:
+        return " AND ".join(str(condition) for condition in self.conditions) or "(none)"
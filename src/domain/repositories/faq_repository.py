@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, Optional, Sequence
 
+from domain.entities.entity_changes import EntityChanges
 from domain.entities.faq import FAQ
 
 
@@ -8,16 +9,34 @@ class FAQRepository(ABC):
     """FAQデータアクセス用リポジトリインターフェース"""
 
     @abstractmethod
-    def get_all_faqs(self) -> List[FAQ]:
-        """全てのFAQを取得"""
+    def get_all_faqs(self) -> Sequence[FAQ]:
+        """全てのFAQを取得（読み取り専用のシーケンス）"""
         pass
 
     @abstractmethod
-    def get_faqs_by_category(self, category: str) -> List[FAQ]:
+    def get_faq_by_id(self, faq_id: str) -> Optional[FAQ]:
+        """FAQ IDでFAQを取得（存在しない場合はNone）"""
+        pass
+
+    @abstractmethod
+    def iter_faqs(self) -> Iterator[FAQ]:
+        """FAQを1件ずつ逐次取得（全件をメモリに展開しない）"""
+        pass
+
+    @abstractmethod
+    def get_faqs_by_category(self, category: str) -> Sequence[FAQ]:
         """カテゴリで絞り込みFAQを取得"""
         pass
 
     @abstractmethod
-    def get_categories(self) -> List[str]:
+    def get_categories(self) -> Sequence[str]:
         """利用可能なカテゴリ一覧を取得"""
         pass
+
+    def load_changes(self) -> EntityChanges[FAQ]:
+        """データを再読み込みし、現在のキャッシュとの差分を取得（キャッシュは置き換えない）"""
+        raise NotImplementedError(f"{type(self).__name__} does not support reloading")
+
+    def apply_changes(self, changes: EntityChanges[FAQ]) -> None:
+        """load_changes で取得した差分でキャッシュを置き換える"""
+        raise NotImplementedError(f"{type(self).__name__} does not support reloading")
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, Optional, Sequence
 
+from domain.entities.entity_changes import EntityChanges
 from domain.entities.product import Product
 
 
@@ -8,6 +9,24 @@ class ProductRepository(ABC):
     """商品データアクセス用リポジトリインターフェース"""
 
     @abstractmethod
-    def get_all_products(self) -> List[Product]:
-        """すべての商品を取得"""
+    def get_all_products(self) -> Sequence[Product]:
+        """すべての商品を取得（読み取り専用のシーケンス）"""
         pass
+
+    @abstractmethod
+    def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        """商品IDで商品を取得（存在しない場合はNone）"""
+        pass
+
+    @abstractmethod
+    def iter_products(self) -> Iterator[Product]:
+        """商品を1件ずつ逐次取得（全件をメモリに展開しない）"""
+        pass
+
+    def load_changes(self) -> EntityChanges[Product]:
+        """データを再読み込みし、現在のキャッシュとの差分を取得（キャッシュは置き換えない）"""
+        raise NotImplementedError(f"{type(self).__name__} does not support reloading")
+
+    def apply_changes(self, changes: EntityChanges[Product]) -> None:
+        """load_changes で取得した差分でキャッシュを置き換える"""
+        raise NotImplementedError(f"{type(self).__name__} does not support reloading")
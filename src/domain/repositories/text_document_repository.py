@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+
+class TextDocumentRepository(ABC):
+    """テキスト文書データアクセス用リポジトリインターフェース"""
+
+    @property
+    @abstractmethod
+    def document_id(self) -> str:
+        """文書を識別するID（チャンクIDの接頭辞に使用）"""
+        pass
+
+    @abstractmethod
+    def iter_lines(self) -> Iterator[str]:
+        """文書を1行ずつ逐次取得（末尾の改行は除く。全体をメモリに展開しない）"""
+        pass
@@ -1,11 +1,18 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
+from domain.entities.indexed_documents import IndexedDocuments
 from domain.entities.query_result import Document
+from domain.entities.search_filter import SearchFilter
 
 
 class VectorSearchRepository(ABC):
-    """ベクトル検索のリポジトリインターフェース"""
+    """ベクトル検索のリポジトリインターフェース
+
+    検索系メソッドの filters を指定した場合、メタデータが条件を満たす
+    ドキュメントだけを対象に類似度検索を行う
+    """
 
     @abstractmethod
     def add_documents(
@@ -15,11 +22,43 @@ class VectorSearchRepository(ABC):
         pass
 
     @abstractmethod
-    def search(self, query: str, n_results: int = 3) -> List[Document]:
+    def delete_documents(self, ids: List[str]) -> None:
+        """指定IDのドキュメントをベクトルDBから削除"""
+        pass
+
+    @abstractmethod
+    def search(
+        self, query: str, n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[Document]:
         """類似度検索を実行"""
         pass
 
+    def search_batch(
+        self, queries: List[str], n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[List[Document]]:
+        """複数クエリの類似度検索をまとめて実行（既定ではクエリごとにsearchを呼ぶ）"""
+        return [self.search(query, n_results, filters) for query in queries]
+
+    async def asearch(
+        self, query: str, n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[Document]:
+        """類似度検索を非同期で実行（既定ではスレッドプールでsearchを実行する）"""
+        return await asyncio.to_thread(self.search, query, n_results, filters)
+
     @abstractmethod
     def delete_collection(self) -> None:
         """コレクションを削除"""
         pass
+
+    def persist(self) -> None:
+        """バッファされた変更を永続化（必要な実装のみオーバーライドする）"""
+        pass
+
+    def iter_indexed_documents(self, batch_size: int = 1000) -> Iterator[IndexedDocuments]:
+        """登録済みのドキュメントを埋め込みとともに batch_size 件ずつ取得
+
+        インデックスのスナップショット作成に使用する（対応する実装のみオーバーライドする）
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support exporting indexed documents"
+        )
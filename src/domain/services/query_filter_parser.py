@@ -0,0 +1,139 @@
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from domain.entities.search_filter import FilterCondition, SearchFilter
+
+# カテゴリ名と、質問文中でそのカテゴリを指す表現（長い表現から順に照合する）
+DEFAULT_CATEGORY_ALIASES: Dict[str, List[str]] = {
+    "ワイヤレスイヤホン": ["ワイヤレスイヤホン", "イヤホン", "イヤフォン"],
+    "スマートウォッチ": ["スマートウォッチ", "スマートウオッチ", "ウォッチ", "腕時計"],
+    "モバイルバッテリー": ["モバイルバッテリー", "モバイルバッテリ", "ポータブル充電器"],
+    "ヘッドホン": ["ヘッドホン", "ヘッドフォン"],
+    "ポータブルスピーカー": ["ポータブルスピーカー", "スピーカー"],
+}
+
+# カテゴリ名だけの質問は購入ガイド等のFAQも対象となるため、価格条件か
+# 商品を探している表現を含む場合のみカテゴリで絞り込む。同様に、金額だけの質問
+# （例: 「5000円以上購入で送料無料になりますか？」）は価格を持たないFAQ・サポート文書が
+# 対象となるため、カテゴリか商品を探している表現を含む場合のみ価格で絞り込む
+PRODUCT_INTENT_WORDS = ("欲しい", "ほしい", "探して", "買いたい", "おすすめの商品")
+
+_AMOUNT = r"([¥]?)\s*(\d+(?:,\d{3})*(?:\.\d+)?)\s*(万|千)?\s*(円)?"
+_RANGE_PATTERN = re.compile(_AMOUNT + r"\s*(?:〜|~|から|-)\s*" + _AMOUNT)
+_AROUND_PATTERN = re.compile(_AMOUNT + r"\s*(?:前後|くらい|ぐらい|程度)")
+_UPPER_PATTERN = re.compile(_AMOUNT + r"\s*(以下|まで|以内|未満)")
+_LOWER_PATTERN = re.compile(_AMOUNT + r"\s*(以上|超|より高い|から)")
+_BUDGET_PATTERN = re.compile(r"予算\s*(?:は|が)?\s*" + _AMOUNT)
+
+# 「〜円前後」の場合に許容する上下の幅
+AROUND_TOLERANCE = 0.2
+
+
+class QueryFilterParser:
+    """日本語の質問文から検索フィルター（価格帯・カテゴリ）を抽出する
+
+    例:
+    - 「3万円以下のイヤホン」→ price <= 30000 AND category = ワイヤレスイヤホン
+    - 「1万〜2万円のスマートウォッチ」→ 10000 <= price <= 20000 AND category = スマートウォッチ
+    - 「5000円以上のモバイルバッテリーが欲しい」→ price >= 5000 AND category = モバイルバッテリー
+
+    金額は「円」「万」「千」「¥」のいずれかを伴う数値のみを対象とし、
+    型番や容量（例: 20000mAh）は価格とみなさない。価格の条件はカテゴリか
+    商品を探している表現（PRODUCT_INTENT_WORDS）を伴う場合のみ抽出する
+    """
+
+    def __init__(self, category_aliases: Optional[Dict[str, List[str]]] = None):
+        aliases = category_aliases or DEFAULT_CATEGORY_ALIASES
+        self._aliases: List[Tuple[str, str]] = sorted(
+            ((alias, category) for category, names in aliases.items() for alias in names),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def parse(self, question: str) -> Optional[SearchFilter]:
+        """質問文からフィルターを抽出（条件がなければNone）"""
+        text = unicodedata.normalize("NFKC", question)
+
+        categories = self._categories(text)
+        product_intent = any(word in text for word in PRODUCT_INTENT_WORDS)
+        conditions = self._price_conditions(text) if categories or product_intent else []
+        if categories and (conditions or product_intent):
+            if len(categories) == 1:
+                conditions.append(FilterCondition("category", "eq", categories[0]))
+            else:
+                conditions.append(FilterCondition("category", "in", categories))
+
+        return SearchFilter(tuple(conditions)) if conditions else None
+
+    def _price_conditions(self, text: str) -> List[FilterCondition]:
+        """価格の条件を抽出"""
+        match = _RANGE_PATTERN.search(text)
+        if match:
+            first, second = match.groups()[:4], match.groups()[4:]
+            if not (first[0] or first[2] or first[3]):
+                # 「1〜3万円」のように単位が後ろの金額にだけ付く場合は前の金額にも適用する
+                first = (second[0], first[1], second[2], second[3])
+            lower, upper = self._amount(*first), self._amount(*second)
+            if lower is not None and upper is not None:
+                lower, upper = min(lower, upper), max(lower, upper)
+                return [
+                    FilterCondition("price", "gte", lower),
+                    FilterCondition("price", "lte", upper),
+                ]
+
+        match = _AROUND_PATTERN.search(text)
+        if match:
+            amount = self._amount(*match.groups())
+            if amount is not None:
+                return [
+                    FilterCondition("price", "gte", round(amount * (1 - AROUND_TOLERANCE))),
+                    FilterCondition("price", "lte", round(amount * (1 + AROUND_TOLERANCE))),
+                ]
+
+        conditions = []
+        match = _UPPER_PATTERN.search(text) or _BUDGET_PATTERN.search(text)
+        if match:
+            amount = self._amount(*match.groups()[:4])
+            if amount is not None:
+                operator = (
+                    "lt" if match.re is _UPPER_PATTERN and match.group(5) == "未満" else "lte"
+                )
+                conditions.append(FilterCondition("price", operator, amount))
+
+        match = _LOWER_PATTERN.search(text)
+        if match:
+            amount = self._amount(*match.groups()[:4])
+            if amount is not None:
+                operator = "gt" if match.group(5) in ("超", "より高い") else "gte"
+                conditions.append(FilterCondition("price", operator, amount))
+
+        return conditions
+
+    def _categories(self, text: str) -> List[str]:
+        """質問文に含まれるカテゴリを抽出（重複なし、出現順）"""
+        categories: Dict[int, str] = {}
+        remaining = text
+        for alias, category in self._aliases:
+            position = remaining.find(alias)
+            if position < 0:
+                continue
+            categories.setdefault(position, category)
+            # 長い表現に含まれる短い表現（例: スマートウォッチ中のウォッチ）を重複して数えない
+            remaining = remaining.replace(alias, "\0" * len(alias))
+        return list(dict.fromkeys(category for _, category in sorted(categories.items())))
+
+    @staticmethod
+    def _amount(
+        currency: Optional[str], number: str, unit: Optional[str], yen: Optional[str]
+    ) -> Optional[int]:
+        """金額表現を円単位の整数に変換（通貨の単位を伴わない数値はNone）"""
+        if not (currency or unit or yen):
+            return None
+
+        value = float(number.replace(",", ""))
+        if unit == "万":
+            value *= 10000
+        elif unit == "千":
+            value *= 1000
+        return int(value)
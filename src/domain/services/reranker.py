@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class Reranker(ABC):
+    """検索結果の再スコアリング（リランキング）の抽象インターフェース
+
+    スコアは大きいほどクエリとの関連が高いことを表す。
+    クエリと文書の組ごとに独立して計算されること（他の候補に依存しないこと）を前提とし、
+    (クエリ, 文書) 単位でスコアをキャッシュできるようにする
+    """
+
+    @abstractmethod
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """クエリと各文書の関連スコアを計算"""
+        pass
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """リランカー名を返す"""
+        pass
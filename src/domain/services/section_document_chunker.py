@@ -0,0 +1,144 @@
+import hashlib
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from domain.entities.chunk import Chunk
+
+_SECTION_HEADING = re.compile(r"^\s*(?:■\s*(?P<mark>.+?)|【(?P<bracket>.+?)】)\s*$")
+_NUMBERED_ITEM = re.compile(r"^\d+\s*[.．、)）]\s*\S")
+
+
+class SectionDocumentChunker:
+    """見出し付きテキスト文書のセクション対応チャンカー
+
+    「■ 見出し」または「【見出し】」の行でセクションを区切り、セクション内では
+    番号付き項目（「1. 電話サポート」とその字下げされた続きの行）を1つの単位、
+    それ以外の段落をまとめて1つの単位とする。max_chars を超える単位は行単位の
+    ウィンドウに分割し、隣り合うウィンドウで overlap_lines 行を重複させる。
+
+    文書は1行ずつ読み進め、保持するのは処理中のセクションのみ。チャンクIDは
+    見出しのハッシュとセクション内の連番から作るため、一部のセクションのみが
+    変更された場合、他のセクションのチャンクIDと本文は変わらない
+    """
+
+    DEFAULT_SECTION = "文書情報"
+
+    def __init__(self, max_chars: int = 500, overlap_lines: int = 1):
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+        self.max_chars = max_chars
+        self.overlap_lines = max(overlap_lines, 0)
+
+    def iter_chunks(self, lines: Iterable[str], document_id: str) -> Iterator[Chunk]:
+        """文書の行ストリームからチャンクを逐次生成"""
+        heading_counts: Dict[str, int] = {}
+        heading = self.DEFAULT_SECTION
+        section_lines: List[str] = []
+
+        for line in lines:
+            match = _SECTION_HEADING.match(line)
+            if match:
+                yield from self._chunk_section(document_id, heading, section_lines, heading_counts)
+                heading = (match.group("mark") or match.group("bracket")).strip()
+                section_lines = []
+            else:
+                section_lines.append(line.rstrip())
+
+        yield from self._chunk_section(document_id, heading, section_lines, heading_counts)
+
+    def _chunk_section(
+        self,
+        document_id: str,
+        heading: str,
+        lines: List[str],
+        heading_counts: Dict[str, int],
+    ) -> Iterator[Chunk]:
+        """1セクション分の行からチャンクを生成（本文のないセクションはスキップ）"""
+        if not any(line.strip() for line in lines):
+            return
+
+        # 同じ見出しが複数回現れた場合は出現順で区別する
+        occurrence = heading_counts.get(heading, 0)
+        heading_counts[heading] = occurrence + 1
+        section_key = hashlib.sha1(heading.encode("utf-8")).hexdigest()[:8]
+        if occurrence:
+            section_key = f"{section_key}-{occurrence}"
+
+        chunk_index = 0
+        for item, unit_lines in self._split_units(lines):
+            for window in self._windows(unit_lines, item):
+                metadata = {
+                    "data_type": "support",
+                    "chunk_type": "support_section",
+                    "document_id": document_id,
+                    "section": heading,
+                    "chunk_index": chunk_index,
+                }
+                if item:
+                    metadata["item"] = item
+                yield Chunk(
+                    text="\n".join([f"■ {heading}"] + window),
+                    metadata=metadata,
+                    chunk_id=f"{document_id}_s{section_key}_{chunk_index}",
+                )
+                chunk_index += 1
+
+    @staticmethod
+    def _split_units(lines: List[str]) -> Iterator[Tuple[Optional[str], List[str]]]:
+        """セクションの行を (番号付き項目の見出し or None, 行のリスト) の単位に分割"""
+        item: Optional[str] = None
+        unit: List[str] = []
+
+        def flush():
+            # 前後と段落間の連続する空行を除く
+            trimmed: List[str] = []
+            for line in unit:
+                if line.strip() or (trimmed and trimmed[-1].strip()):
+                    trimmed.append(line)
+            while trimmed and not trimmed[-1].strip():
+                trimmed.pop()
+            return (item, trimmed) if trimmed else None
+
+        for line in lines:
+            if _NUMBERED_ITEM.match(line):
+                flushed = flush()
+                if flushed:
+                    yield flushed
+                item, unit = line.strip(), [line.strip()]
+            elif item is not None and line.strip() and not line[:1].isspace():
+                # 字下げされていない行で番号付き項目が終わる
+                flushed = flush()
+                if flushed:
+                    yield flushed
+                item, unit = None, [line]
+            else:
+                unit.append(line)
+
+        flushed = flush()
+        if flushed:
+            yield flushed
+
+    def _windows(self, lines: List[str], item: Optional[str]) -> Iterator[List[str]]:
+        """単位の行を max_chars 以内のウィンドウに分割（overlap_lines 行を重複）"""
+        if sum(len(line) + 1 for line in lines) <= self.max_chars:
+            yield lines
+            return
+
+        start = 0
+        while start < len(lines):
+            window: List[str] = []
+            size = 0
+            end = start
+            while end < len(lines) and (not window or size + len(lines[end]) + 1 <= self.max_chars):
+                window.append(lines[end])
+                size += len(lines[end]) + 1
+                end += 1
+
+            # 続きのウィンドウにも番号付き項目の見出しを残し、何の説明かを分かるようにする
+            if item and start > 0 and window[0] != item:
+                window = [item] + window
+            yield window
+
+            if end >= len(lines):
+                break
+            start = max(end - self.overlap_lines, start + 1)
@@ -0,0 +1,88 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from infrastructure.embeddings.embedding_cache_store import EmbeddingCacheStore
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """埋め込みキャッシュを前段に挟むEmbeddingsラッパー
+
+    キャッシュに存在しないテキストのみを内部のEmbeddingsで埋め込む。
+    インデックスファイルの書き出しはキャッシュ全体を書き直すため、バッチごとには行わず、
+    未書き出しの件数がキャッシュ件数の半分（最低 MIN_FLUSH_ENTRIES 件）に達した場合と
+    flush() の呼び出し時（インデックス化の完了時・終了時）にまとめて行う
+    （書き出し量の合計はキャッシュ件数に比例する）
+    """
+
+    MIN_FLUSH_ENTRIES = 10000
+
+    def __init__(self, embeddings: Embeddings, store: EmbeddingCacheStore):
+        self.embeddings = embeddings
+        self.store = store
+        self.api_calls = 0
+        self.embedded_texts = 0
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """複数テキストを埋め込み（キャッシュ優先）"""
+        vectors: List[Optional[List[float]]] = [self.store.get(text) for text in texts]
+
+        missing_texts = list(
+            dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None)
+        )
+        if missing_texts:
+            new_vectors = self.embeddings.embed_documents(missing_texts)
+            self.api_calls += 1
+            self.embedded_texts += len(missing_texts)
+
+            embedded = dict(zip(missing_texts, new_vectors))
+            for text, vector in embedded.items():
+                self.store.put(text, vector)
+            self._record_unflushed(len(embedded))
+
+            vectors = [
+                vector if vector is not None else embedded[text]
+                for text, vector in zip(texts, vectors)
+            ]
+
+        logger.debug(f"Embedded {len(texts)} texts ({len(missing_texts)} cache misses)")
+        return [vector for vector in vectors if vector is not None]
+
+    def embed_query(self, text: str) -> List[float]:
+        """クエリを埋め込み（キャッシュ優先）"""
+        vector = self.store.get(text)
+        if vector is not None:
+            return vector
+
+        vector = self.embeddings.embed_query(text)
+        self.api_calls += 1
+        self.embedded_texts += 1
+        self.store.put(text, vector)
+        self._record_unflushed(1)
+        return vector
+
+    def flush(self) -> None:
+        """未書き出しのキャッシュをディスクに書き出す"""
+        with self._lock:
+            self._unflushed = 0
+        self.store.flush()
+
+    def _record_unflushed(self, count: int) -> None:
+        """未書き出しの件数を加算し、閾値に達していれば書き出す"""
+        with self._lock:
+            self._unflushed += count
+            should_flush = self._unflushed >= max(self.MIN_FLUSH_ENTRIES, len(self.store) // 2)
+        if should_flush:
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュとAPI呼び出しの統計情報を取得"""
+        stats = self.store.stats()
+        stats.update({"api_calls": self.api_calls, "embedded_texts": self.embedded_texts})
+        return stats
@@ -0,0 +1,45 @@
+import hashlib
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class DeterministicFakeEmbeddings(Embeddings):
+    """オフライン検証用の決定的な埋め込み実装
+
+    文字n-gramをハッシュで次元に割り当てる（feature hashing）ため、
+    ネットワーク不要で同じテキストは常に同じベクトルになり、
+    文字列として似たテキストは近いベクトルになる
+    """
+
+    def __init__(self, dimension: int = 256, ngram_size: int = 2):
+        if dimension < 1:
+            raise ValueError("dimension must be at least 1")
+        self.dimension = dimension
+        self.ngram_size = ngram_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """複数テキストを埋め込み"""
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """クエリを埋め込み"""
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        """テキストをL2正規化済みベクトルに変換"""
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        normalized = "".join(text.lower().split())
+
+        for i in range(max(len(normalized) - self.ngram_size + 1, 1)):
+            ngram = normalized[i : i + self.ngram_size]
+            digest = hashlib.md5(ngram.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimension
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[index] += sign
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCacheStore:
+    """埋め込みベクトルのディスクキャッシュ
+
+    キーは (embedding_model, sha256(text))。モデルごとにディレクトリを分け、
+    float32行列（mmap）とインデックスファイル（JSON）で永続化する。
+    エントリ数が上限を超えた場合はLRUで追い出す。
+    read_only=Trueの場合は既存のキャッシュを参照するのみで、登録・書き出しは行わない
+    （複数プロセスから同じキャッシュを共有する場合に使用する）
+    """
+
+    INDEX_FILE = "index.json"
+    VECTORS_FILE = "vectors.f32"
+    INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        cache_directory: str,
+        embedding_model: str,
+        max_entries: int,
+        read_only: bool = False,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.embedding_model = embedding_model
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self.directory = Path(cache_directory) / re.sub(r"[^A-Za-z0-9_.-]", "_", embedding_model)
+
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._dimension: Optional[int] = None
+        self._capacity = 0
+        self._matrix: Optional[np.memmap] = None
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load()
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        """テキストからキャッシュキーを生成"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """キャッシュ済みベクトルを取得（なければNone）"""
+        key = self.make_key(text)
+        with self._lock:
+            slot = self._index.get(key)
+            if slot is None or self._matrix is None:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return self._matrix[slot].tolist()
+
+    def put(self, text: str, vector: List[float]) -> None:
+        """ベクトルをキャッシュに登録"""
+        if self.read_only:
+            return
+
+        key = self.make_key(text)
+        with self._lock:
+            if self._dimension is None:
+                self._dimension = len(vector)
+            elif len(vector) != self._dimension:
+                raise ValueError(
+                    f"Embedding dimension mismatch: expected {self._dimension}, got {len(vector)}"
+                )
+
+            slot = self._index.get(key)
+            if slot is None:
+                slot = self._allocate_slot()
+            assert self._matrix is not None
+            self._matrix[slot] = np.asarray(vector, dtype=np.float32)
+            self._index[key] = slot
+            self._index.move_to_end(key)
+            self._dirty = True
+
+    def flush(self) -> None:
+        """行列とインデックスをディスクに書き出す"""
+        with self._lock:
+            if self.read_only or not self._dirty or self._matrix is None:
+                return
+
+            self._matrix.flush()
+            index_data = {
+                "embedding_model": self.embedding_model,
+                "dimension": self._dimension,
+                "capacity": self._capacity,
+                "entries": [[key, slot] for key, slot in self._index.items()],
+            }
+            tmp_path = self.directory / f"{self.INDEX_FILE}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index_data, f)
+            os.replace(tmp_path, self.directory / self.INDEX_FILE)
+            self._dirty = False
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット/ミス等の統計情報を取得"""
+        lookups = self.hits + self.misses
+        return {
+            "embedding_model": self.embedding_model,
+            "entries": len(self._index),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _load(self) -> None:
+        """既存のキャッシュファイルを読み込む"""
+        index_path = self.directory / self.INDEX_FILE
+        vectors_path = self.directory / self.VECTORS_FILE
+        if not index_path.exists() or not vectors_path.exists():
+            return
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            if data.get("embedding_model") != self.embedding_model:
+                raise ValueError(f"Cache belongs to model {data.get('embedding_model')}")
+
+            self._dimension = data["dimension"]
+            self._capacity = data["capacity"]
+            self._matrix = np.memmap(
+                vectors_path,
+                dtype=np.float32,
+                mode="r" if self.read_only else "r+",
+                shape=(self._capacity, self._dimension),
+            )
+
+            entries = data["entries"]
+            if len(entries) > self.max_entries:
+                entries = entries[len(entries) - self.max_entries :]
+                self._dirty = True
+            self._index = OrderedDict((key, slot) for key, slot in entries)
+
+            used = set(self._index.values())
+            self._free_slots = [slot for slot in range(self._capacity) if slot not in used]
+
+            logger.info(f"Loaded {len(self._index)} cached embeddings from {self.directory}")
+
+        except Exception as e:
+            logger.warning(f"Discarding unreadable embedding cache at {self.directory}: {e}")
+            self._index = OrderedDict()
+            self._free_slots = []
+            self._dimension = None
+            self._capacity = 0
+            self._matrix = None
+
+    def _allocate_slot(self) -> int:
+        """空きスロットを確保（必要に応じて拡張またはLRU追い出し）"""
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        if len(self._index) >= self.max_entries:
+            _, slot = self._index.popitem(last=False)
+            self.evictions += 1
+            return slot
+
+        if len(self._index) >= self._capacity:
+            self._grow()
+        return self._free_slots.pop()
+
+    def _grow(self) -> None:
+        """行列の容量を拡張"""
+        assert self._dimension is not None
+        new_capacity = min(max(self._capacity * 2, self.INITIAL_CAPACITY), max(self.max_entries, 1))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.directory / self.VECTORS_FILE
+
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+
+        with open(vectors_path, "ab") as f:
+            f.truncate(new_capacity * self._dimension * np.dtype(np.float32).itemsize)
+
+        self._matrix = np.memmap(
+            vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self._dimension)
+        )
+        self._free_slots.extend(range(new_capacity - 1, self._capacity - 1, -1))
+        self._capacity = new_capacity
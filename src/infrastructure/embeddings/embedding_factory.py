@@ -0,0 +1,82 @@
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from config.settings import Settings
+from infrastructure.embeddings.cached_embeddings import CachedEmbeddings
+from infrastructure.embeddings.deterministic_fake_embeddings import DeterministicFakeEmbeddings
+from infrastructure.embeddings.embedding_cache_store import EmbeddingCacheStore
+from infrastructure.embeddings.embedding_pipeline import EmbeddingPipeline
+from infrastructure.embeddings.query_embedding_cache import (
+    QueryEmbeddingCache,
+    default_query_cache_directory,
+)
+from infrastructure.tokenizer.token_counter import TokenCounter
+
+
+def create_embeddings(settings: Settings) -> Embeddings:
+    """設定に応じて埋め込みクライアントを生成（キャッシュ有効時はラップする）"""
+    if settings.embedding_provider == "fake":
+        fake = DeterministicFakeEmbeddings(dimension=settings.fake_embedding_dimension)
+        return _with_query_cache(settings, fake, persistent=False)
+
+    if settings.embedding_provider != "openai":
+        raise ValueError(f"Unknown embedding provider: {settings.embedding_provider}")
+
+    client = OpenAIEmbeddings(model=settings.embedding_model)
+
+    if not settings.embedding_cache_enabled:
+        return _with_query_cache(settings, client, persistent=False)
+
+    store = EmbeddingCacheStore(
+        cache_directory=settings.embedding_cache_directory,
+        embedding_model=settings.embedding_model,
+        max_entries=settings.embedding_cache_max_entries,
+        read_only=settings.embedding_cache_read_only,
+    )
+    return _with_query_cache(settings, CachedEmbeddings(client, store), persistent=True)
+
+
+def _with_query_cache(settings: Settings, embeddings: Embeddings, persistent: bool) -> Embeddings:
+    """クエリ埋め込みのキャッシュでラップ（無効時はそのまま返す）
+
+    クエリのキャッシュミスも embeddings（ドキュメント用の埋め込みキャッシュ）を経由して埋め込む
+    （ベンチマークの事前埋め込みなどで登録済みのクエリをAPIで埋め込み直さないため）
+    """
+    if not settings.query_embedding_cache_enabled:
+        return embeddings
+
+    store = None
+    if persistent:
+        store = EmbeddingCacheStore(
+            cache_directory=settings.query_embedding_cache_directory
+            or default_query_cache_directory(settings.embedding_cache_directory),
+            embedding_model=settings.embedding_model,
+            max_entries=settings.query_embedding_cache_max_entries,
+            read_only=settings.embedding_cache_read_only,
+        )
+    return QueryEmbeddingCache(
+        embeddings,
+        max_entries=settings.query_embedding_cache_max_entries,
+        store=store,
+        flush_interval_seconds=settings.query_embedding_cache_flush_interval_seconds,
+    )
+
+
+def flush_embeddings(embeddings: Embeddings) -> None:
+    """ドキュメント用の埋め込みキャッシュを書き出す（キャッシュがなければ何もしない）"""
+    if isinstance(embeddings, QueryEmbeddingCache):
+        embeddings = embeddings.embeddings
+    if isinstance(embeddings, CachedEmbeddings):
+        embeddings.flush()
+
+
+def create_embedding_pipeline(settings: Settings, embeddings: Embeddings) -> EmbeddingPipeline:
+    """設定に応じて埋め込みパイプラインを生成"""
+    return EmbeddingPipeline(
+        embeddings,
+        max_batch_tokens=settings.embedding_batch_max_tokens,
+        max_batch_size=settings.embedding_batch_max_size,
+        concurrency=settings.embedding_concurrency,
+        max_retries=settings.embedding_max_retries,
+        token_counter=TokenCounter(settings.embedding_model),
+    )
@@ -0,0 +1,163 @@
+import logging
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+import openai
+from langchain_core.embeddings import Embeddings
+
+from infrastructure.tokenizer.token_counter import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+@dataclass
+class EmbeddedBatch:
+    """埋め込み済みのドキュメントバッチ"""
+
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    embeddings: List[List[float]]
+
+
+class EmbeddingPipeline:
+    """バッチ化・並列化された埋め込みパイプライン
+
+    入力（id, text, metadata）をトークン数上限でバッチ化し、
+    N並列のワーカーで埋め込んだ後、入力順にwriterへ渡す。
+    未書き込みのバッチ数が上限に達すると入力の読み込みを止める（バックプレッシャー）。
+    一時的なエラーはジッター付き指数バックオフでリトライする。
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_tokens: int = 50000,
+        max_batch_size: int = 256,
+        concurrency: int = 4,
+        max_pending_batches: Optional[int] = None,
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0,
+        transient_errors: Tuple[Type[BaseException], ...] = DEFAULT_TRANSIENT_ERRORS,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if max_batch_size < 1 or max_batch_tokens < 1:
+            raise ValueError("max_batch_size and max_batch_tokens must be at least 1")
+
+        self.embeddings = embeddings
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.concurrency = concurrency
+        self.max_pending_batches = max_pending_batches or concurrency * 2
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.transient_errors = transient_errors
+        self.token_counter = token_counter or TokenCounter()
+
+    def run(
+        self,
+        items: Iterable[Tuple[str, str, Dict[str, Any]]],
+        writer: Callable[[EmbeddedBatch], None],
+    ) -> Dict[str, Any]:
+        """パイプラインを実行し、統計情報を返す"""
+        start = time.perf_counter()
+        stats = {"batches": 0, "documents": 0, "tokens": 0, "retries": 0}
+        pending: Deque[Tuple[Future, List[str], List[str], List[Dict[str, Any]]]] = deque()
+
+        def drain_one() -> None:
+            future, ids, texts, metadatas = pending.popleft()
+            vectors, retries = future.result()
+            stats["retries"] += retries
+            writer(EmbeddedBatch(ids=ids, texts=texts, metadatas=metadatas, embeddings=vectors))
+            stats["batches"] += 1
+            stats["documents"] += len(ids)
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="embedding"
+        ) as executor:
+            try:
+                for ids, texts, metadatas, tokens in self._iter_batches(items):
+                    while len(pending) >= self.max_pending_batches:
+                        drain_one()
+                    stats["tokens"] += tokens
+                    future = executor.submit(self._embed_with_retry, texts)
+                    pending.append((future, ids, texts, metadatas))
+
+                while pending:
+                    drain_one()
+            except BaseException:
+                for future, _, _, _ in pending:
+                    future.cancel()
+                raise
+
+        elapsed = time.perf_counter() - start
+        stats["elapsed_seconds"] = elapsed
+        stats["documents_per_second"] = stats["documents"] / elapsed if elapsed > 0 else 0.0
+
+        logger.info(
+            f"Embedding pipeline completed - Documents: {stats['documents']}, "
+            f"Batches: {stats['batches']}, Retries: {stats['retries']}, "
+            f"Elapsed: {elapsed:.2f}s"
+        )
+        return stats
+
+    def _iter_batches(
+        self, items: Iterable[Tuple[str, str, Dict[str, Any]]]
+    ) -> Iterator[Tuple[List[str], List[str], List[Dict[str, Any]], int]]:
+        """トークン数・件数の上限でバッチに分割"""
+        ids: List[str] = []
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        batch_tokens = 0
+
+        for doc_id, text, metadata in items:
+            tokens = self.token_counter.count(text)
+            if ids and (
+                batch_tokens + tokens > self.max_batch_tokens or len(ids) >= self.max_batch_size
+            ):
+                yield ids, texts, metadatas, batch_tokens
+                ids, texts, metadatas, batch_tokens = [], [], [], 0
+
+            ids.append(doc_id)
+            texts.append(text)
+            metadatas.append(metadata)
+            batch_tokens += tokens
+
+        if ids:
+            yield ids, texts, metadatas, batch_tokens
+
+    def _embed_with_retry(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """一時的なエラーをリトライしながら埋め込みを実行"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embeddings.embed_documents(texts), attempt
+            except self.transient_errors as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(
+                    0, min(self.retry_max_delay, self.retry_base_delay * (2**attempt))
+                )
+                logger.warning(
+                    f"Transient embedding error (attempt {attempt + 1}/{self.max_retries}), "
+                    f"retrying in {delay:.2f}s: {e}"
+                )
+                time.sleep(delay)
+
+        raise RuntimeError("Embedding retry loop exited unexpectedly")
@@ -0,0 +1,334 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from infrastructure.embeddings.embedding_cache_store import EmbeddingCacheStore
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_PUNCTUATION = re.compile(r"[?？!！。．.、,\s]+$")
+
+
+def normalize_query_text(query: str) -> str:
+    """クエリ文をキャッシュキー用に正規化（全角半角・空白・末尾記号の揺れを吸収）"""
+    normalized = " ".join(unicodedata.normalize("NFKC", query).split())
+    return _TRAILING_PUNCTUATION.sub("", normalized)
+
+
+class QueryEmbeddingCache(Embeddings):
+    """クエリ埋め込みのキャッシュを前段に挟むEmbeddingsラッパー
+
+    検索のたびに発生する埋め込みAPIの往復を省くため、正規化したクエリ文をキーとして
+    1. メモリ上のLRU（max_entries件）
+    2. ディスクの永続キャッシュ（store、プロセスの再起動後も有効）
+    の順に参照し、どちらにもない場合のみ query_embeddings で埋め込む。
+    キーは正規化した文だが、埋め込むのは最初に現れたクエリ文そのもの（検索結果を変えない）。
+
+    ドキュメントの埋め込み（embed_documents）はキャッシュせず embeddings にそのまま委譲する。
+    クエリごとの出現回数を記録し、永続化する（warm_up で頻出クエリを事前に埋め込むために使う）。
+    永続キャッシュとクエリ履歴の書き出しは全体を書き直すため、検索のたびには行わず、
+    flush_interval_seconds ごとにバックグラウンドスレッドで行う（終了時は close() で書き出す）。
+    ヒット数とAPI呼び出しの平均レイテンシから、削減できた検索レイテンシの推定値を報告する
+    """
+
+    HISTORY_FILE = "query_history.json"
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_entries: int = 10000,
+        store: Optional[EmbeddingCacheStore] = None,
+        query_embeddings: Optional[Embeddings] = None,
+        max_history: int = 10000,
+        flush_interval_seconds: float = 0.0,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.embeddings = embeddings
+        self.query_embeddings = query_embeddings or embeddings
+        self.max_entries = max_entries
+        self.store = store
+        self.max_history = max_history
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._history: Counter = Counter()
+        self._history_texts: Dict[str, str] = {}
+        self._unflushed = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.remote_ms = 0.0
+        self.remote_texts = 0
+        self.hit_lookup_ms = 0.0
+        self.warmed_queries = 0
+
+        self._load_history()
+
+        self._stop_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+        if flush_interval_seconds > 0:
+            self._flush_thread = threading.Thread(
+                target=self._run_flush, name="query-cache-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """ドキュメントを埋め込み（クエリキャッシュは使わない）"""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """クエリを埋め込み（キャッシュ優先）"""
+        vectors, _ = self.embed_queries([text])
+        return vectors[0]
+
+    def embed_queries(self, queries: List[str]) -> Tuple[List[List[float]], List[str]]:
+        """複数クエリを埋め込み、ベクトルとAPIで埋め込んだクエリ文を返す
+
+        キャッシュにないクエリはまとめて1回のAPI呼び出しで埋め込む
+        """
+        start = time.perf_counter()
+        keys = [normalize_query_text(query) for query in queries]
+        looked_up: Dict[str, Optional[List[float]]] = {}
+        with self._lock:
+            for query, key in zip(queries, keys):
+                self._history[key] += 1
+                self._history_texts.setdefault(key, query)
+                # 同じバッチ内で重複するクエリは1回だけ参照する（ヒット・ミスも1回と数える）
+                if key not in looked_up:
+                    looked_up[key] = self._lookup(key)
+        vectors = [looked_up[key] for key in keys]
+        hits = sum(vector is not None for vector in looked_up.values())
+        lookup_ms = (time.perf_counter() - start) * 1000
+
+        missing = list(
+            dict.fromkeys(
+                (key, query) for query, key, vector in zip(queries, keys, vectors) if vector is None
+            )
+        )
+        embedded: Dict[str, List[float]] = {}
+        if missing:
+            embedded = self._embed_remote(dict(missing))
+
+        with self._lock:
+            self.hit_lookup_ms += lookup_ms if hits else 0.0
+            self._unflushed += len(queries)
+
+        return (
+            [vector if vector is not None else embedded[key] for key, vector in zip(keys, vectors)],
+            [query for _, query in missing],
+        )
+
+    def warm_up(self, queries: Iterable[str], batch_size: int = 100) -> Dict[str, Any]:
+        """クエリをまとめて埋め込み、キャッシュに登録（キャッシュ済みのものは除く）"""
+        start = time.perf_counter()
+        pending: Dict[str, str] = {}
+        total = 0
+        with self._lock:
+            for query in queries:
+                key = normalize_query_text(query)
+                if not key or key in pending:
+                    continue
+                total += 1
+                if key in self._entries:
+                    continue
+                vector = self.store.get(key) if self.store is not None else None
+                if vector is not None:
+                    self._remember(key, vector)
+                else:
+                    pending[key] = query
+
+        items = list(pending.items())
+        for offset in range(0, len(items), batch_size):
+            self._embed_remote(dict(items[offset : offset + batch_size]))
+
+        with self._lock:
+            self.warmed_queries += len(pending)
+        self.flush()
+
+        result = {
+            "queries": total,
+            "embedded": len(pending),
+            "already_cached": total - len(pending),
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+        logger.info(
+            f"Warmed query embedding cache: {result['embedded']} embedded, "
+            f"{result['already_cached']} already cached ({result['elapsed_ms']:.0f}ms)"
+        )
+        return result
+
+    def top_queries(self, n: int) -> List[str]:
+        """出現回数の多いクエリ文を取得"""
+        with self._lock:
+            return [self._history_texts[key] for key, _ in self._history.most_common(n)]
+
+    def flush(self) -> None:
+        """永続キャッシュとクエリ履歴をディスクに書き出す
+
+        クエリ履歴は出現回数の上位 max_history 件のみをメモリ上にも残す
+        """
+        with self._lock:
+            self._unflushed = 0
+            top = self._history.most_common(self.max_history)
+            if len(self._history) > self.max_history:
+                self._history = Counter(dict(top))
+                self._history_texts = {key: self._history_texts[key] for key, _ in top}
+            history = [[key, self._history_texts[key], count] for key, count in top]
+            remote_ms, remote_texts = self.remote_ms, self.remote_texts
+        if self.store is None:
+            return
+
+        self.store.flush()
+        if self.store.read_only:
+            return
+
+        history_path = self.store.directory / self.HISTORY_FILE
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = history_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"remote_ms": remote_ms, "remote_queries": remote_texts, "queries": history},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, history_path)
+
+    def close(self) -> None:
+        """バックグラウンドの書き出しを停止し、未書き出しの内容を書き出す"""
+        self._stop_event.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット率と削減できた検索レイテンシの推定値を取得
+
+        estimated_saved_ms は、ヒットしたクエリをAPIで埋め込んだ場合の平均レイテンシの合計から
+        キャッシュの参照にかかった時間を差し引いた値（平均は過去のプロセスでの埋め込みも含む）
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            avg_remote_ms = self.remote_ms / self.remote_texts if self.remote_texts else 0.0
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "persistent_entries": len(self.store) if self.store is not None else 0,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "avg_remote_ms": avg_remote_ms,
+                "estimated_saved_ms": max(hits * avg_remote_ms - self.hit_lookup_ms, 0.0),
+                "warmed_queries": self.warmed_queries,
+                "distinct_queries": len(self._history),
+            }
+
+    def _run_flush(self) -> None:
+        while not self._stop_event.wait(self.flush_interval_seconds):
+            if not self._unflushed:
+                continue
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Failed to save query embedding cache: {e}")
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        """メモリ・ディスクの順にキャッシュを参照（ロック取得済みで呼ぶ）"""
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return vector
+
+        if self.store is not None:
+            vector = self.store.get(key)
+            if vector is not None:
+                self._remember(key, vector)
+                self.disk_hits += 1
+                return vector
+
+        self.misses += 1
+        return None
+
+    def _embed_remote(self, queries_by_key: Dict[str, str]) -> Dict[str, List[float]]:
+        """キャッシュにないクエリをAPIで埋め込み、キャッシュに登録"""
+        texts = list(queries_by_key.values())
+        start = time.perf_counter()
+        if len(texts) == 1:
+            vectors = [self.query_embeddings.embed_query(texts[0])]
+        else:
+            vectors = self.query_embeddings.embed_documents(texts)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        embedded = dict(zip(queries_by_key, vectors))
+        with self._lock:
+            self.remote_ms += elapsed_ms
+            self.remote_texts += len(texts)
+            for key, vector in embedded.items():
+                self._remember(key, vector)
+                if self.store is not None:
+                    self.store.put(key, vector)
+        return embedded
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """メモリのLRUに登録（ロック取得済みで呼ぶ）"""
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_history(self) -> None:
+        """保存済みのクエリ履歴を読み込む"""
+        if self.store is None:
+            return
+
+        history_path = self.store.directory / self.HISTORY_FILE
+        if not history_path.exists():
+            return
+
+        try:
+            with open(history_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, text, count in data.get("queries", []):
+                self._history[key] = count
+                self._history_texts[key] = text
+            # 再起動直後のヒットでも削減できたレイテンシを推定できるよう、平均の算出に引き継ぐ
+            self.remote_ms = float(data.get("remote_ms", 0.0))
+            self.remote_texts = int(data.get("remote_queries", 0))
+            logger.info(f"Loaded history of {len(self._history)} queries from {history_path}")
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring corrupted query history {history_path}: {e}")
+
+
+def embed_queries(
+    embeddings: Embeddings, queries: List[str]
+) -> Tuple[List[List[float]], List[str]]:
+    """クエリを埋め込み、ベクトルとAPIで埋め込んだクエリ文を返す
+
+    QueryEmbeddingCache の場合はキャッシュを使い、それ以外は全クエリを埋め込む
+    """
+    if isinstance(embeddings, QueryEmbeddingCache):
+        return embeddings.embed_queries(queries)
+    if len(queries) == 1:
+        return [embeddings.embed_query(queries[0])], queries
+    return embeddings.embed_documents(queries), queries
+
+
+def default_query_cache_directory(embedding_cache_directory: str) -> str:
+    """クエリ埋め込みの永続キャッシュの既定の保存先"""
+    return str(Path(embedding_cache_directory) / "queries")
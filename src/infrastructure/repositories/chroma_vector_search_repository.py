@@ -1,35 +1,119 @@
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
+from chromadb.api.client import SharedSystemClient
+from chromadb.api.models.Collection import Collection
 from langchain_chroma import Chroma
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from config.settings import Settings
+from domain.entities.indexed_documents import IndexedDocuments
 from domain.entities.query_result import Document
+from domain.entities.search_filter import SearchFilter
 from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.embeddings.embedding_factory import (
+    create_embedding_pipeline,
+    create_embeddings,
+    flush_embeddings,
+)
+from infrastructure.embeddings.embedding_pipeline import EmbeddedBatch
+from infrastructure.embeddings.query_embedding_cache import embed_queries
+from infrastructure.tracing.cost import estimate_cost
+from infrastructure.tracing.tracer import get_tracer
 
 logger = logging.getLogger(__name__)
 
 
 class ChromaVectorSearchRepository(VectorSearchRepository):
-    """Chromaを使用したベクトル検索リポジトリ実装"""
+    """Chromaを使用したベクトル検索リポジトリ実装
 
-    def __init__(self, settings: Settings):
+    embeddingsを指定しない場合は設定に応じた埋め込みクライアントを使用する。
+    HNSWインデックスのパラメーター（hnsw_m / hnsw_ef_construction）はコレクションの
+    作成時にのみ反映されるため、変更した場合はコレクションを作り直す必要がある。
+    検索時の hnsw_ef_search は既存のコレクションにも反映する
+    """
+
+    def __init__(self, settings: Settings, embeddings: Optional[Embeddings] = None):
         self.settings = settings
         try:
-            self.embeddings = OpenAIEmbeddings(
-                model=settings.embedding_model,
-            )
-            self.db = Chroma(
-                collection_name=settings.chroma_collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=settings.chroma_persist_directory,
-            )
+            self.embeddings = embeddings or create_embeddings(settings)
+            self.embedding_pipeline = create_embedding_pipeline(settings, self.embeddings)
+            self.db = self._open_collection()
+            self._apply_hnsw_settings()
+            if settings.vector_quantization != "none" or settings.vector_quantization_dimensions:
+                logger.warning(
+                    "Vector quantization is only supported by the numpy backend; "
+                    "Chroma stores full-precision embeddings"
+                )
             logger.info(f"Initialized Chroma DB at {settings.chroma_persist_directory}")
         except Exception as e:
             logger.error(f"Failed to initialize Chroma DB: {e}")
             raise RuntimeError(f"Failed to initialize vector search: {e}")
 
+    def _open_collection(self) -> Chroma:
+        """コレクションを開く（存在しない場合は設定のHNSWパラメーターで作成）"""
+        return Chroma(
+            collection_name=self.settings.chroma_collection_name,
+            embedding_function=self.embeddings,
+            persist_directory=self.settings.chroma_persist_directory,
+            collection_configuration={
+                "hnsw": {
+                    "max_neighbors": self.settings.hnsw_m,
+                    "ef_construction": self.settings.hnsw_ef_construction,
+                    "ef_search": self.settings.hnsw_ef_search,
+                }
+            },
+        )
+
+    @property
+    def _chroma_collection(self) -> Collection:
+        """Chroma本体のコレクション（langchain_chroma の内部属性への依存をここに閉じ込める）
+
+        langchain_chroma.Chroma の add_texts / similarity_search は必ず embedding_function で
+        埋め込み直すため、埋め込み済みのベクトルを受け取る公開APIがない。埋め込みパイプラインで
+        並列に計算したベクトルの登録、クエリ埋め込みキャッシュのベクトルでの検索、
+        埋め込みの読み出し、HNSWの設定変更にはコレクションを直接使う
+        """
+        return self.db._collection
+
+    def _apply_hnsw_settings(self) -> None:
+        """既存のコレクションのHNSWパラメーターを設定と照合し、ef_searchを反映"""
+        hnsw = (self._chroma_collection.configuration or {}).get("hnsw") or {}
+        built = {
+            "hnsw_m": (hnsw.get("max_neighbors"), self.settings.hnsw_m),
+            "hnsw_ef_construction": (
+                hnsw.get("ef_construction"),
+                self.settings.hnsw_ef_construction,
+            ),
+        }
+        for name, (current, configured) in built.items():
+            if current is not None and current != configured:
+                logger.warning(
+                    f"Collection {self.settings.chroma_collection_name} was built with "
+                    f"{name}={current}; rebuild it to apply {name}={configured}"
+                )
+
+        # HNSWインデックスは初回の検索時に読み込まれるため、ここで変更すれば反映される
+        if hnsw.get("ef_search") != self.settings.hnsw_ef_search:
+            self._modify_ef_search(self.settings.hnsw_ef_search)
+
+    def set_ef_search(self, ef_search: int) -> None:
+        """HNSWの検索時の探索幅を変更（大きいほど再現率が上がり、検索は遅くなる）
+
+        読み込み済みのHNSWインデックスには変更が反映されないため、Chromaのクライアントを
+        作り直してコレクションを開き直す（パラメーターの調整・スイープ用）
+        """
+        if ef_search < 1:
+            raise ValueError("ef_search must be at least 1")
+        self._modify_ef_search(ef_search)
+        SharedSystemClient.clear_system_cache()
+        self.db = self._open_collection()
+
+    def _modify_ef_search(self, ef_search: int) -> None:
+        """コレクションに保存されたef_searchを変更"""
+        self._chroma_collection.modify(configuration={"hnsw": {"ef_search": ef_search}})
+        logger.info(f"Set HNSW ef_search={ef_search} for {self.settings.chroma_collection_name}")
+
     def add_documents(
         self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]
     ) -> None:
@@ -38,13 +122,36 @@ class ChromaVectorSearchRepository(VectorSearchRepository):
             if len(texts) != len(metadatas) or len(texts) != len(ids):
                 raise ValueError("texts, metadatas, and ids must have the same length")
 
-            self.db.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+            self.embedding_pipeline.run(zip(ids, texts, metadatas), self._write_batch)
             logger.info(f"Added {len(texts)} documents to Chroma DB")
         except Exception as e:
             logger.error(f"Failed to add documents: {e}")
             raise RuntimeError(f"Failed to add documents to vector DB: {e}")
 
-    def search(self, query: str, n_results: int = 3) -> List[Document]:
+    def _write_batch(self, batch: EmbeddedBatch) -> None:
+        """埋め込み済みバッチをChromaにupsert"""
+        self._chroma_collection.upsert(
+            ids=batch.ids,
+            embeddings=batch.embeddings,
+            metadatas=batch.metadatas,
+            documents=batch.texts,
+        )
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """指定IDのドキュメントをベクトルDBから削除"""
+        try:
+            if not ids:
+                return
+
+            self.db.delete(ids=ids)
+            logger.info(f"Deleted {len(ids)} documents from Chroma DB")
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise RuntimeError(f"Failed to delete documents from vector DB: {e}")
+
+    def search(
+        self, query: str, n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[Document]:
         """類似度検索を実行"""
         try:
             if not query or not query.strip():
@@ -53,7 +160,11 @@ class ChromaVectorSearchRepository(VectorSearchRepository):
             if n_results < 1:
                 raise ValueError("n_results must be at least 1")
 
-            results = self.db.similarity_search_with_score(query, k=n_results)
+            query_embedding = self._embed_queries([query])[0]
+            with get_tracer().span("vector_search", backend="chroma"):
+                results = self.db.similarity_search_by_vector_with_relevance_scores(
+                    query_embedding, k=n_results, filter=self._to_where(filters)
+                )
 
             documents = []
             for langchain_doc, score in results:
@@ -61,6 +172,7 @@ class ChromaVectorSearchRepository(VectorSearchRepository):
                     page_content=langchain_doc.page_content,
                     metadata=langchain_doc.metadata,
                     score=float(score),
+                    doc_id=langchain_doc.id,
                 )
                 documents.append(doc)
 
@@ -71,6 +183,124 @@ class ChromaVectorSearchRepository(VectorSearchRepository):
             logger.error(f"Search failed: {e}")
             raise RuntimeError(f"Failed to search documents: {e}")
 
+    def search_batch(
+        self, queries: List[str], n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[List[Document]]:
+        """複数クエリの類似度検索をまとめて実行
+
+        全クエリを1回の埋め込みリクエストでベクトル化し、1回のk近傍検索で結果を取得する
+        """
+        try:
+            if any(not query or not query.strip() for query in queries):
+                raise ValueError("Query cannot be empty")
+
+            if n_results < 1:
+                raise ValueError("n_results must be at least 1")
+
+            if not queries:
+                return []
+
+            query_embeddings = self._embed_queries(queries)
+            with get_tracer().span("vector_search", backend="chroma", queries=len(queries)):
+                results = self._chroma_collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    where=self._to_where(filters),
+                    include=["documents", "metadatas", "distances"],
+                )
+
+            batch_documents = []
+            for ids, texts, metadatas, distances in zip(
+                results["ids"],
+                results["documents"] or [],
+                results["metadatas"] or [],
+                results["distances"] or [],
+            ):
+                batch_documents.append(
+                    [
+                        Document(
+                            page_content=text or "",
+                            metadata=dict(metadata or {}),
+                            score=float(distance),
+                            doc_id=doc_id,
+                        )
+                        for doc_id, text, metadata, distance in zip(
+                            ids, texts, metadatas, distances
+                        )
+                    ]
+                )
+
+            logger.info(f"Batch search completed for {len(queries)} queries")
+            return batch_documents
+
+        except Exception as e:
+            logger.error(f"Batch search failed: {e}")
+            raise RuntimeError(f"Failed to search documents: {e}")
+
+    @staticmethod
+    def _to_where(filters: Optional[SearchFilter]) -> Optional[Dict[str, Any]]:
+        """検索フィルターをChromaのwhere条件に変換"""
+        if filters is None or filters.is_empty:
+            return None
+
+        clauses = [
+            {
+                condition.field: {
+                    f"${condition.operator}": (
+                        list(condition.value) if condition.operator == "in" else condition.value
+                    )
+                }
+            }
+            for condition in filters.conditions
+        ]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """クエリを埋め込み（トークン数と概算コストをスパンに記録）
+
+        クエリ埋め込みのキャッシュにヒットしたクエリはAPIを呼ばないため、トークン数に含めない
+        """
+        with get_tracer().span("query_embedding", model=self.settings.embedding_model) as span:
+            vectors, embedded = embed_queries(self.embeddings, queries)
+
+            tokens = sum(self.embedding_pipeline.token_counter.count(query) for query in embedded)
+            span.set_attribute("cache_hits", len(queries) - len(embedded))
+            span.set_attribute("tokens", tokens)
+            span.set_attribute(
+                "estimated_cost_usd", estimate_cost(self.settings.embedding_model, tokens)
+            )
+        return vectors
+
+    def iter_indexed_documents(self, batch_size: int = 1000) -> Iterator[IndexedDocuments]:
+        """登録済みのドキュメントを埋め込みとともに batch_size 件ずつ取得"""
+        try:
+            offset = 0
+            while True:
+                results = self._chroma_collection.get(
+                    limit=batch_size,
+                    offset=offset,
+                    include=["documents", "metadatas", "embeddings"],
+                )
+                ids = results["ids"]
+                if not ids:
+                    return
+
+                yield IndexedDocuments(
+                    ids=list(ids),
+                    texts=[text or "" for text in results["documents"]],
+                    metadatas=[dict(metadata or {}) for metadata in results["metadatas"]],
+                    embeddings=[list(map(float, vector)) for vector in results["embeddings"]],
+                )
+                offset += len(ids)
+
+        except Exception as e:
+            logger.error(f"Failed to export documents: {e}")
+            raise RuntimeError(f"Failed to export documents from vector DB: {e}")
+
+    def persist(self) -> None:
+        """埋め込みキャッシュをディスクに書き出す（Chromaは書き込み時に永続化する）"""
+        flush_embeddings(self.embeddings)
+
     def delete_collection(self) -> None:
         """コレクションを削除"""
         try:
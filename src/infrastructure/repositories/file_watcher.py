@@ -0,0 +1,92 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FileSignature = Optional[Tuple[int, int]]
+
+
+class FileWatcher:
+    """データファイルの更新をポーリングで検知し、登録したコールバックを呼び出す
+
+    更新の判定には stat の mtime（ナノ秒）とサイズを使う（追加の依存なしにどの環境でも動作する）。
+    書き込み途中のファイルを読まないよう、変更後のシグネチャが次のポーリングでも
+    変わっていない（書き込みが落ち着いた）ことを確認してからコールバックを呼ぶ。
+    コールバックが False を返した場合、または例外を送出した場合は処理済みとせず、
+    次のポーリングで再度呼び出す
+    """
+
+    def __init__(self, interval_seconds: float = 5.0):
+        self.interval_seconds = interval_seconds
+        self._callbacks: Dict[Path, Callable[[], bool]] = {}
+        self._handled: Dict[Path, FileSignature] = {}
+        self._observed: Dict[Path, FileSignature] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, path: Path, callback: Callable[[], bool]) -> None:
+        """監視するファイルとコールバックを登録（登録時点の内容を処理済みとする）"""
+        signature = self._signature(path)
+        self._callbacks[path] = callback
+        self._handled[path] = signature
+        self._observed[path] = signature
+
+    def check(self) -> List[Path]:
+        """全ファイルを1回確認し、コールバックを呼び出したファイルを返す"""
+        triggered = []
+        for path, callback in self._callbacks.items():
+            signature = self._signature(path)
+            previous_observation = self._observed[path]
+            self._observed[path] = signature
+
+            # 削除中・置き換え中のファイルは再作成されるまで待つ
+            if signature is None or signature == self._handled[path]:
+                continue
+            if signature != previous_observation:
+                continue
+
+            triggered.append(path)
+            try:
+                handled = callback()
+            except Exception as e:
+                logger.error(f"Failed to handle change in {path}: {e}")
+                handled = False
+
+            if handled:
+                self._handled[path] = signature
+        return triggered
+
+    def start(self) -> None:
+        """バックグラウンドスレッドで監視を開始"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Watching {len(self._callbacks)} data files "
+            f"(interval: {self.interval_seconds:.1f}s)"
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """監視を停止"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            self.check()
+
+    @staticmethod
+    def _signature(path: Path) -> FileSignature:
+        """ファイルの更新を判定するシグネチャ（存在しない場合はNone）"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
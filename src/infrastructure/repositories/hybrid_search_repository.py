@@ -0,0 +1,219 @@
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import Settings
+from domain.entities.indexed_documents import IndexedDocuments
+from domain.entities.query_result import Document
+from domain.entities.search_filter import SearchFilter
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.search.bm25_index import BM25Index
+from infrastructure.tracing.tracer import get_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class HybridSearchRepository(VectorSearchRepository):
+    """BM25とベクトル検索を組み合わせたハイブリッド検索リポジトリ実装
+
+    ドキュメント追加時にベクトルDBとBM25転置インデックスの両方へ登録し、
+    検索時は両方の候補リストをReciprocal Rank Fusion（RRF）で統合する。
+    hybrid_vector_weight が 1.0 ならベクトル検索のみ、0.0 ならBM25のみとなる
+    """
+
+    def __init__(self, vector_repo: VectorSearchRepository, settings: Settings):
+        if not 0.0 <= settings.hybrid_vector_weight <= 1.0:
+            raise ValueError("hybrid_vector_weight must be between 0.0 and 1.0")
+
+        self.vector_repo = vector_repo
+        self.settings = settings
+        self.vector_weight = settings.hybrid_vector_weight
+        self.rrf_k = settings.hybrid_rrf_k
+        self.candidate_pool = settings.hybrid_candidate_pool
+        self.bm25_index = BM25Index(self._resolve_index_path(settings))
+        self.last_timings: Dict[str, float] = {}
+
+        logger.info(
+            f"Initialized hybrid search (vector weight: {self.vector_weight}, "
+            f"BM25 documents: {len(self.bm25_index)})"
+        )
+
+    @staticmethod
+    def _resolve_index_path(settings: Settings) -> Path:
+        """BM25インデックスの保存先を決定"""
+        if settings.bm25_index_path:
+            return Path(settings.bm25_index_path)
+        return (
+            Path(settings.chroma_persist_directory) / f"{settings.chroma_collection_name}_bm25.json"
+        )
+
+    def add_documents(
+        self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]
+    ) -> None:
+        """ドキュメントをベクトルDBとBM25インデックスに追加"""
+        try:
+            if len(texts) != len(metadatas) or len(texts) != len(ids):
+                raise ValueError("texts, metadatas, and ids must have the same length")
+
+            self.vector_repo.add_documents(texts, metadatas, ids)
+            self.bm25_index.add_documents(texts, metadatas, ids)
+        except Exception as e:
+            logger.error(f"Failed to add documents: {e}")
+            raise RuntimeError(f"Failed to add documents to hybrid index: {e}")
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """指定IDのドキュメントを両インデックスから削除"""
+        try:
+            self.vector_repo.delete_documents(ids)
+            self.bm25_index.delete_documents(ids)
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise RuntimeError(f"Failed to delete documents from hybrid index: {e}")
+
+    def search(
+        self, query: str, n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[Document]:
+        """ハイブリッド検索を実行（フィルターはベクトル検索とBM25の両方に適用する）"""
+        try:
+            if not query or not query.strip():
+                raise ValueError("Query cannot be empty")
+
+            if n_results < 1:
+                raise ValueError("n_results must be at least 1")
+
+            pool_size = max(self.candidate_pool, n_results)
+            timings: Dict[str, float] = {}
+            start = time.perf_counter()
+
+            vector_docs: List[Document] = []
+            if self.vector_weight > 0.0:
+                vector_docs = self.vector_repo.search(query, pool_size, filters)
+            timings["vector_ms"] = (time.perf_counter() - start) * 1000
+
+            lexical_start = time.perf_counter()
+            lexical_hits: List[Tuple[str, float]] = []
+            if self.vector_weight < 1.0:
+                with get_tracer().span("lexical_search"):
+                    lexical_hits = self.bm25_index.search(
+                        query, pool_size, self._metadata_filter(filters)
+                    )
+            timings["lexical_ms"] = (time.perf_counter() - lexical_start) * 1000
+
+            fusion_start = time.perf_counter()
+            with get_tracer().span("fusion"):
+                documents = self._fuse(vector_docs, lexical_hits, n_results)
+            timings["fusion_ms"] = (time.perf_counter() - fusion_start) * 1000
+            timings["total_ms"] = (time.perf_counter() - start) * 1000
+            self.last_timings = timings
+
+            logger.info(
+                f"Hybrid search found {len(documents)} documents for query: {query[:50]}... "
+                f"(vector: {timings['vector_ms']:.1f}ms, lexical: {timings['lexical_ms']:.1f}ms, "
+                f"fusion: {timings['fusion_ms']:.1f}ms)"
+            )
+            return documents
+
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise RuntimeError(f"Failed to search documents: {e}")
+
+    def search_batch(
+        self, queries: List[str], n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[List[Document]]:
+        """複数クエリのハイブリッド検索をまとめて実行（ベクトル検索は一括で行う）"""
+        try:
+            if any(not query or not query.strip() for query in queries):
+                raise ValueError("Query cannot be empty")
+
+            if n_results < 1:
+                raise ValueError("n_results must be at least 1")
+
+            pool_size = max(self.candidate_pool, n_results)
+
+            vector_results: List[List[Document]] = [[] for _ in queries]
+            if self.vector_weight > 0.0 and queries:
+                vector_results = self.vector_repo.search_batch(queries, pool_size, filters)
+
+            metadata_filter = self._metadata_filter(filters)
+            batch_documents = []
+            for query, vector_docs in zip(queries, vector_results):
+                lexical_hits: List[Tuple[str, float]] = []
+                if self.vector_weight < 1.0:
+                    lexical_hits = self.bm25_index.search(query, pool_size, metadata_filter)
+                batch_documents.append(self._fuse(vector_docs, lexical_hits, n_results))
+
+            logger.info(f"Hybrid batch search completed for {len(queries)} queries")
+            return batch_documents
+
+        except Exception as e:
+            logger.error(f"Batch search failed: {e}")
+            raise RuntimeError(f"Failed to search documents: {e}")
+
+    @staticmethod
+    def _metadata_filter(
+        filters: Optional[SearchFilter],
+    ) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        """BM25の候補に適用するメタデータ条件を取得"""
+        if filters is None or filters.is_empty:
+            return None
+        return filters.matches
+
+    def _fuse(
+        self, vector_docs: List[Document], lexical_hits: List[Tuple[str, float]], n_results: int
+    ) -> List[Document]:
+        """重み付きReciprocal Rank Fusionで候補を統合"""
+        fused_scores: Dict[str, float] = {}
+        documents: Dict[str, Document] = {}
+
+        for rank, doc in enumerate(vector_docs, 1):
+            key = doc.doc_id or doc.page_content
+            fused_scores[key] = fused_scores.get(key, 0.0) + self.vector_weight / (
+                self.rrf_k + rank
+            )
+            documents.setdefault(key, doc)
+
+        for rank, (doc_id, _) in enumerate(lexical_hits, 1):
+            fused_scores[doc_id] = fused_scores.get(doc_id, 0.0) + (1.0 - self.vector_weight) / (
+                self.rrf_k + rank
+            )
+            if doc_id not in documents:
+                stored = self.bm25_index.get_document(doc_id)
+                if stored is not None:
+                    text, metadata = stored
+                    documents[doc_id] = Document(
+                        page_content=text, metadata=metadata, doc_id=doc_id
+                    )
+
+        ranked = sorted(fused_scores.items(), key=lambda item: item[1], reverse=True)
+        results = []
+        for key, score in ranked[:n_results]:
+            doc = documents[key]
+            results.append(
+                Document(
+                    page_content=doc.page_content,
+                    metadata=doc.metadata,
+                    score=score,
+                    doc_id=doc.doc_id,
+                )
+            )
+        return results
+
+    def delete_collection(self) -> None:
+        """両インデックスのデータを削除"""
+        try:
+            self.vector_repo.delete_collection()
+            self.bm25_index.clear()
+            self.bm25_index.save()
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            raise RuntimeError(f"Failed to delete collection: {e}")
+
+    def persist(self) -> None:
+        """BM25インデックスとベクトルDBの変更を永続化"""
+        self.vector_repo.persist()
+        self.bm25_index.save()
+
+    def iter_indexed_documents(self, batch_size: int = 1000) -> Iterator[IndexedDocuments]:
+        """ベクトルDBに登録済みのドキュメントを埋め込みとともに取得"""
+        return self.vector_repo.iter_indexed_documents(batch_size)
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import Settings
+from domain.entities.indexed_documents import IndexedDocuments
+
+logger = logging.getLogger(__name__)
+
+
+class IndexSnapshot:
+    """構築済みインデックスのスナップショット
+
+    埋め込みの再計算なしに別の環境（新しいレプリカ等）へインデックスを配布するための
+    バージョン付きの成果物。ディレクトリ構成:
+    - embeddings.npy: L2正規化済みのfloat32埋め込み行列（読み込み時はメモリマップ）
+    - metadata.json: ID・本文・メタデータをキーごとの列として保持するサイドカー
+      （NumpyVectorSearchRepository の永続化形式と同じ）
+    - manifest.json: チャンクの指紋とチャンク戦略（IndexManifest の内容）
+    - snapshot.json: 形式バージョン・埋め込みモデル・次元数・件数と、各ファイルのSHA-256
+
+    作成は一時ディレクトリに書き出してから置き換えるため、読み込み側が書きかけの
+    スナップショットを参照することはない
+    """
+
+    FORMAT_VERSION = 1
+    INFO_FILE = "snapshot.json"
+    EMBEDDINGS_FILE = "embeddings.npy"
+    METADATA_FILE = "metadata.json"
+    MANIFEST_FILE = "manifest.json"
+    CHECKSUM_BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, directory: Path, info: Dict[str, Any]):
+        self.directory = directory
+        self.info = info
+
+    @property
+    def document_count(self) -> int:
+        return int(self.info["document_count"])
+
+    @property
+    def dimension(self) -> int:
+        return int(self.info["dimension"])
+
+    @property
+    def embedding_provider(self) -> str:
+        return str(self.info["embedding_provider"])
+
+    @property
+    def embedding_model(self) -> str:
+        return str(self.info["embedding_model"])
+
+    @classmethod
+    def write(
+        cls,
+        directory: Path,
+        batches: Iterable[IndexedDocuments],
+        manifest: Dict[str, Any],
+        embedding_provider: str,
+        embedding_model: str,
+    ) -> "IndexSnapshot":
+        """登録済みドキュメントのストリームからスナップショットを作成
+
+        埋め込みは一時ファイルへ逐次書き出すため、行列全体をメモリに保持しない
+        """
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp_directory = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+        try:
+            # mkdtempは所有者のみのパーミッションで作成するため、通常のディレクトリと揃える
+            os.chmod(tmp_directory, 0o755)
+            ids: List[str] = []
+            texts: List[str] = []
+            columns: Dict[str, List[Any]] = {}
+            dimension = 0
+
+            raw_path = tmp_directory / f"{cls.EMBEDDINGS_FILE}.raw"
+            with open(raw_path, "wb") as raw:
+                for batch in batches:
+                    if not len(batch):
+                        continue
+                    vectors = cls._normalize(np.asarray(batch.embeddings, dtype=np.float32))
+                    if dimension and vectors.shape[1] != dimension:
+                        raise ValueError(
+                            f"Embedding dimension mismatch: {dimension} and {vectors.shape[1]}"
+                        )
+                    dimension = vectors.shape[1]
+                    raw.write(np.ascontiguousarray(vectors).tobytes())
+
+                    for doc_id, text, metadata in zip(batch.ids, batch.texts, batch.metadatas):
+                        row = len(ids)
+                        ids.append(doc_id)
+                        texts.append(text)
+                        for column in columns.values():
+                            column.append(None)
+                        for key, value in metadata.items():
+                            if key not in columns:
+                                columns[key] = [None] * (row + 1)
+                            columns[key][row] = value
+
+            if not ids:
+                raise ValueError("No indexed documents to snapshot")
+
+            cls._write_npy(tmp_directory / cls.EMBEDDINGS_FILE, raw_path, (len(ids), dimension))
+            cls._write_json(
+                tmp_directory / cls.METADATA_FILE,
+                {"ids": ids, "texts": texts, "columns": columns},
+            )
+            cls._write_json(tmp_directory / cls.MANIFEST_FILE, manifest)
+
+            info = {
+                "format_version": cls.FORMAT_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "embedding_provider": embedding_provider,
+                "embedding_model": embedding_model,
+                "dimension": dimension,
+                "document_count": len(ids),
+                "product_strategy": manifest.get("product_strategy"),
+                "faq_strategy": manifest.get("faq_strategy"),
+                "manifest_version": manifest.get("version"),
+                "files": {
+                    name: {
+                        "sha256": cls._checksum(tmp_directory / name),
+                        "bytes": (tmp_directory / name).stat().st_size,
+                    }
+                    for name in (cls.EMBEDDINGS_FILE, cls.METADATA_FILE, cls.MANIFEST_FILE)
+                },
+            }
+            cls._write_json(tmp_directory / cls.INFO_FILE, info)
+
+            cls._replace_directory(tmp_directory, directory)
+        except Exception:
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+            raise
+
+        logger.info(
+            f"Created index snapshot with {len(ids)} documents "
+            f"(dimension: {dimension}) at {directory}"
+        )
+        return cls(directory, info)
+
+    @classmethod
+    def open(cls, directory: Path, verify_checksum: bool = True) -> "IndexSnapshot":
+        """スナップショットを開く（形式バージョンと、指定時はチェックサムを検証）"""
+        info_path = directory / cls.INFO_FILE
+        if not info_path.exists():
+            raise FileNotFoundError(f"Index snapshot not found: {directory}")
+
+        with open(info_path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+
+        if info.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported index snapshot format version: {info.get('format_version')} "
+                f"(expected {cls.FORMAT_VERSION})"
+            )
+
+        snapshot = cls(directory, info)
+        if verify_checksum:
+            snapshot.verify()
+        return snapshot
+
+    def verify(self) -> None:
+        """各ファイルのサイズとSHA-256がsnapshot.jsonの記録と一致するか検証"""
+        for name, expected in self.info["files"].items():
+            path = self.directory / name
+            if not path.exists():
+                raise ValueError(f"Index snapshot file is missing: {path}")
+            if path.stat().st_size != expected["bytes"]:
+                raise ValueError(f"Index snapshot file size mismatch: {path}")
+            if self._checksum(path) != expected["sha256"]:
+                raise ValueError(f"Index snapshot checksum mismatch: {path}")
+
+    def check_compatible(self, settings: Settings) -> None:
+        """現在の埋め込み設定でこのスナップショットを検索できるか確認
+
+        クエリの埋め込みとインデックスの埋め込みが同じモデル（同じ次元）でなければ
+        類似度が意味をなさないため、不一致の場合は例外を送出する
+        """
+        if self.embedding_provider != settings.embedding_provider:
+            raise ValueError(
+                f"Index snapshot was built with embedding provider "
+                f"'{self.embedding_provider}', but '{settings.embedding_provider}' is configured"
+            )
+        if settings.embedding_provider == "fake":
+            if self.dimension != settings.fake_embedding_dimension:
+                raise ValueError(
+                    f"Index snapshot dimension {self.dimension} does not match "
+                    f"fake embedding dimension {settings.fake_embedding_dimension}"
+                )
+        elif self.embedding_model != settings.embedding_model:
+            raise ValueError(
+                f"Index snapshot was built with embedding model '{self.embedding_model}', "
+                f"but '{settings.embedding_model}' is configured"
+            )
+
+    def load(self) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """埋め込み行列（メモリマップ）とメタデータの列を読み込む"""
+        with open(self.directory / self.METADATA_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        matrix = np.load(self.directory / self.EMBEDDINGS_FILE, mmap_mode="r")
+        if matrix.shape != (self.document_count, self.dimension):
+            raise ValueError(f"Index snapshot embeddings have unexpected shape {matrix.shape}")
+        if len(data["ids"]) != self.document_count:
+            raise ValueError(f"Index snapshot metadata is inconsistent in {self.directory}")
+        return matrix, data
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """チャンクのマニフェストを読み込む"""
+        with open(self.directory / self.MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore_manifest(self, path: Path) -> bool:
+        """チャンクのマニフェストを path に書き出す（同じバージョンが既にあれば何もしない）
+
+        差分インデックス化とデータのホットリロードはこのマニフェストを基準にするため、
+        スナップショットから起動したレプリカでも空のマニフェストから始めないようにする
+        """
+        manifest = self.load_manifest()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if json.load(f).get("version") == manifest.get("version"):
+                    return False
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        self._write_json(tmp_path, manifest)
+        os.replace(tmp_path, path)
+        logger.info(f"Restored index manifest {manifest.get('version')} to {path}")
+        return True
+
+    @classmethod
+    def _write_npy(cls, path: Path, raw_path: Path, shape: Tuple[int, int]) -> None:
+        """生のfloat32データに.npyヘッダーを付けて書き出す"""
+        header = {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+            "fortran_order": False,
+            "shape": shape,
+        }
+        with open(path, "wb") as f:
+            np.lib.format.write_array_header_1_0(f, header)
+            with open(raw_path, "rb") as raw:
+                shutil.copyfileobj(raw, f, cls.CHECKSUM_BLOCK_SIZE)
+        raw_path.unlink()
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def _checksum(cls, path: Path) -> str:
+        """ファイルのSHA-256を計算"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(cls.CHECKSUM_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _replace_directory(source: Path, target: Path) -> None:
+        """書き出し済みのディレクトリで既存のスナップショットを置き換える"""
+        previous: Optional[Path] = None
+        if target.exists():
+            previous = target.with_name(f".{target.name}.old")
+            shutil.rmtree(previous, ignore_errors=True)
+            os.replace(target, previous)
+        os.replace(source, target)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """行ベクトルをL2正規化"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
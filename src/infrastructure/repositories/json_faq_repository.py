@@ -1,59 +1,125 @@
 import json
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from config.settings import Settings
+from domain.entities.entity_changes import EntityChanges
 from domain.entities.faq import FAQ
 from domain.repositories.faq_repository import FAQRepository
+from infrastructure.repositories.json_stream_reader import (
+    ArrayKeyNotFoundError,
+    iter_json_records,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _FAQCatalog:
+    """読み込み済みのFAQと検索用のインデックス（作成後は変更しない）"""
+
+    faqs: Tuple[FAQ, ...]
+    by_id: Dict[str, FAQ]
+    by_category: Dict[str, Tuple[FAQ, ...]]
+    categories: Tuple[str, ...]
+
+    @classmethod
+    def build(cls, faqs: Iterable[FAQ]) -> "_FAQCatalog":
+        faqs = tuple(faqs)
+        grouped: Dict[str, List[FAQ]] = {}
+        for faq in faqs:
+            grouped.setdefault(faq.category, []).append(faq)
+
+        return cls(
+            faqs=faqs,
+            by_id={faq.faq_id: faq for faq in faqs},
+            by_category={category: tuple(items) for category, items in grouped.items()},
+            categories=tuple(sorted(grouped)),
+        )
+
+
 class JsonFAQRepository(FAQRepository):
     """JSONファイルからFAQデータを読み込むリポジトリ実装
 
     制限事項:
-    - ファイル更新の自動検知なし（アプリ再起動まで古いキャッシュを使用）
-    - 全FAQに差分があった場合、リアルタイム反映不可
+    - ファイル更新の検知は行わない（DataReloadService が監視し、load_changes /
+      apply_changes でキャッシュを置き換える）
     - プロトタイプ用途に適している
+
+    FAQ一覧・FAQ ID・カテゴリのインデックスは読み込み時に一度だけ作成し、
+    取得系のメソッドはコピーせずに不変のタプルを返す（ID・カテゴリでの取得はO(1)）。
+    再読み込み時はインデックスごと1つの参照で置き換えるため、読み出し側は常に
+    同じ時点のFAQ一覧とインデックスを参照する。
+    faq_fileの拡張子が .jsonl / .ndjson の場合はJSON Lines形式として読み込む
     """
 
     def __init__(self, settings: Settings):
         self.data_dir = Path(settings.data_directory)
         self.faq_file = settings.faq_file
-        self._faqs_cache: Optional[List[FAQ]] = None
-        self._categories_cache: Optional[List[str]] = None
+        self._catalog: Optional[_FAQCatalog] = None
 
-    def get_all_faqs(self) -> List[FAQ]:
+    @property
+    def source_path(self) -> Path:
+        """FAQデータファイルのパス"""
+        return self.data_dir / self.faq_file
+
+    def get_all_faqs(self) -> Sequence[FAQ]:
         """全てのFAQを取得
 
-        注意: ファイル変更があっても初回読み込み後はキャッシュを返す
-        リアルタイム更新が必要な場合はアプリケーション再起動が必要
+        注意: 初回読み込み後はキャッシュを返す（ファイルの変更は apply_changes まで反映されない）
+        """
+        return self._load_catalog().faqs
+
+    def get_faq_by_id(self, faq_id: str) -> Optional[FAQ]:
+        """FAQ IDでFAQを取得"""
+        return self._load_catalog().by_id.get(faq_id)
+
+    def iter_faqs(self) -> Iterator[FAQ]:
+        """FAQを1件ずつ逐次取得
+
+        キャッシュ未作成の場合はファイルをストリーミングで読み込み、キャッシュは作成しない
         """
-        if self._faqs_cache is not None:
-            return self._faqs_cache.copy()
+        if self._catalog is not None:
+            yield from self._catalog.faqs
+            return
 
         try:
-            file_path = self.data_dir / self.faq_file
-            if not file_path.exists():
-                raise FileNotFoundError(f"FAQ file not found: {file_path}")
+            yield from self._read_faqs()
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON file: {e}")
+            raise ValueError(f"Invalid JSON in FAQ file: {e}")
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+    def load_changes(self) -> EntityChanges[FAQ]:
+        """FAQファイルを再読み込みし、現在のキャッシュとの差分を取得"""
+        previous = self.get_all_faqs()
+        try:
+            current = tuple(self._read_faqs())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in FAQ file: {e}")
+        return EntityChanges.compute(previous, current, key=lambda faq: faq.faq_id)
 
-            if "faqs" not in data:
-                raise ValueError("Invalid FAQ file format: 'faqs' key not found")
+    def apply_changes(self, changes: EntityChanges[FAQ]) -> None:
+        """キャッシュとインデックスを再読み込み後のFAQで置き換える"""
+        self._catalog = _FAQCatalog.build(changes.entities)
+        logger.info(f"Reloaded {len(changes.entities)} FAQs ({changes.summary()})")
 
-            self._faqs_cache = [FAQ.from_dict(faq_data) for faq_data in data["faqs"]]
+    def _load_catalog(self) -> _FAQCatalog:
+        """FAQとインデックスを取得（初回のみファイルから読み込む）"""
+        catalog = self._catalog
+        if catalog is not None:
+            return catalog
 
-            categories = set(faq.category for faq in self._faqs_cache)
-            self._categories_cache = sorted(list(categories))
+        try:
+            catalog = _FAQCatalog.build(self._read_faqs())
+            self._catalog = catalog
 
             logger.info(
-                f"Loaded {len(self._faqs_cache)} FAQs with {len(self._categories_cache)} categories from {file_path}"
+                f"Loaded {len(catalog.faqs)} FAQs with {len(catalog.categories)} categories "
+                f"from {self.data_dir / self.faq_file}"
             )
-            return self._faqs_cache.copy()
+            return catalog
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON file: {e}")
@@ -62,15 +128,22 @@ class JsonFAQRepository(FAQRepository):
             logger.error(f"Failed to load FAQs: {e}")
             raise
 
-    def get_faqs_by_category(self, category: str) -> List[FAQ]:
+    def _read_faqs(self) -> Iterator[FAQ]:
+        """FAQファイルをストリーミングでパース"""
+        file_path = self.data_dir / self.faq_file
+        if not file_path.exists():
+            raise FileNotFoundError(f"FAQ file not found: {file_path}")
+
+        try:
+            for faq_data in iter_json_records(file_path, "faqs"):
+                yield FAQ.from_dict(faq_data)
+        except ArrayKeyNotFoundError:
+            raise ValueError("Invalid FAQ file format: 'faqs' key not found")
+
+    def get_faqs_by_category(self, category: str) -> Sequence[FAQ]:
         """カテゴリで絞り込みFAQを取得"""
-        faqs = self.get_all_faqs()
-        return [faq for faq in faqs if faq.category == category]
+        return self._load_catalog().by_category.get(category, ())
 
-    def get_categories(self) -> List[str]:
+    def get_categories(self) -> Sequence[str]:
         """利用可能なカテゴリ一覧を取得"""
-        if self._categories_cache is not None:
-            return self._categories_cache.copy()
-
-        self.get_all_faqs()
-        return self._categories_cache.copy() if self._categories_cache else []
+        return self._load_catalog().categories
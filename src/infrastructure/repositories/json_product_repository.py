@@ -1,55 +1,113 @@
 import json
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
 from config.settings import Settings
+from domain.entities.entity_changes import EntityChanges
 from domain.entities.product import Product
 from domain.repositories.product_repository import ProductRepository
+from infrastructure.repositories.json_stream_reader import (
+    ArrayKeyNotFoundError,
+    iter_json_records,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _ProductCatalog:
+    """読み込み済みの商品と商品IDのインデックス（作成後は変更しない）"""
+
+    products: Tuple[Product, ...]
+    by_id: Dict[str, Product]
+
+    @classmethod
+    def build(cls, products: Iterable[Product]) -> "_ProductCatalog":
+        products = tuple(products)
+        return cls(products=products, by_id={product.product_id: product for product in products})
+
+
 class JsonProductRepository(ProductRepository):
     """JSONファイルから商品データを読み込むリポジトリ実装
 
     制限事項:
-    - ファイル更新の自動検知なし（アプリ再起動まで古いキャッシュを使用）
-    - 全商品に差分があった場合、リアルタイム反映不可
+    - ファイル更新の検知は行わない（DataReloadService が監視し、load_changes /
+      apply_changes でキャッシュを置き換える）
     - プロトタイプ用途に適している
+
+    商品一覧と商品IDのインデックスは読み込み時に一度だけ作成し、get_all_products() は
+    コピーせずに不変のタプルを返す（商品IDでの取得はO(1)）。再読み込み時は
+    インデックスごと1つの参照で置き換えるため、取得済みのタプルは一貫した内容のまま読める。
+    products_fileの拡張子が .jsonl / .ndjson の場合はJSON Lines形式として読み込む
     """
 
     def __init__(self, settings: Settings):
         self.data_dir = Path(settings.data_directory)
         self.products_file = settings.products_file
-        self._products_cache: Optional[List[Product]] = None
+        self._catalog: Optional[_ProductCatalog] = None
+
+    @property
+    def source_path(self) -> Path:
+        """商品データファイルのパス"""
+        return self.data_dir / self.products_file
 
-    def get_all_products(self) -> List[Product]:
+    def get_all_products(self) -> Sequence[Product]:
         """すべての商品を取得
 
-        注意: ファイル変更があっても初回読み込み後はキャッシュを返す
-        リアルタイム更新が必要な場合はアプリケーション再起動が必要
+        注意: 初回読み込み後はキャッシュを返す（ファイルの変更は apply_changes まで反映されない）
         """
-        if self._products_cache is not None:
-            return self._products_cache
+        return self._load_catalog().products
+
+    def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        """商品IDで商品を取得"""
+        return self._load_catalog().by_id.get(product_id)
+
+    def iter_products(self) -> Iterator[Product]:
+        """商品を1件ずつ逐次取得
+
+        キャッシュ未作成の場合はファイルをストリーミングで読み込み、キャッシュは作成しない
+        """
+        if self._catalog is not None:
+            yield from self._catalog.products
+            return
 
         try:
-            file_path = self.data_dir / self.products_file
-            if not file_path.exists():
-                raise FileNotFoundError(f"Products file not found: {file_path}")
+            yield from self._read_products()
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON file: {e}")
+            raise ValueError(f"Invalid JSON in products file: {e}")
+
+    def load_changes(self) -> EntityChanges[Product]:
+        """商品ファイルを再読み込みし、現在のキャッシュとの差分を取得"""
+        previous = self.get_all_products()
+        try:
+            current = tuple(self._read_products())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in products file: {e}")
+        return EntityChanges.compute(previous, current, key=lambda product: product.product_id)
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+    def apply_changes(self, changes: EntityChanges[Product]) -> None:
+        """キャッシュとインデックスを再読み込み後の商品で置き換える"""
+        self._catalog = _ProductCatalog.build(changes.entities)
+        logger.info(f"Reloaded {len(changes.entities)} products ({changes.summary()})")
 
-            if "products" not in data:
-                raise ValueError("Invalid products file format: 'products' key not found")
+    def _load_catalog(self) -> _ProductCatalog:
+        """商品とインデックスを取得（初回のみファイルから読み込む）"""
+        catalog = self._catalog
+        if catalog is not None:
+            return catalog
 
-            self._products_cache = [
-                Product.from_dict(product_data) for product_data in data["products"]
-            ]
+        try:
+            catalog = _ProductCatalog.build(self._read_products())
+            self._catalog = catalog
 
-            logger.info(f"Loaded {len(self._products_cache)} products from {file_path}")
-            return self._products_cache
+            logger.info(
+                f"Loaded {len(catalog.products)} products from "
+                f"{self.data_dir / self.products_file}"
+            )
+            return catalog
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON file: {e}")
@@ -57,3 +115,15 @@ class JsonProductRepository(ProductRepository):
         except Exception as e:
             logger.error(f"Failed to load products: {e}")
             raise
+
+    def _read_products(self) -> Iterator[Product]:
+        """商品ファイルをストリーミングでパース"""
+        file_path = self.data_dir / self.products_file
+        if not file_path.exists():
+            raise FileNotFoundError(f"Products file not found: {file_path}")
+
+        try:
+            for product_data in iter_json_records(file_path, "products"):
+                yield Product.from_dict(product_data)
+        except ArrayKeyNotFoundError:
+            raise ValueError("Invalid products file format: 'products' key not found")
@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+
+
+class ArrayKeyNotFoundError(ValueError):
+    """指定キーの配列がJSONに存在しない"""
+
+
+def iter_json_records(file_path: Path, array_key: str) -> Iterator[Any]:
+    """JSON / JSON Linesファイルからレコードを逐次読み出す
+
+    - JSON Lines（.jsonl / .ndjson）: 1行1レコード
+    - JSON: トップレベルオブジェクトの array_key 配列の要素
+    """
+    if file_path.suffix.lower() in JSON_LINES_SUFFIXES:
+        return _iter_json_lines(file_path)
+    return iter(JsonArrayStreamReader(file_path, array_key))
+
+
+def _iter_json_lines(file_path: Path) -> Iterator[Any]:
+    """JSON Linesファイルを1行ずつ読み出す"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(
+                    f"Invalid JSON at line {line_number}: {e.msg}", e.doc, e.pos
+                )
+
+
+class JsonArrayStreamReader:
+    """JSONファイル内の配列要素を逐次パースするリーダー
+
+    ファイル全体を読み込まず、一定サイズずつ読みながら
+    トップレベルオブジェクトの指定キーの配列要素を1件ずつ返す
+    """
+
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, file_path: Path, array_key: str, chunk_size: int = 1 << 16):
+        self.file_path = file_path
+        self.array_key = array_key
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+
+    def __iter__(self) -> Iterator[Any]:
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            self._file = f
+            self._buffer = ""
+            self._pos = 0
+            self._eof = False
+
+            self._expect("{")
+            while True:
+                if self._peek() == "}":
+                    break
+
+                key = self._decode()
+                self._expect(":")
+
+                if key == self.array_key:
+                    yield from self._iter_array()
+                    return
+
+                self._decode()
+                if self._peek() == ",":
+                    self._pos += 1
+                else:
+                    break
+
+        raise ArrayKeyNotFoundError(f"'{self.array_key}' key not found in {self.file_path}")
+
+    def _iter_array(self) -> Iterator[Any]:
+        """配列要素を1件ずつ返す"""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self._decode()
+            char = self._peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error(f"Expecting ',' or ']' but found {char!r}")
+
+    def _fill(self) -> bool:
+        """バッファにデータを追加読み込み（EOFならFalse）"""
+        if self._eof:
+            return False
+
+        if self._pos > self.chunk_size:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+        data = self._file.read(self.chunk_size)
+        if not data:
+            self._eof = True
+            return False
+        self._buffer += data
+        return True
+
+    def _peek(self) -> str:
+        """空白を読み飛ばし、次の文字を返す（EOFなら空文字）"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str) -> None:
+        """指定の文字を読み進める"""
+        char = self._peek()
+        if char != expected:
+            raise self._error(f"Expecting {expected!r} but found {char!r}")
+        self._pos += 1
+
+    def _decode(self) -> Any:
+        """現在位置のJSON値を1つデコード（不足分は追加読み込み）"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # バッファ末尾で終わる値（数値等）は途中で切れている可能性がある
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
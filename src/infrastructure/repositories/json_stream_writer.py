@@ -0,0 +1,44 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from infrastructure.repositories.json_stream_reader import JSON_LINES_SUFFIXES
+
+
+def write_json_records(file_path: Path, array_key: str, records: Iterable[Any]) -> int:
+    """レコードを逐次JSON / JSON Linesファイルに書き出し、書き出した件数を返す
+
+    iter_json_records と対になる形式で書き出す（レコード全体をメモリに保持しない）
+    - JSON Lines（.jsonl / .ndjson）: 1行1レコード
+    - JSON: トップレベルオブジェクトの array_key 配列の要素
+
+    一時ファイルに書き出してから置き換えるため、途中で失敗しても既存ファイルは壊れない
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    json_lines = file_path.suffix.lower() in JSON_LINES_SUFFIXES
+
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if not json_lines:
+                f.write("{" + json.dumps(array_key) + ": [")
+
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False)
+                if json_lines:
+                    f.write(line + "\n")
+                else:
+                    f.write(("," if count else "") + "\n  " + line)
+                count += 1
+
+            if not json_lines:
+                f.write("\n]}\n")
+
+        os.replace(tmp_path, file_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return count
@@ -0,0 +1,625 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import Settings
+from domain.entities.indexed_documents import IndexedDocuments
+from domain.entities.query_result import Document
+from domain.entities.search_filter import SearchFilter
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.embeddings.embedding_factory import (
+    create_embedding_pipeline,
+    create_embeddings,
+    flush_embeddings,
+)
+from infrastructure.embeddings.embedding_pipeline import EmbeddedBatch
+from infrastructure.embeddings.query_embedding_cache import embed_queries
+from infrastructure.repositories.index_snapshot import IndexSnapshot
+from infrastructure.search.ivf_index import IVFIndex
+from infrastructure.search.metadata_index import MetadataIndex
+from infrastructure.search.quantized_vectors import QuantizedVectors
+from infrastructure.tracing.cost import estimate_cost
+from infrastructure.tracing.tracer import get_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyVectorSearchRepository(VectorSearchRepository):
+    """NumPyを使用したインプロセスのベクトル検索リポジトリ実装
+
+    L2正規化済みのfloat32埋め込みを行列として保持し、検索はクエリとの
+    行列積1回とargpartitionで上位k件を求める（全件の厳密なk近傍探索）。
+    スコアはChromaと同様に小さいほど類似する距離（1 - コサイン類似度）を返す。
+    フィルター指定時は二次インデックス（MetadataIndex）で候補行を絞り込んでから
+    候補行のみとの類似度を計算する。
+
+    numpy_index_type="ivf" の場合は、転置ファイル（IVFIndex）で近いクラスタの行のみを
+    候補とする近似探索を行う（ivf_nlist / ivf_nprobe で再現率と速度を調整する）。
+    IVFは初回の検索時に学習し、行数が少ない間や候補が n_results 件に満たない場合は
+    全件を探索する
+
+    vector_quantization / vector_quantization_dimensions を指定した場合は、検索用に
+    量子化（float16 / int8 / binary）・次元を切り詰めたコード（QuantizedVectors）を
+    メモリ上に保持し、近似スコアの上位 n_results * vector_rescore_multiplier 件のみを
+    全精度の埋め込みで再スコアリングする（0の場合は近似スコアのまま返す）。
+    全精度の行列は保存後にメモリマップへ戻し、再スコアリングする行のみを読む
+
+    永続化形式（index_directory 配下）:
+    - embeddings.npy: 埋め込み行列（読み込み時はメモリマップ）
+    - metadata.json: ID・本文・メタデータをキーごとの列として保持するサイドカー
+
+    index_snapshot_directory を指定した場合は、保存先の代わりにインデックスの
+    スナップショット（IndexSnapshot）をチェックサムと埋め込みモデルを検証してから
+    メモリマップで読み込み、チャンクのマニフェストも復元する。
+    読み込み後の変更は index_directory に保存され、再起動時はスナップショットより新しければ
+    index_directory から読み込む
+
+    追加・削除は行を移動しながらその場で書き換えるため、検索（候補行の絞り込みから
+    ドキュメントの復元まで）と書き込みはロックで直列化し、バックグラウンドの
+    再インデックス中も各クエリが一貫した状態のインデックスを読むようにする
+    """
+
+    EMBEDDINGS_FILE = "embeddings.npy"
+    METADATA_FILE = "metadata.json"
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, settings: Settings, embeddings: Optional[Embeddings] = None):
+        self.settings = settings
+        try:
+            self.embeddings = embeddings or create_embeddings(settings)
+            self.embedding_pipeline = create_embedding_pipeline(settings, self.embeddings)
+            self.index_directory = self._resolve_index_directory(settings)
+
+            self._matrix: Optional[np.ndarray] = None
+            self._size = 0
+            self._ids: List[str] = []
+            self._texts: List[str] = []
+            self._columns: Dict[str, List[Any]] = {}
+            self._id_to_row: Dict[str, int] = {}
+            self._dirty = False
+            self._metadata_index = MetadataIndex(self._columns, self._size)
+            self._metadata_index_stale = False
+            self._ivf = self._create_ivf_index(settings)
+            self._quantized = self._create_quantized_vectors(settings)
+            self._lock = threading.RLock()
+
+            self._load()
+            logger.info(
+                f"Initialized NumPy vector index at {self.index_directory} "
+                f"({self._size} documents)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize NumPy vector index: {e}")
+            raise RuntimeError(f"Failed to initialize vector search: {e}")
+
+    @staticmethod
+    def _create_ivf_index(settings: Settings) -> Optional[IVFIndex]:
+        """設定に応じてIVFインデックスを生成（全件探索の場合はNone）"""
+        if settings.numpy_index_type == "flat":
+            return None
+        if settings.numpy_index_type == "ivf":
+            return IVFIndex(nlist=settings.ivf_nlist, nprobe=settings.ivf_nprobe)
+        raise ValueError(f"Unknown numpy index type: {settings.numpy_index_type}")
+
+    @staticmethod
+    def _create_quantized_vectors(settings: Settings) -> Optional[QuantizedVectors]:
+        """設定に応じて検索用の量子化コードを生成（量子化も次元の切り詰めもしない場合はNone）"""
+        if settings.vector_rescore_multiplier < 0:
+            raise ValueError("vector_rescore_multiplier must not be negative")
+        if settings.vector_quantization == "none" and not settings.vector_quantization_dimensions:
+            return None
+        return QuantizedVectors(
+            settings.vector_quantization, settings.vector_quantization_dimensions
+        )
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """検索時にメモリ上で走査するベクトルのバイト数（全精度との比較）"""
+        dimension = 0 if self._matrix is None else self._matrix.shape[1]
+        full_precision_bytes = self._size * dimension * 4
+        search_bytes = (
+            full_precision_bytes if self._quantized is None else self._quantized.memory_bytes()
+        )
+        return {
+            "vectors": self._size,
+            "dimension": dimension,
+            "quantization": "none" if self._quantized is None else self._quantized.name,
+            "full_precision_bytes": full_precision_bytes,
+            "search_bytes": search_bytes,
+            "compression_ratio": (full_precision_bytes / search_bytes if search_bytes else 1.0),
+        }
+
+    def set_nprobe(self, nprobe: int) -> None:
+        """IVFの検索時に探索するクラスタ数を変更（再学習は不要）"""
+        if self._ivf is None:
+            raise ValueError("nprobe requires numpy_index_type='ivf'")
+        if nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+        self._ivf.nprobe = nprobe
+
+    @staticmethod
+    def _resolve_index_directory(settings: Settings) -> Path:
+        """インデックスの保存先を決定"""
+        if settings.numpy_index_directory:
+            return Path(settings.numpy_index_directory)
+        return Path(settings.chroma_persist_directory) / f"{settings.chroma_collection_name}_numpy"
+
+    @staticmethod
+    def _manifest_path(settings: Settings) -> Path:
+        """チャンクのマニフェストの保存先（IndexManifest.path_for と同じ場所）"""
+        return (
+            Path(settings.chroma_persist_directory)
+            / f"{settings.chroma_collection_name}_manifest.json"
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_documents(
+        self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]
+    ) -> None:
+        """ドキュメントをインデックスに追加（同一IDは置き換え）"""
+        try:
+            if len(texts) != len(metadatas) or len(texts) != len(ids):
+                raise ValueError("texts, metadatas, and ids must have the same length")
+
+            self.embedding_pipeline.run(zip(ids, texts, metadatas), self._write_batch)
+            logger.info(f"Added {len(texts)} documents to NumPy vector index")
+        except Exception as e:
+            logger.error(f"Failed to add documents: {e}")
+            raise RuntimeError(f"Failed to add documents to vector DB: {e}")
+
+    def _write_batch(self, batch: EmbeddedBatch) -> None:
+        """埋め込み済みバッチを行列と列データに書き込む"""
+        vectors = self._normalize(np.asarray(batch.embeddings, dtype=np.float32))
+        with self._lock:
+            self._ensure_capacity(self._size + len(batch.ids), vectors.shape[1])
+            assert self._matrix is not None
+
+            written_rows = []
+            for doc_id, text, metadata, vector in zip(
+                batch.ids, batch.texts, batch.metadatas, vectors
+            ):
+                row = self._id_to_row.get(doc_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._id_to_row[doc_id] = row
+                    self._ids.append(doc_id)
+                    self._texts.append(text)
+                    for column in self._columns.values():
+                        column.append(None)
+                else:
+                    self._texts[row] = text
+                    for column in self._columns.values():
+                        column[row] = None
+
+                self._matrix[row] = vector
+                written_rows.append(row)
+                for key, value in metadata.items():
+                    if key not in self._columns:
+                        self._columns[key] = [None] * self._size
+                    self._columns[key][row] = value
+
+            if self._ivf is not None:
+                self._ivf.update(np.asarray(written_rows), vectors)
+            if self._quantized is not None:
+                self._quantized.update(np.asarray(written_rows), vectors)
+            self._dirty = True
+            self._metadata_index_stale = True
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """指定IDのドキュメントを削除（末尾の行を空いた位置へ移動する）"""
+        try:
+            deleted = 0
+            with self._lock:
+                for doc_id in ids:
+                    row = self._id_to_row.pop(doc_id, None)
+                    if row is None:
+                        continue
+
+                    self._ensure_writable()
+                    assert self._matrix is not None
+                    last = self._size - 1
+                    if row != last:
+                        self._matrix[row] = self._matrix[last]
+                        self._ids[row] = self._ids[last]
+                        self._texts[row] = self._texts[last]
+                        for column in self._columns.values():
+                            column[row] = column[last]
+                        self._id_to_row[self._ids[row]] = row
+                    if self._ivf is not None:
+                        self._ivf.move_row(last, row)
+                    if self._quantized is not None:
+                        self._quantized.move_row(last, row)
+
+                    self._ids.pop()
+                    self._texts.pop()
+                    for column in self._columns.values():
+                        column.pop()
+                    self._size -= 1
+                    deleted += 1
+
+                if deleted:
+                    self._dirty = True
+                    self._metadata_index_stale = True
+                logger.info(f"Deleted {deleted} documents from NumPy vector index")
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise RuntimeError(f"Failed to delete documents from vector DB: {e}")
+
+    def search(
+        self, query: str, n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[Document]:
+        """類似度検索を実行"""
+        try:
+            if not query or not query.strip():
+                raise ValueError("Query cannot be empty")
+
+            documents = self.search_many([query], n_results, filters)[0]
+            logger.info(f"Found {len(documents)} documents for query: {query[:50]}...")
+            return documents
+
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise RuntimeError(f"Failed to search documents: {e}")
+
+    def search_batch(
+        self, queries: List[str], n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[List[Document]]:
+        """複数クエリの類似度検索をまとめて実行"""
+        try:
+            results = self.search_many(queries, n_results, filters)
+            logger.info(f"Batch search completed for {len(queries)} queries")
+            return results
+
+        except Exception as e:
+            logger.error(f"Batch search failed: {e}")
+            raise RuntimeError(f"Failed to search documents: {e}")
+
+    def search_many(
+        self, queries: List[str], n_results: int = 3, filters: Optional[SearchFilter] = None
+    ) -> List[List[Document]]:
+        """複数クエリの類似度検索を1回の行列積でまとめて実行"""
+        if n_results < 1:
+            raise ValueError("n_results must be at least 1")
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+
+        if not queries:
+            return []
+        if self._size == 0 or self._matrix is None:
+            return [[] for _ in queries]
+
+        # 埋め込みAPIの呼び出し中に書き込みを止めないよう、クエリの埋め込みはロックの外で行う
+        query_vectors = self._normalize(np.asarray(self._embed_queries(queries), dtype=np.float32))
+
+        with self._lock:
+            if self._size == 0 or self._matrix is None:
+                return [[] for _ in queries]
+
+            candidate_rows: Optional[np.ndarray] = None
+            if filters is not None and not filters.is_empty:
+                with get_tracer().span("metadata_filter", filter=str(filters)) as span:
+                    candidate_rows = self._filter_rows(filters)
+                    span.set_attribute("candidates", len(candidate_rows))
+                if len(candidate_rows) == 0:
+                    return [[] for _ in queries]
+
+            if self._ivf is not None and self._ensure_ivf_trained():
+                with get_tracer().span(
+                    "vector_search", backend="numpy", index="ivf", queries=len(queries)
+                ):
+                    return [
+                        self._search_ivf(query_vector, n_results, candidate_rows)
+                        for query_vector in query_vectors
+                    ]
+
+            with get_tracer().span("vector_search", backend="numpy", queries=len(queries)):
+                return self._rank_rows(query_vectors, candidate_rows, n_results)
+
+    def _rank_rows(
+        self, query_vectors: np.ndarray, rows: Optional[np.ndarray], n_results: int
+    ) -> List[List[Document]]:
+        """候補行（Noneは全行）から各クエリに類似する上位 n_results 件を取得
+
+        ロック取得済みで呼ぶ
+        """
+        assert self._matrix is not None
+        if self._quantized is not None:
+            return self._rank_quantized(query_vectors, rows, n_results)
+
+        candidates = self._matrix[: self._size] if rows is None else self._matrix[rows]
+        similarities = query_vectors @ candidates.T
+        top_columns = self._top_columns(similarities, n_results)
+
+        results = []
+        for query_index, columns in enumerate(top_columns):
+            scores = similarities[query_index, columns]
+            order = np.argsort(-scores, kind="stable")
+            top_rows = columns if rows is None else rows[columns]
+            results.append(
+                [self._to_document(int(top_rows[i]), 1.0 - float(scores[i])) for i in order]
+            )
+        return results
+
+    def _rank_quantized(
+        self, query_vectors: np.ndarray, rows: Optional[np.ndarray], n_results: int
+    ) -> List[List[Document]]:
+        """量子化コードの近似スコアで候補を絞り込み、全精度の埋め込みで再スコアリング"""
+        assert self._quantized is not None and self._matrix is not None
+        approximate = self._quantized.similarities(
+            self._quantized.prepare_queries(query_vectors), rows
+        )
+        multiplier = self.settings.vector_rescore_multiplier
+        top_columns = self._top_columns(approximate, n_results * max(multiplier, 1))
+
+        results = []
+        for query_index, columns in enumerate(top_columns):
+            candidate_rows = columns if rows is None else rows[columns]
+            if multiplier > 0:
+                scores = self._matrix[candidate_rows] @ query_vectors[query_index]
+            else:
+                scores = approximate[query_index, columns]
+            k = min(n_results, len(scores))
+            order = np.argsort(-scores, kind="stable")[:k]
+            results.append(
+                [self._to_document(int(candidate_rows[i]), 1.0 - float(scores[i])) for i in order]
+            )
+        return results
+
+    @staticmethod
+    def _top_columns(similarities: np.ndarray, k: int) -> np.ndarray:
+        """類似度行列の各行で値が大きい上位 k 列を取得（順不同）"""
+        num_candidates = similarities.shape[1]
+        k = min(k, num_candidates)
+        if k < num_candidates:
+            return np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        return np.tile(np.arange(num_candidates), (len(similarities), 1))
+
+    def _ensure_ivf_trained(self) -> bool:
+        """必要に応じてIVFを（再）学習し、近似探索を使えるかを返す（ロック取得済みで呼ぶ）"""
+        assert self._ivf is not None and self._matrix is not None
+        if self._ivf.needs_training(self._size):
+            self._ivf.train(self._matrix[: self._size])
+        return self._ivf.trained
+
+    def _search_ivf(
+        self, query_vector: np.ndarray, n_results: int, candidate_rows: Optional[np.ndarray]
+    ) -> List[Document]:
+        """IVFで近いクラスタの行のみと類似度を計算（ロック取得済みで呼ぶ）"""
+        assert self._ivf is not None and self._matrix is not None
+        rows = self._ivf.probe(query_vector)
+        if candidate_rows is not None:
+            rows = np.intersect1d(rows, candidate_rows, assume_unique=True)
+        if len(rows) < n_results:
+            # 探索したクラスタに十分な候補がない場合は全件（フィルターの候補行）を探索する
+            rows = candidate_rows
+        return self._rank_rows(query_vector[np.newaxis, :], rows, n_results)[0]
+
+    def _filter_rows(self, filters: SearchFilter) -> np.ndarray:
+        """二次インデックスを使い、フィルターを満たす行番号を取得"""
+        if self._metadata_index_stale:
+            self._metadata_index.invalidate(self._columns, self._size)
+            self._metadata_index_stale = False
+        return self._metadata_index.candidate_rows(filters)
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """クエリを埋め込み（トークン数と概算コストをスパンに記録）
+
+        クエリ埋め込みのキャッシュにヒットしたクエリはAPIを呼ばないため、トークン数に含めない
+        """
+        with get_tracer().span("query_embedding", model=self.settings.embedding_model) as span:
+            vectors, embedded = embed_queries(self.embeddings, queries)
+
+            tokens = sum(self.embedding_pipeline.token_counter.count(query) for query in embedded)
+            span.set_attribute("cache_hits", len(queries) - len(embedded))
+            span.set_attribute("tokens", tokens)
+            span.set_attribute(
+                "estimated_cost_usd", estimate_cost(self.settings.embedding_model, tokens)
+            )
+        return vectors
+
+    def delete_collection(self) -> None:
+        """インデックスを削除"""
+        try:
+            self._matrix = None
+            self._size = 0
+            self._ids = []
+            self._texts = []
+            self._columns = {}
+            self._id_to_row = {}
+            self._dirty = False
+            self._metadata_index_stale = True
+            if self._ivf is not None:
+                self._ivf.reset()
+            if self._quantized is not None:
+                self._quantized.reset()
+
+            if self.index_directory.exists():
+                shutil.rmtree(self.index_directory)
+            logger.info(f"Deleted NumPy vector index: {self.index_directory}")
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            raise RuntimeError(f"Failed to delete collection: {e}")
+
+    def persist(self) -> None:
+        """埋め込み行列とメタデータ（と埋め込みキャッシュ）をディスクに書き出す"""
+        with self._lock:
+            self._persist()
+        flush_embeddings(self.embeddings)
+
+    def _persist(self) -> None:
+        if not self._dirty:
+            return
+
+        self.index_directory.mkdir(parents=True, exist_ok=True)
+        matrix = (
+            self._matrix[: self._size]
+            if self._matrix is not None
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+
+        embeddings_path = self.index_directory / self.EMBEDDINGS_FILE
+        tmp_embeddings_path = embeddings_path.with_suffix(".npy.tmp")
+        with open(tmp_embeddings_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix))
+
+        metadata_path = self.index_directory / self.METADATA_FILE
+        tmp_metadata_path = metadata_path.with_suffix(".json.tmp")
+        with open(tmp_metadata_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"ids": self._ids, "texts": self._texts, "columns": self._columns},
+                f,
+                ensure_ascii=False,
+            )
+
+        os.replace(tmp_embeddings_path, embeddings_path)
+        os.replace(tmp_metadata_path, metadata_path)
+        self._dirty = False
+        if self._quantized is not None and self._size:
+            # 検索は量子化コードで行うため、全精度の行列はメモリマップに戻してメモリを解放する
+            self._matrix = np.load(embeddings_path, mmap_mode="r")
+
+        logger.info(
+            f"Saved NumPy vector index with {self._size} documents to {self.index_directory}"
+        )
+
+    def iter_indexed_documents(self, batch_size: int = 1000) -> Iterator[IndexedDocuments]:
+        """登録済みのドキュメントを埋め込みとともに batch_size 件ずつ取得"""
+        for start in range(0, self._size, batch_size):
+            end = min(start + batch_size, self._size)
+            assert self._matrix is not None
+            yield IndexedDocuments(
+                ids=self._ids[start:end],
+                texts=self._texts[start:end],
+                metadatas=[
+                    {
+                        key: column[row]
+                        for key, column in self._columns.items()
+                        if column[row] is not None
+                    }
+                    for row in range(start, end)
+                ],
+                embeddings=self._matrix[start:end],
+            )
+
+    def _load(self) -> None:
+        """保存済みのインデックスを読み込む（埋め込み行列はメモリマップ）
+
+        スナップショットの指定時も、スナップショットより後に保存したインデックス
+        （読み込み後の追加・削除）があればそちらを読み込む
+        """
+        embeddings_path = self.index_directory / self.EMBEDDINGS_FILE
+        metadata_path = self.index_directory / self.METADATA_FILE
+        saved = embeddings_path.exists() and metadata_path.exists()
+
+        if self.settings.index_snapshot_directory:
+            snapshot_directory = Path(self.settings.index_snapshot_directory)
+            if not saved or not self._saved_after_snapshot(metadata_path, snapshot_directory):
+                self._load_snapshot(snapshot_directory)
+                return
+            logger.info(
+                f"Loading {self.index_directory} instead of index snapshot {snapshot_directory} "
+                f"(saved after the snapshot)"
+            )
+
+        if not saved:
+            return
+
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        matrix = np.load(embeddings_path, mmap_mode="r")
+        if matrix.ndim != 2 or matrix.shape[0] != len(data["ids"]):
+            raise ValueError(f"Embeddings and metadata are inconsistent in {self.index_directory}")
+
+        self._set_index(matrix, data)
+
+    @staticmethod
+    def _saved_after_snapshot(metadata_path: Path, snapshot_directory: Path) -> bool:
+        """保存済みのインデックスがスナップショットの作成・配置より後に書き出されたか"""
+        info_path = snapshot_directory / IndexSnapshot.INFO_FILE
+        if not info_path.exists():
+            return False
+        return metadata_path.stat().st_mtime_ns > info_path.stat().st_mtime_ns
+
+    def _load_snapshot(self, directory: Path) -> None:
+        """インデックスのスナップショットを検証して読み込む"""
+        start = time.perf_counter()
+        snapshot = IndexSnapshot.open(
+            directory, verify_checksum=self.settings.index_snapshot_verify
+        )
+        snapshot.check_compatible(self.settings)
+        matrix, data = snapshot.load()
+        self._set_index(matrix, data)
+        snapshot.restore_manifest(self._manifest_path(self.settings))
+        logger.info(
+            f"Loaded index snapshot from {directory} ({snapshot.document_count} documents, "
+            f"{snapshot.embedding_model}, {(time.perf_counter() - start) * 1000:.1f}ms)"
+        )
+
+    def _set_index(self, matrix: np.ndarray, data: Dict[str, Any]) -> None:
+        """読み込んだ埋め込み行列と列データをインデックスとして設定"""
+        self._matrix = matrix
+        self._size = matrix.shape[0]
+        self._ids = data["ids"]
+        self._texts = data["texts"]
+        self._columns = data["columns"]
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._metadata_index_stale = True
+        if self._ivf is not None:
+            self._ivf.reset()
+        if self._quantized is not None:
+            self._quantized.build(matrix)
+
+    def _ensure_capacity(self, required: int, dimension: int) -> None:
+        """行列が書き込み可能かつ required 行を格納できるように拡張"""
+        if self._matrix is not None and self._matrix.shape[1] != dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: index has {self._matrix.shape[1]}, got {dimension}"
+            )
+
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if required <= capacity and self._is_writable():
+            return
+
+        new_capacity = max(capacity, self.INITIAL_CAPACITY)
+        while new_capacity < required:
+            new_capacity *= 2
+
+        matrix = np.empty((new_capacity, dimension), dtype=np.float32)
+        if self._matrix is not None and self._size:
+            matrix[: self._size] = self._matrix[: self._size]
+        self._matrix = matrix
+
+    def _ensure_writable(self) -> None:
+        """メモリマップされた読み取り専用の行列をメモリ上にコピー"""
+        if self._matrix is not None and not self._is_writable():
+            self._matrix = np.array(self._matrix[: self._size], dtype=np.float32)
+
+    def _is_writable(self) -> bool:
+        return self._matrix is not None and bool(self._matrix.flags.writeable)
+
+    def _to_document(self, row: int, score: float) -> Document:
+        """行番号からドキュメントを復元"""
+        metadata = {
+            key: column[row] for key, column in self._columns.items() if column[row] is not None
+        }
+        return Document(
+            page_content=self._texts[row], metadata=metadata, score=score, doc_id=self._ids[row]
+        )
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """行ベクトルをL2正規化"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
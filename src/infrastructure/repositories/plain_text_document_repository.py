@@ -0,0 +1,42 @@
+import logging
+from pathlib import Path
+from typing import Iterator
+
+from config.settings import Settings
+from domain.repositories.text_document_repository import TextDocumentRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PlainTextDocumentRepository(TextDocumentRepository):
+    """プレーンテキストファイル（サポート情報等）を読み込むリポジトリ実装
+
+    ファイルは読み込みのたびに先頭から1行ずつ読むため、キャッシュは持たない
+    """
+
+    def __init__(self, settings: Settings):
+        self.data_dir = Path(settings.data_directory)
+        self.support_file = settings.support_file
+
+    @property
+    def document_id(self) -> str:
+        return Path(self.support_file).stem
+
+    @property
+    def source_path(self) -> Path:
+        """文書ファイルのパス"""
+        return self.data_dir / self.support_file
+
+    def iter_lines(self) -> Iterator[str]:
+        """文書を1行ずつ逐次取得"""
+        file_path = self.source_path
+        if not file_path.exists():
+            raise FileNotFoundError(f"Support document not found: {file_path}")
+
+        line_count = 0
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line_count += 1
+                yield line.rstrip("\r\n")
+
+        logger.info(f"Read {line_count} lines from {file_path}")
@@ -0,0 +1,47 @@
+import logging
+from typing import Optional
+
+from langchain_core.embeddings import Embeddings
+
+from config.settings import Settings
+from domain.repositories.vector_search_repository import VectorSearchRepository
+from infrastructure.repositories.hybrid_search_repository import HybridSearchRepository
+from infrastructure.repositories.numpy_vector_search_repository import NumpyVectorSearchRepository
+
+logger = logging.getLogger(__name__)
+
+
+def create_vector_search_repository(
+    settings: Settings, embeddings: Optional[Embeddings] = None
+) -> VectorSearchRepository:
+    """設定に応じて検索リポジトリを生成（ハイブリッド検索有効時はBM25と組み合わせる）
+
+    vector_backend で "chroma"（既定）または "numpy"（インプロセスのNumPy行列）を選択する。
+    index_snapshot_directory を指定した場合は、スナップショットをメモリマップで読み込む
+    NumPyバックエンドを使用する（再インデックスなしで起動できる）
+
+    embeddingsを渡すと、他のコンポーネントと同じ埋め込みクライアント（キャッシュ）を共有する
+    """
+    vector_repo: VectorSearchRepository
+    if settings.index_snapshot_directory:
+        if settings.vector_backend != "numpy":
+            logger.info(
+                f"Serving index snapshot {settings.index_snapshot_directory} "
+                f"with the numpy backend instead of {settings.vector_backend}"
+            )
+        vector_repo = NumpyVectorSearchRepository(settings, embeddings)
+    elif settings.vector_backend == "chroma":
+        # chromadbの読み込みは重いため、Chromaバックエンドを使う場合のみインポートする
+        from infrastructure.repositories.chroma_vector_search_repository import (
+            ChromaVectorSearchRepository,
+        )
+
+        vector_repo = ChromaVectorSearchRepository(settings, embeddings)
+    elif settings.vector_backend == "numpy":
+        vector_repo = NumpyVectorSearchRepository(settings, embeddings)
+    else:
+        raise ValueError(f"Unknown vector backend: {settings.vector_backend}")
+
+    if settings.hybrid_search_enabled:
+        return HybridSearchRepository(vector_repo, settings)
+    return vector_repo
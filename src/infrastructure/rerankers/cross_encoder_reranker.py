@@ -0,0 +1,50 @@
+import logging
+from typing import Any, List, Optional
+
+from domain.services.reranker import Reranker
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker(Reranker):
+    """ローカルのクロスエンコーダーモデルによるリランカー
+
+    sentence-transformers の CrossEncoder でクエリと文書の組を直接スコアリングする。
+    sentence-transformers はオプションの依存関係のため、インストールされていない場合は
+    初期化時にエラーとする
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 16, device: Optional[str] = None):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model: Any = self._load_model(model_name, device)
+
+    @property
+    def name(self) -> str:
+        return f"cross_encoder:{self.model_name}"
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """クエリと各文書の関連スコアをモデルで計算"""
+        if not texts:
+            return []
+
+        scores = self._model.predict(
+            [(query, text) for text in texts],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        )
+        return [float(score) for score in scores]
+
+    @staticmethod
+    def _load_model(model_name: str, device: Optional[str]) -> Any:
+        """クロスエンコーダーモデルを読み込む"""
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise RuntimeError(
+                "sentence-transformers is required for the cross-encoder reranker "
+                "(pip install sentence-transformers)"
+            )
+
+        logger.info(f"Loading cross-encoder model: {model_name}")
+        return CrossEncoder(model_name, device=device)
@@ -0,0 +1,39 @@
+from collections import Counter
+from typing import List
+
+from domain.services.reranker import Reranker
+from infrastructure.search.bm25_index import tokenize
+
+
+class LexicalReranker(Reranker):
+    """語彙の一致に基づく決定的なリランカー
+
+    クエリの各トークン（英数字語・日本語bigram）が文書に現れる頻度を
+    tf / (tf + k1) で飽和させて合計し、クエリのトークン数で正規化する（0〜1）。
+    外部モデルを必要とせず、同じ入力には常に同じスコアを返すため、
+    テストやオフラインでの評価に用いる
+    """
+
+    def __init__(self, k1: float = 1.2):
+        self.k1 = k1
+
+    @property
+    def name(self) -> str:
+        return "lexical"
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """クエリと各文書の語彙一致スコアを計算"""
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return [0.0] * len(texts)
+
+        scores = []
+        for text in texts:
+            term_freqs = Counter(tokenize(text))
+            total = sum(
+                term_freqs[term] / (term_freqs[term] + self.k1)
+                for term in query_terms
+                if term in term_freqs
+            )
+            scores.append(total / len(query_terms))
+        return scores
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from config.settings import Settings
+from domain.services.reranker import Reranker
+from infrastructure.rerankers.cross_encoder_reranker import CrossEncoderReranker
+from infrastructure.rerankers.lexical_reranker import LexicalReranker
+
+
+def create_reranker(settings: Settings) -> Optional[Reranker]:
+    """設定に応じてリランカーを生成（無効の場合はNone）"""
+    if settings.reranker == "none":
+        return None
+    if settings.reranker == "lexical":
+        return LexicalReranker()
+    if settings.reranker == "cross_encoder":
+        return CrossEncoderReranker(
+            settings.cross_encoder_model, batch_size=settings.rerank_batch_size
+        )
+    raise ValueError(f"Unknown reranker: {settings.reranker}")
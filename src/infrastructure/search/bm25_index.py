@@ -0,0 +1,223 @@
+import json
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_ASCII_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+_NON_ASCII_RUN_PATTERN = re.compile(
+    r"[^\x00-\x7f\s、。・，．！？「」『』（）()【】\[\]：:；;／/～~※■]+"
+)
+
+
+def tokenize(text: str, ngram_size: int = 2) -> List[str]:
+    """BM25用のトークン列を生成
+
+    - 英数字（商品ID・型番・仕様値）は "we-001" "5.3" のように1語として扱う
+    - 日本語などの非ASCII部分は文字n-gram（既定はbigram）に分割する
+    """
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens = _ASCII_TOKEN_PATTERN.findall(normalized)
+
+    for run in _NON_ASCII_RUN_PATTERN.findall(normalized):
+        if len(run) < ngram_size:
+            tokens.append(run)
+            continue
+        tokens.extend(run[i : i + ngram_size] for i in range(len(run) - ngram_size + 1))
+
+    return tokens
+
+
+class BM25Index:
+    """ディスク永続化可能なBM25転置インデックス
+
+    ドキュメント本文とメタデータも保持し、語彙検索のみでヒットした
+    ドキュメントも返せるようにする。商品IDやFAQ IDは本文に含まれないため、
+    INDEXED_METADATA_FIELDS のメタデータ値も索引語に加える。
+    検索と更新はロックで直列化する（バックグラウンドの再インデックス中の検索に備える）
+    """
+
+    INDEXED_METADATA_FIELDS = ("product_id", "faq_id", "product_name")
+
+    def __init__(self, path: Path, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add_documents(
+        self, texts: List[str], metadatas: List[Dict[str, Any]], ids: List[str]
+    ) -> None:
+        """ドキュメントを追加（同一IDは置き換え）"""
+        with self._lock:
+            for text, metadata, doc_id in zip(texts, metadatas, ids):
+                if doc_id in self._documents:
+                    self._remove(doc_id)
+
+                indexed_values = [
+                    str(metadata[field])
+                    for field in self.INDEXED_METADATA_FIELDS
+                    if field in metadata
+                ]
+                term_freqs = Counter(tokenize(" ".join([text, *indexed_values])))
+                self._documents[doc_id] = {
+                    "text": text,
+                    "metadata": metadata,
+                    "term_freqs": dict(term_freqs),
+                    "length": sum(term_freqs.values()),
+                }
+                self._index_terms(doc_id, term_freqs)
+                self._total_length += self._documents[doc_id]["length"]
+
+            self._dirty = True
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """指定IDのドキュメントを削除"""
+        with self._lock:
+            for doc_id in ids:
+                if doc_id in self._documents:
+                    self._remove(doc_id)
+                    self._dirty = True
+
+    def clear(self) -> None:
+        """全ドキュメントを削除"""
+        with self._lock:
+            self._documents.clear()
+            self._postings.clear()
+            self._total_length = 0
+            self._dirty = True
+
+    def get_document(self, doc_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """IDから本文とメタデータを取得"""
+        document = self._documents.get(doc_id)
+        if document is None:
+            return None
+        return document["text"], document["metadata"]
+
+    def search(
+        self,
+        query: str,
+        n_results: int,
+        metadata_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """BM25スコア上位のドキュメントIDとスコアを取得
+
+        metadata_filter を指定した場合、メタデータが条件を満たすドキュメントのみを返す
+        """
+        with self._lock:
+            if not self._documents:
+                return []
+
+            num_docs = len(self._documents)
+            avg_length = self._total_length / num_docs if num_docs else 0.0
+            scores: Dict[str, float] = {}
+
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self._documents[doc_id]["length"]
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+            if metadata_filter is not None:
+                scores = {
+                    doc_id: score
+                    for doc_id, score in scores.items()
+                    if metadata_filter(self._documents[doc_id]["metadata"])
+                }
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return ranked[:n_results]
+
+    def save(self) -> None:
+        """インデックスをディスクに書き出す"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            data = {
+                "k1": self.k1,
+                "b": self.b,
+                "documents": {
+                    doc_id: {
+                        "text": document["text"],
+                        "metadata": document["metadata"],
+                        "term_freqs": document["term_freqs"],
+                    }
+                    for doc_id, document in self._documents.items()
+                },
+            }
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+            logger.info(f"Saved BM25 index with {len(self._documents)} documents to {self.path}")
+
+    def _load(self) -> None:
+        """既存のインデックスを読み込み、転置リストを再構築"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            for doc_id, document in data.get("documents", {}).items():
+                term_freqs = document["term_freqs"]
+                length = sum(term_freqs.values())
+                self._documents[doc_id] = {
+                    "text": document["text"],
+                    "metadata": document["metadata"],
+                    "term_freqs": term_freqs,
+                    "length": length,
+                }
+                self._index_terms(doc_id, term_freqs)
+                self._total_length += length
+
+            logger.info(f"Loaded BM25 index with {len(self._documents)} documents from {self.path}")
+
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Ignoring corrupted BM25 index {self.path}: {e}")
+            self.clear()
+            self._dirty = False
+
+    def _index_terms(self, doc_id: str, term_freqs: Dict[str, int]) -> None:
+        """転置リストにドキュメントの語を登録"""
+        for term, tf in term_freqs.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove(self, doc_id: str) -> None:
+        """転置リストとドキュメント表から削除"""
+        document = self._documents.pop(doc_id)
+        for term in document["term_freqs"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= document["length"]
@@ -0,0 +1,168 @@
+import logging
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class IVFIndex:
+    """転置ファイル（IVF）による近似最近傍探索の粗い量子化器
+
+    L2正規化済みの埋め込みを球面k-meansで nlist 個のクラスタに分け、検索時は
+    クエリに近い nprobe 個のクラスタに属する行のみを候補とする（候補行との類似度は
+    呼び出し側で厳密に計算する）。nprobe を増やすほど再現率が上がり、検索は遅くなる。
+
+    各行の所属クラスタ（assignments）は行の追加・移動に合わせて更新し、
+    クラスタごとの行リストは次の検索時に作り直す。学習時の行数の
+    RETRAIN_GROWTH 倍を超えて行が増えた場合は needs_training() が True を返す
+    """
+
+    MIN_TRAINING_ROWS = 1024
+    TRAINING_POINTS_PER_LIST = 256
+    RETRAIN_GROWTH = 4
+    ASSIGN_BLOCK_ROWS = 16384
+
+    def __init__(self, nlist: int = 0, nprobe: int = 8, iterations: int = 10, seed: int = 0):
+        if nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self._trained_size = 0
+        self._list_offsets: Optional[np.ndarray] = None
+        self._list_rows: Optional[np.ndarray] = None
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def num_lists(self) -> int:
+        return 0 if self._centroids is None else len(self._centroids)
+
+    def reset(self) -> None:
+        """学習結果を破棄（次の検索時に学習し直す）"""
+        self._centroids = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._size = 0
+        self._trained_size = 0
+        self._invalidate_lists()
+
+    def needs_training(self, size: int) -> bool:
+        """現在の行数で（再）学習が必要かを判定（行数が少ない場合は全件探索の方が速い）"""
+        if size < self.MIN_TRAINING_ROWS:
+            return False
+        return not self.trained or size >= self._trained_size * self.RETRAIN_GROWTH
+
+    def resolve_nlist(self, size: int) -> int:
+        """クラスタ数を決定（0の場合は行数の平方根の4倍。各クラスタの学習点が不足しない範囲）"""
+        nlist = self.nlist if self.nlist > 0 else int(4 * math.sqrt(size))
+        return max(1, min(nlist, size // 39 or 1))
+
+    def train(self, matrix: np.ndarray) -> None:
+        """埋め込み行列（L2正規化済み）でクラスタ中心を学習し、全行を割り当てる"""
+        start = time.perf_counter()
+        size = matrix.shape[0]
+        nlist = self.resolve_nlist(size)
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(size, nlist * self.TRAINING_POINTS_PER_LIST)
+        sample_rows = np.sort(rng.choice(size, sample_size, replace=False))
+        sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            labels = self._nearest(sample, centroids)
+            counts = np.bincount(labels, minlength=nlist)
+            offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            nonempty = counts > 0
+            sums = np.zeros_like(centroids)
+            sums[nonempty] = np.add.reduceat(
+                sample[np.argsort(labels, kind="stable")], offsets[nonempty], axis=0
+            )
+
+            # 空になったクラスタは学習点からランダムに選び直す
+            empty = np.flatnonzero(~nonempty)
+            if len(empty):
+                sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = self._nearest(matrix[:size], self._centroids)
+        self._size = size
+        self._trained_size = size
+        self._invalidate_lists()
+        logger.info(
+            f"Trained IVF index with {nlist} lists on {sample_size} of {size} vectors "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+
+    def update(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """追加・更新された行を最も近いクラスタに割り当てる（末尾への追加を含む）"""
+        if self._centroids is None or len(rows) == 0:
+            return
+
+        required = max(self._size, int(rows.max()) + 1)
+        if required > len(self._assignments):
+            grown = np.zeros(max(required, len(self._assignments) * 2), dtype=np.int32)
+            grown[: self._size] = self._assignments[: self._size]
+            self._assignments = grown
+        self._assignments[rows] = self._nearest(vectors, self._centroids)
+        self._size = required
+        self._invalidate_lists()
+
+    def move_row(self, source: int, target: int) -> None:
+        """削除に伴う行の移動（source の行を target に移し、末尾の行を取り除く）"""
+        if self._centroids is None:
+            return
+        self._assignments[target] = self._assignments[source]
+        self._size -= 1
+        self._invalidate_lists()
+
+    def probe(self, query_vector: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """クエリに近い nprobe 個のクラスタに属する行番号を昇順で取得"""
+        assert self._centroids is not None
+        if self._list_offsets is None or self._list_rows is None:
+            self._build_lists()
+        assert self._list_offsets is not None and self._list_rows is not None
+
+        nprobe = min(nprobe or self.nprobe, len(self._centroids))
+        scores = self._centroids @ query_vector
+        if nprobe < len(scores):
+            lists = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        else:
+            lists = np.arange(len(scores))
+
+        rows = np.concatenate(
+            [self._list_rows[self._list_offsets[i] : self._list_offsets[i + 1]] for i in lists]
+        )
+        return np.sort(rows)
+
+    def _build_lists(self) -> None:
+        """所属クラスタごとの行リストを作成"""
+        assignments = self._assignments[: self._size]
+        self._list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=self.num_lists)
+        self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def _invalidate_lists(self) -> None:
+        self._list_offsets = None
+        self._list_rows = None
+
+    @classmethod
+    def _nearest(cls, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """各ベクトルに最も近い（内積が最大の）クラスタ中心を求める（メモリを抑えるため分割して計算）"""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), cls.ASSIGN_BLOCK_ROWS):
+            block = np.asarray(vectors[start : start + cls.ASSIGN_BLOCK_ROWS], dtype=np.float32)
+            labels[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return labels
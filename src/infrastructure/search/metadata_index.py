@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from domain.entities.search_filter import FilterCondition, SearchFilter
+
+
+class MetadataIndex:
+    """列指向メタデータに対する二次インデックス
+
+    検索フィルターの候補行を、全行のメタデータを走査せずに求める。
+    - 一致・候補条件（eq / in）: 値ごとの行のビットマップ（ブール配列）
+    - 範囲条件（gt / gte / lt / lte）: 数値をソートした配列と対応する行番号の二分探索
+
+    インデックスは条件に使われた列ごとに初回参照時に構築する。
+    元の列が変更された場合は invalidate() で破棄する
+    """
+
+    def __init__(self, columns: Dict[str, List[Any]], size: int):
+        self._columns = columns
+        self._size = size
+        self._bitmaps: Dict[str, Dict[Any, np.ndarray]] = {}
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def invalidate(self, columns: Dict[str, List[Any]], size: int) -> None:
+        """元の列の変更に伴い、構築済みのインデックスを破棄"""
+        self._columns = columns
+        self._size = size
+        self._bitmaps.clear()
+        self._sorted.clear()
+
+    def candidate_rows(self, search_filter: SearchFilter) -> np.ndarray:
+        """フィルターを満たす行番号を昇順で取得"""
+        mask = np.ones(self._size, dtype=bool)
+        for condition in search_filter.conditions:
+            mask &= self._condition_mask(condition)
+            if not mask.any():
+                break
+        return np.flatnonzero(mask)
+
+    def _condition_mask(self, condition: FilterCondition) -> np.ndarray:
+        """1つの条件を満たす行のビットマップを取得"""
+        if condition.field not in self._columns:
+            return np.zeros(self._size, dtype=bool)
+
+        if condition.operator == "eq":
+            return self._value_mask(condition.field, condition.value)
+        if condition.operator == "in":
+            mask = np.zeros(self._size, dtype=bool)
+            for value in condition.value:
+                mask |= self._value_mask(condition.field, value)
+            return mask
+        return self._range_mask(condition)
+
+    def _value_mask(self, field: str, value: Any) -> np.ndarray:
+        """値が一致する行のビットマップを取得"""
+        bitmaps = self._bitmaps.get(field)
+        if bitmaps is None:
+            bitmaps = self._build_bitmaps(field)
+            self._bitmaps[field] = bitmaps
+
+        bitmap = bitmaps.get(self._hashable(value))
+        return bitmap.copy() if bitmap is not None else np.zeros(self._size, dtype=bool)
+
+    def _build_bitmaps(self, field: str) -> Dict[Any, np.ndarray]:
+        """列の値ごとのビットマップを構築"""
+        rows_by_value: Dict[Any, List[int]] = {}
+        for row, value in enumerate(self._columns[field][: self._size]):
+            if value is not None:
+                rows_by_value.setdefault(self._hashable(value), []).append(row)
+
+        bitmaps = {}
+        for value, rows in rows_by_value.items():
+            bitmap = np.zeros(self._size, dtype=bool)
+            bitmap[rows] = True
+            bitmaps[value] = bitmap
+        return bitmaps
+
+    def _range_mask(self, condition: FilterCondition) -> np.ndarray:
+        """数値の範囲条件を満たす行のビットマップを取得"""
+        sorted_index = self._sorted.get(condition.field)
+        if sorted_index is None:
+            sorted_index = self._build_sorted(condition.field)
+            self._sorted[condition.field] = sorted_index
+        values, rows = sorted_index
+
+        start, end = 0, len(values)
+        if condition.operator == "gt":
+            start = int(np.searchsorted(values, condition.value, side="right"))
+        elif condition.operator == "gte":
+            start = int(np.searchsorted(values, condition.value, side="left"))
+        elif condition.operator == "lt":
+            end = int(np.searchsorted(values, condition.value, side="left"))
+        else:
+            end = int(np.searchsorted(values, condition.value, side="right"))
+
+        mask = np.zeros(self._size, dtype=bool)
+        mask[rows[start:end]] = True
+        return mask
+
+    def _build_sorted(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """列の数値をソートした配列と、対応する行番号の配列を構築"""
+        rows = [
+            row
+            for row, value in enumerate(self._columns[field][: self._size])
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        column = self._columns[field]
+        values = np.array([column[row] for row in rows], dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        return values[order], np.array(rows, dtype=np.int64)[order]
+
+    @staticmethod
+    def _hashable(value: Any) -> Optional[Any]:
+        """リスト等のハッシュ不可能な値をキーとして使えるように変換"""
+        if isinstance(value, list):
+            return tuple(value)
+        return value
@@ -0,0 +1,222 @@
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 0〜255の各値に立っているビット数（2値符号のハミング距離の計算用）
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint16)
+
+
+class QuantizedVectors:
+    """検索用に量子化した埋め込みのコード
+
+    L2正規化済みの埋め込みを次の形式で保持し、全精度（float32）より少ないメモリで
+    近似の類似度を計算する。近似スコアで絞り込んだ候補は呼び出し側で全精度の
+    埋め込みを使って再スコアリングする想定。
+    - none: float32（dimensions による次元の切り詰めのみ）
+    - float16: 半精度（1次元2バイト）。NumPyはfloat32に変換して計算するため、int8より遅い
+    - int8: ベクトルごとのスケールを持つ対称スカラー量子化（1次元1バイト + 4バイト）
+    - binary: 符号ビット（8次元1バイト）。類似度はハミング距離から近似する
+
+    dimensions を指定すると、先頭の dimensions 次元のみを使う（Matryoshka表現学習された
+    text-embedding-3 系のモデルは先頭の次元ほど情報を多く持つ）。切り詰めた後は再度L2正規化する
+    """
+
+    METHODS = ("none", "float16", "int8", "binary")
+    BLOCK_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, method: str = "none", dimensions: int = 0):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown quantization method: {method}")
+        if dimensions < 0:
+            raise ValueError("dimensions must not be negative")
+        self.method = method
+        self.dimensions = dimensions
+
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+        self._source_dimension = 0
+
+    @property
+    def name(self) -> str:
+        """量子化の表示名（例: int8/256d）"""
+        return f"{self.method}/{self.dimensions}d" if self.dimensions else self.method
+
+    @property
+    def code_dimension(self) -> int:
+        """切り詰め後の次元数"""
+        if self.dimensions and self.dimensions < self._source_dimension:
+            return self.dimensions
+        return self._source_dimension
+
+    def reset(self) -> None:
+        """コードを破棄"""
+        self._codes = None
+        self._scales = None
+        self._size = 0
+        self._source_dimension = 0
+
+    def build(self, matrix: np.ndarray) -> None:
+        """埋め込み行列全体を量子化（メモリマップの行列もブロックごとに読む）"""
+        start = time.perf_counter()
+        self.reset()
+        size = matrix.shape[0]
+        if size == 0:
+            return
+
+        self._allocate(size, matrix.shape[1])
+        block_rows = self._block_rows(matrix.shape[1])
+        for offset in range(0, size, block_rows):
+            block = np.asarray(matrix[offset : offset + block_rows], dtype=np.float32)
+            self._set(np.arange(offset, offset + len(block)), block)
+        self._size = size
+        logger.info(
+            f"Quantized {size} vectors to {self.name} "
+            f"({self.memory_bytes() / 1024 / 1024:.1f}MB, "
+            f"{(time.perf_counter() - start) * 1000:.0f}ms)"
+        )
+
+    def update(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """追加・更新された行を量子化（末尾への追加を含む）"""
+        if len(rows) == 0:
+            return
+
+        required = max(self._size, int(rows.max()) + 1)
+        if self._codes is None:
+            self._allocate(required, vectors.shape[1])
+        elif required > len(self._codes):
+            self._grow(max(required, len(self._codes) * 2))
+        self._set(rows, vectors)
+        self._size = required
+
+    def move_row(self, source: int, target: int) -> None:
+        """削除に伴う行の移動（source の行を target に移し、末尾の行を取り除く）"""
+        if self._codes is None:
+            return
+        self._codes[target] = self._codes[source]
+        if self._scales is not None:
+            self._scales[target] = self._scales[source]
+        self._size -= 1
+
+    def prepare_queries(self, query_vectors: np.ndarray) -> np.ndarray:
+        """クエリベクトル（L2正規化済み）をコードとの類似度計算用に変換"""
+        truncated = self._truncate(query_vectors)
+        if self.method == "binary":
+            return np.packbits(truncated > 0, axis=1)
+        return truncated
+
+    def similarities(self, prepared_queries: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """クエリと各行（Noneは全行）の近似コサイン類似度を計算（クエリ数 x 行数）"""
+        assert self._codes is not None
+        count = self._size if rows is None else len(rows)
+        result = np.empty((len(prepared_queries), count), dtype=np.float32)
+
+        block_rows = self._block_rows(self.code_dimension)
+        for offset in range(0, count, block_rows):
+            if rows is None:
+                codes = self._codes[offset : min(offset + block_rows, count)]
+                scales = (
+                    None if self._scales is None else self._scales[offset : offset + len(codes)]
+                )
+            else:
+                selected = rows[offset : offset + block_rows]
+                codes = self._codes[selected]
+                scales = None if self._scales is None else self._scales[selected]
+            result[:, offset : offset + len(codes)] = self._block_similarities(
+                prepared_queries, codes, scales
+            )
+        return result
+
+    def memory_bytes(self) -> int:
+        """保持しているコードのバイト数（行数分）"""
+        return self._size * self.bytes_per_vector()
+
+    def bytes_per_vector(self) -> int:
+        """1ベクトルあたりのコードのバイト数"""
+        dimension = self.code_dimension
+        if self.method == "float16":
+            return dimension * 2
+        if self.method == "int8":
+            return dimension + 4
+        if self.method == "binary":
+            return (dimension + 7) // 8
+        return dimension * 4
+
+    def _block_similarities(
+        self, queries: np.ndarray, codes: np.ndarray, scales: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """コードのブロックとの近似類似度を計算"""
+        if self.method == "binary":
+            dimension = self.code_dimension
+            hamming = np.stack(
+                [_POPCOUNT[np.bitwise_xor(codes, query)].sum(axis=1) for query in queries]
+            )
+            return 1.0 - 2.0 * hamming.astype(np.float32) / dimension
+
+        similarities = queries @ codes.astype(np.float32, copy=False).T
+        if scales is not None:
+            similarities *= scales
+        return similarities
+
+    def _block_rows(self, dimension: int) -> int:
+        """float32に展開しても BLOCK_BYTES に収まる1ブロックの行数"""
+        return max(1, self.BLOCK_BYTES // (max(dimension, 1) * 4))
+
+    def _allocate(self, capacity: int, source_dimension: int) -> None:
+        self._source_dimension = source_dimension
+        dimension = self.code_dimension
+        if self.method == "binary":
+            self._codes = np.zeros((capacity, (dimension + 7) // 8), dtype=np.uint8)
+        elif self.method == "int8":
+            self._codes = np.zeros((capacity, dimension), dtype=np.int8)
+            self._scales = np.zeros(capacity, dtype=np.float32)
+        elif self.method == "float16":
+            self._codes = np.zeros((capacity, dimension), dtype=np.float16)
+        else:
+            self._codes = np.zeros((capacity, dimension), dtype=np.float32)
+
+    def _grow(self, capacity: int) -> None:
+        assert self._codes is not None
+        codes = np.zeros((capacity,) + self._codes.shape[1:], dtype=self._codes.dtype)
+        codes[: self._size] = self._codes[: self._size]
+        self._codes = codes
+        if self._scales is not None:
+            scales = np.zeros(capacity, dtype=np.float32)
+            scales[: self._size] = self._scales[: self._size]
+            self._scales = scales
+
+    def _set(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """行のコードを書き込む"""
+        assert self._codes is not None
+        if vectors.shape[1] != self._source_dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: codes have {self._source_dimension}, "
+                f"got {vectors.shape[1]}"
+            )
+
+        truncated = self._truncate(vectors)
+        if self.method == "binary":
+            self._codes[rows] = np.packbits(truncated > 0, axis=1)
+        elif self.method == "int8":
+            assert self._scales is not None
+            scales = np.abs(truncated).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._codes[rows] = np.round(truncated / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._codes[rows] = truncated.astype(self._codes.dtype)
+
+    def _truncate(self, vectors: np.ndarray) -> np.ndarray:
+        """先頭の dimensions 次元に切り詰めて再度L2正規化"""
+        dimension = self.code_dimension
+        if dimension >= vectors.shape[1]:
+            return np.asarray(vectors, dtype=np.float32)
+
+        truncated = np.asarray(vectors[:, :dimension], dtype=np.float32)
+        norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return truncated / norms
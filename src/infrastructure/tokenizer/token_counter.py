@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCounter:
+    """ローカルでのトークン数計測
+
+    tiktokenが利用可能な場合はモデルのエンコーディングで正確に数え、
+    利用できない場合（未インストール・オフライン等）は文字数から概算する
+    """
+
+    FALLBACK_ENCODING = "cl100k_base"
+
+    def __init__(self, model: str = "text-embedding-3-large"):
+        self.model = model
+        self._encoding: Optional[Any] = self._load_encoding(model)
+
+    @property
+    def is_exact(self) -> bool:
+        """tiktokenによる正確な計測かどうか"""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """テキストのトークン数を取得"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return self._estimate(text)
+
+    @staticmethod
+    def _estimate(text: str) -> int:
+        """文字数ベースの概算（ASCIIは約4文字、それ以外は約1文字で1トークン）"""
+        ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+        return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+    @classmethod
+    def _load_encoding(cls, model: str) -> Optional[Any]:
+        """tiktokenのエンコーディングを読み込む"""
+        try:
+            import tiktoken
+        except ImportError:
+            logger.debug("tiktoken is not installed, using approximate token counts")
+            return None
+
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding(cls.FALLBACK_ENCODING)
+        except Exception as e:
+            logger.warning(f"Failed to load tiktoken encoding, using approximate counts: {e}")
+            return None
@@ -0,0 +1,26 @@
+from typing import Dict, Optional, Tuple
+
+# 1,000トークンあたりの概算単価（USD）: (入力, 出力)
+MODEL_PRICES_PER_1K_TOKENS: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4": (0.03, 0.06),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "text-embedding-3-large": (0.00013, 0.0),
+    "text-embedding-3-small": (0.00002, 0.0),
+    "text-embedding-ada-002": (0.0001, 0.0),
+}
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int = 0) -> Optional[float]:
+    """トークン数から概算コスト（USD）を計算（単価不明のモデルはNone）
+
+    モデル名は前方一致で最も長い単価表のキーに対応付ける（例: gpt-4o-2024-08-06 → gpt-4o）
+    """
+    matches = [name for name in MODEL_PRICES_PER_1K_TOKENS if model.startswith(name)]
+    if not matches:
+        return None
+
+    input_price, output_price = MODEL_PRICES_PER_1K_TOKENS[max(matches, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1000
@@ -0,0 +1,215 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """処理区間の計測結果
+
+    start / end は time.perf_counter() による単調増加の時刻（秒）
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    root: Optional["Span"] = field(default=None, repr=False, compare=False)
+    trace_spans: List["Span"] = field(default_factory=list, repr=False, compare=False)
+
+    @property
+    def duration_ms(self) -> float:
+        """所要時間（ミリ秒、未終了なら現在までの経過時間）"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """属性を設定"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """エクスポート用の辞書に変換"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+        }
+
+
+class LatencyHistogram:
+    """直近のレイテンシを保持し、パーセンタイルを計算する"""
+
+    def __init__(self, window_size: int = 10000):
+        self._samples: Deque[float] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, value_ms: float) -> None:
+        """レイテンシを記録"""
+        with self._lock:
+            self._samples.append(value_ms)
+            self.count += 1
+
+    def percentile(self, percentile: float) -> float:
+        """パーセンタイル値を取得（0〜100）"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, max(0, round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def summary(self) -> Dict[str, float]:
+        """p50 / p95 / p99 のサマリーを取得"""
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class JsonlSpanExporter:
+    """終了したスパンをJSON Lines形式でファイルに追記する"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: List[Span]) -> None:
+        """スパンを書き出す"""
+        lines = "".join(
+            json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n" for span in spans
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """軽量なトレーサー
+
+    span() で囲んだ区間の所要時間を計測する。スパンはcontextvarsで
+    入れ子関係を管理するため、呼び出し階層をまたいでも親子関係が保たれる
+    （asyncio.to_thread等でも同様）。ルートスパンの終了時にトレース全体を
+    エクスポーターへ渡し、スパン名ごとのレイテンシをヒストグラムに記録する。
+
+    ジェネレーターのようにyieldをまたぐ区間は、start_span / use_span / end_span で
+    スパンの開始・有効化・終了を個別に制御する
+    """
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None, window_size: int = 10000):
+        self.exporter = exporter
+        self.window_size = window_size
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """区間を計測するスパンを開始し、ブロック内で現在のスパンとする"""
+        span = self.start_span(name, **attributes)
+        try:
+            with self.use_span(span):
+                yield span
+        except Exception as e:
+            span.set_attribute("error", str(e))
+            raise
+        finally:
+            self.end_span(span)
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """現在のスパンを親としてスパンを開始（現在のスパンは切り替えない）"""
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start=time.perf_counter(),
+            attributes=dict(attributes),
+        )
+        span.root = parent.root if parent and parent.root else span
+        return span
+
+    @contextmanager
+    def use_span(self, span: Span) -> Iterator[Span]:
+        """ブロック内で指定のスパンを現在のスパンとする"""
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    def end_span(self, span: Span) -> None:
+        """スパンを終了して記録（ルートスパンならトレース全体をエクスポート）"""
+        if span.end is not None:
+            return
+
+        span.end = time.perf_counter()
+        root = span.root or span
+        root.trace_spans.append(span)
+        self._histogram(span.name).record(span.duration_ms)
+        if root is span:
+            self._export(span.trace_spans)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        """現在のスパンを取得"""
+        return _current_span.get()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """スパン名ごとのレイテンシのサマリーを取得"""
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.summary() for name, histogram in sorted(histograms.items())}
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = LatencyHistogram(self.window_size)
+                self._histograms[name] = histogram
+            return histogram
+
+    def _export(self, spans: List[Span]) -> None:
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(spans)
+        except OSError as e:
+            logger.warning(f"Failed to export trace spans: {e}")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """プロセス共通のトレーサーを取得"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """プロセス共通のトレーサーを差し替える"""
+    global _tracer
+    _tracer = tracer
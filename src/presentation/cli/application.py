@@ -1,5 +1,6 @@
 import logging
 import sys
+import time
 from typing import Optional
 
 from presentation.cli.container import DIContainer
@@ -14,23 +15,34 @@ class CLIApplication:
 
     アプリケーションのライフサイクルを管理し、
     各コンポーネントを協調させる
+
+    プロンプトは設定の読み込み後すぐに表示し、ベクトルDB・LLMクライアントは
+    ユーザーの入力中にバックグラウンドで構築する（startup_warm_up）
     """
 
+    ENTRY_MODULE = "presentation.cli.main"
+
     def __init__(self):
         self.container = DIContainer()
         self.presenter = CLIPresenter()
         self.question_handler: Optional[QuestionHandler] = None
+        self.initialize_ms = 0.0
 
-    def initialize(self) -> None:
+    def initialize(self, warm_up: bool = True) -> None:
         """アプリケーションを初期化"""
         try:
             logger.info("Initializing CLI application...")
+            start = time.perf_counter()
 
             self.container.initialize()
 
             self.question_handler = QuestionHandler(self.container, self.presenter)
+            self.initialize_ms = (time.perf_counter() - start) * 1000
+
+            if warm_up and self.container.settings.startup_warm_up:
+                self.container.start_warm_up()
 
-            logger.info("CLI application initialized successfully")
+            logger.info(f"CLI application initialized in {self.initialize_ms:.0f}ms")
 
         except ValueError as e:
             logger.error(f"Configuration error: {e}")
@@ -42,6 +54,32 @@ class CLIApplication:
             self.presenter.show_error(f"アプリケーションの初期化に失敗しました: {e}")
             sys.exit(1)
 
+    def report_startup(self) -> int:
+        """起動時間を計測して表示（目標時間内なら0、超過した場合は1を返す）
+
+        プロンプト表示までの時間に加え、初回の質問時に構築されるコンポーネントの
+        所要時間も参考値として計測する
+        """
+        from presentation.cli.startup_report import build_startup_report, loaded_heavy_modules
+
+        self.initialize(warm_up=False)
+        heavy_modules = loaded_heavy_modules()
+
+        try:
+            self.container.ensure_rag_service()
+        except Exception as e:
+            logger.warning(f"Failed to build components for the startup report: {e}")
+
+        report = build_startup_report(
+            self.ENTRY_MODULE,
+            self.initialize_ms,
+            heavy_modules,
+            self.container.startup_timings,
+            self.container.settings.startup_target_ms,
+        )
+        self.presenter.show_startup_report(report)
+        return 0 if report["within_target"] else 1
+
     def run(self) -> None:
         """アプリケーションのメインループを実行"""
         try:
@@ -66,3 +104,5 @@ class CLIApplication:
             logger.error(f"Unexpected error in main loop: {e}")
             self.presenter.show_error(f"予期しないエラーが発生しました: {e}")
             sys.exit(1)
+        finally:
+            self.container.shutdown()
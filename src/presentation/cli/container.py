@@ -1,11 +1,26 @@
 import logging
-from typing import Optional
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
 
-from application.services.rag.rag_service import RAGService
 from config.settings import Settings
-from infrastructure.repositories.chroma_vector_search_repository import ChromaVectorSearchRepository
-from infrastructure.repositories.json_faq_repository import JsonFAQRepository
-from infrastructure.repositories.json_product_repository import JsonProductRepository
+from infrastructure.tracing.tracer import JsonlSpanExporter, Tracer, set_tracer
+
+# LangChain・OpenAI・Chromaの読み込みは数秒かかるため、型注釈のためだけに読み込まず、
+# 各コンポーネントの初回利用時にインポートする
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
+    from application.services.indexing.data_reload_service import DataReloadService
+    from application.services.rag.rag_service import RAGService
+    from domain.repositories.vector_search_repository import VectorSearchRepository
+    from infrastructure.embeddings.query_embedding_cache import QueryEmbeddingCache
+    from infrastructure.repositories.json_faq_repository import JsonFAQRepository
+    from infrastructure.repositories.json_product_repository import JsonProductRepository
+    from infrastructure.repositories.plain_text_document_repository import (
+        PlainTextDocumentRepository,
+    )
 
 # from application.services.indexing.indexing_service import IndexingService
 
@@ -16,37 +31,40 @@ logger = logging.getLogger(__name__)
 class DIContainer:
     """Dependency Injection コンテナ
 
-    アプリケーションの依存関係を管理し、適切な順序で初期化を行う
+    アプリケーションの依存関係を管理し、適切な順序で初期化を行う。
+    initialize() では設定の読み込みのみを行い、リポジトリやRAGサービスは
+    初回参照時に構築する（質問しない経路では重いライブラリを読み込まない）。
+    start_warm_up() を呼ぶと、バックグラウンドスレッドで先にインデックスを開いておく。
+    data_reload_enabled の場合、RAGサービスの構築時にデータファイルの監視を開始する。
+    query_warm_up_on_startup の場合、RAGサービスの構築後に頻出クエリの埋め込みを
+    バックグラウンドで事前に計算しておく
     """
 
     def __init__(self):
         self._settings: Optional[Settings] = None
-        self._product_repo: Optional[JsonProductRepository] = None
-        self._faq_repo: Optional[JsonFAQRepository] = None
-        self._vector_repo: Optional[ChromaVectorSearchRepository] = None
+        self._product_repo: Optional["JsonProductRepository"] = None
+        self._faq_repo: Optional["JsonFAQRepository"] = None
+        self._support_repo: Optional["PlainTextDocumentRepository"] = None
+        self._embeddings: Optional["Embeddings"] = None
+        self._vector_repo: Optional["VectorSearchRepository"] = None
         # self._indexing_service: Optional[IndexingService] = None
-        self._rag_service: Optional[RAGService] = None
+        self._rag_service: Optional["RAGService"] = None
+        self._data_reload_service: Optional["DataReloadService"] = None
+
+        # ウォームアップスレッドと初回参照が同時に構築しないよう直列化する
+        self._lock = threading.RLock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self.startup_timings: Dict[str, float] = {}
 
     def initialize(self) -> None:
-        """依存関係を初期化"""
+        """依存関係を初期化（設定の読み込みのみ。各コンポーネントは初回参照時に構築）"""
         try:
             logger.info("Loading settings...")
             self._settings = Settings.from_env()
 
-            logger.info("Initializing repositories...")
-            self._product_repo = JsonProductRepository(self._settings)
-
-            self._faq_repo = JsonFAQRepository(self._settings)
-
-            self._vector_repo = ChromaVectorSearchRepository(self._settings)
-
-            logger.info("Initializing services...")
-            # self._indexing_service = IndexingService(
-            #     self._product_repo,
-            #     self._settings,
-            #     cast(Optional[JsonFAQRepository], self._faq_repo)
-            # )
-            self._rag_service = RAGService(self._vector_repo, self._settings)
+            if self._settings.trace_export_path:
+                set_tracer(Tracer(JsonlSpanExporter(Path(self._settings.trace_export_path))))
+                logger.info(f"Exporting trace spans to {self._settings.trace_export_path}")
 
             logger.info("Dependency injection completed")
 
@@ -54,6 +72,52 @@ class DIContainer:
             logger.error(f"Failed to initialize dependencies: {e}")
             raise RuntimeError(f"Dependency initialization failed: {e}")
 
+    def start_warm_up(self) -> None:
+        """バックグラウンドでRAGサービス（ベクトルDB・埋め込み・LLMクライアント）を構築
+
+        ユーザーが最初の質問を入力している間にインデックスを開いておく。
+        失敗した場合はログに記録し、初回の質問時に改めて構築する
+        """
+        if self._warm_up_thread is not None:
+            return
+
+        def warm_up() -> None:
+            try:
+                self.ensure_rag_service()
+                logger.info(f"Warm-up completed in {self.startup_timings['components_ms']:.0f}ms")
+            except Exception as e:
+                logger.warning(f"Warm-up failed, retrying on first use: {e}")
+
+        self._warm_up_thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+        self._warm_up_thread.start()
+
+    def shutdown(self) -> None:
+        """バックグラウンドの処理（データファイルの監視）を停止し、埋め込みキャッシュとクエリ履歴を保存"""
+        if self._data_reload_service is not None:
+            self._data_reload_service.stop()
+
+        query_cache = self.query_embedding_cache
+        if query_cache is not None:
+            try:
+                query_cache.close()
+            except OSError as e:
+                logger.warning(f"Failed to save query embedding cache: {e}")
+
+        if self._embeddings is not None:
+            from infrastructure.embeddings.embedding_factory import flush_embeddings
+
+            try:
+                flush_embeddings(self._embeddings)
+            except OSError as e:
+                logger.warning(f"Failed to save embedding cache: {e}")
+
+    def wait_for_warm_up(self, timeout: Optional[float] = None) -> bool:
+        """ウォームアップの完了を待つ（完了していればTrue）"""
+        if self._warm_up_thread is None:
+            return self._rag_service is not None
+        self._warm_up_thread.join(timeout)
+        return not self._warm_up_thread.is_alive() and self._rag_service is not None
+
     @property
     def settings(self) -> Settings:
         """設定を取得"""
@@ -62,23 +126,66 @@ class DIContainer:
         return self._settings
 
     @property
-    def product_repo(self) -> JsonProductRepository:
+    def product_repo(self) -> "JsonProductRepository":
         """商品リポジトリを取得"""
-        if self._product_repo is None:
-            raise RuntimeError("Product repository not initialized. Call initialize() first.")
-        return self._product_repo
+        with self._lock:
+            if self._product_repo is None:
+                from infrastructure.repositories.json_product_repository import (
+                    JsonProductRepository,
+                )
+
+                self._product_repo = JsonProductRepository(self.settings)
+            return self._product_repo
 
     @property
-    def faq_repo(self) -> Optional[JsonFAQRepository]:
+    def faq_repo(self) -> Optional["JsonFAQRepository"]:
         """FAQリポジトリを取得"""
-        return self._faq_repo
+        with self._lock:
+            if self._faq_repo is None:
+                from infrastructure.repositories.json_faq_repository import JsonFAQRepository
+
+                self._faq_repo = JsonFAQRepository(self.settings)
+            return self._faq_repo
+
+    @property
+    def support_repo(self) -> "PlainTextDocumentRepository":
+        """サポート文書リポジトリを取得"""
+        with self._lock:
+            if self._support_repo is None:
+                from infrastructure.repositories.plain_text_document_repository import (
+                    PlainTextDocumentRepository,
+                )
+
+                self._support_repo = PlainTextDocumentRepository(self.settings)
+            return self._support_repo
 
     @property
-    def vector_repo(self) -> ChromaVectorSearchRepository:
+    def vector_repo(self) -> "VectorSearchRepository":
         """ベクトルリポジトリを取得"""
-        if self._vector_repo is None:
-            raise RuntimeError("Vector repository not initialized. Call initialize() first.")
-        return self._vector_repo
+        with self._lock:
+            if self._vector_repo is None:
+                start = time.perf_counter()
+                logger.info("Initializing repositories...")
+                from infrastructure.embeddings.embedding_factory import create_embeddings
+                from infrastructure.repositories.vector_search_repository_factory import (
+                    create_vector_search_repository,
+                )
+
+                self._embeddings = create_embeddings(self.settings)
+                self._vector_repo = create_vector_search_repository(self.settings, self._embeddings)
+                self.startup_timings["vector_repo_ms"] = (time.perf_counter() - start) * 1000
+            return self._vector_repo
+
+    @property
+    def query_embedding_cache(self) -> Optional["QueryEmbeddingCache"]:
+        """クエリ埋め込みのキャッシュを取得（未構築・無効の場合はNone）"""
+        if self._embeddings is None:
+            return None
+        from infrastructure.embeddings.query_embedding_cache import QueryEmbeddingCache
+
+        if isinstance(self._embeddings, QueryEmbeddingCache):
+            return self._embeddings
+        return None
 
     # @property
     # def indexing_service(self) -> IndexingService:
@@ -88,8 +195,113 @@ class DIContainer:
     #     return self._indexing_service
 
     @property
-    def rag_service(self) -> RAGService:
+    def rag_service(self) -> "RAGService":
         """RAGサービスを取得"""
-        if self._rag_service is None:
-            raise RuntimeError("RAG service not initialized. Call initialize() first.")
-        return self._rag_service
+        return self.ensure_rag_service()
+
+    def ensure_rag_service(self) -> "RAGService":
+        """RAGサービスを構築して返す（構築済みならそのまま返す）
+
+        構築にかかった時間は startup_timings に記録する
+        """
+        with self._lock:
+            if self._rag_service is None:
+                start = time.perf_counter()
+                self._rag_service = self._build_rag_service()
+                self.startup_timings["components_ms"] = (time.perf_counter() - start) * 1000
+            return self._rag_service
+
+    def _embeddings_or_raise(self) -> "Embeddings":
+        """ベクトルリポジトリと共有する埋め込みクライアントを取得"""
+        if self._embeddings is None:
+            raise RuntimeError("Embeddings not initialized")
+        return self._embeddings
+
+    def _start_data_reload(self, vector_repo: "VectorSearchRepository") -> None:
+        """データファイルの監視と差分の再インデックス化を開始"""
+        from application.services.indexing.data_reload_service import DataReloadService
+        from application.services.indexing.indexing_service import IndexingService
+
+        settings = self.settings
+        product_repo = self.product_repo
+        faq_repo = self.faq_repo
+        support_repo = self.support_repo
+        indexing_service = IndexingService(product_repo, settings, faq_repo, support_repo)
+        self._data_reload_service = DataReloadService(
+            indexing_service,
+            vector_repo,
+            product_repo,
+            faq_repo,
+            interval_seconds=settings.data_reload_interval_seconds,
+            support_repo=support_repo,
+        )
+        self._data_reload_service.start(
+            product_repo.source_path,
+            faq_repo.source_path if faq_repo else None,
+            support_repo.source_path,
+        )
+
+    def _start_query_warm_up(self) -> None:
+        """頻出クエリとテストクエリの埋め込みをバックグラウンドで事前に計算"""
+        from application.services.rag.query_cache_warm_up import warm_up_query_cache
+
+        settings = self.settings
+        embeddings = self._embeddings_or_raise()
+
+        def warm_up() -> None:
+            try:
+                warm_up_query_cache(settings, embeddings)
+            except Exception as e:
+                logger.warning(f"Query embedding warm-up failed: {e}")
+
+        threading.Thread(target=warm_up, name="query-warm-up", daemon=True).start()
+
+    def _build_rag_service(self) -> "RAGService":
+        """RAGサービスと依存するコンポーネントを構築"""
+        try:
+            vector_repo = self.vector_repo
+
+            start = time.perf_counter()
+            logger.info("Initializing services...")
+            from application.services.indexing.index_manifest import IndexManifest
+            from application.services.rag.answer_cache import AnswerCache
+            from application.services.rag.rag_service import RAGService
+            from application.services.rag.rerank_service import RerankService
+            from infrastructure.rerankers.reranker_factory import create_reranker
+
+            settings = self.settings
+            # self._indexing_service = IndexingService(
+            #     self.product_repo,
+            #     settings,
+            #     cast(Optional[JsonFAQRepository], self.faq_repo)
+            # )
+            answer_cache = None
+            if settings.answer_cache_enabled:
+                answer_cache = AnswerCache(
+                    ttl_seconds=settings.answer_cache_ttl_seconds,
+                    max_entries=settings.answer_cache_max_entries,
+                    similarity_threshold=settings.answer_cache_similarity_threshold,
+                    embed_query=self._embeddings_or_raise().embed_query,
+                    index_version_provider=lambda: IndexManifest.version_token(settings),
+                )
+            rerank_service = None
+            reranker = create_reranker(settings)
+            if reranker is not None:
+                rerank_service = RerankService(
+                    reranker,
+                    batch_size=settings.rerank_batch_size,
+                    latency_budget_ms=settings.rerank_latency_budget_ms,
+                    cache_max_entries=settings.rerank_cache_max_entries,
+                )
+                logger.info(f"Re-ranking enabled with {reranker.name}")
+            rag_service = RAGService(vector_repo, settings, answer_cache, rerank_service)
+            if settings.data_reload_enabled:
+                self._start_data_reload(vector_repo)
+            if settings.query_warm_up_on_startup:
+                self._start_query_warm_up()
+            self.startup_timings["rag_service_ms"] = (time.perf_counter() - start) * 1000
+            return rag_service
+
+        except Exception as e:
+            logger.error(f"Failed to initialize dependencies: {e}")
+            raise RuntimeError(f"Dependency initialization failed: {e}")
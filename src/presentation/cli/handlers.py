@@ -21,8 +21,13 @@ class QuestionHandler:
                 return
 
             self.presenter.show_message("\n回答を生成中...")
-            result = self.container.rag_service.answer(question)
-            self.presenter.display_query_result(result)
+            for event in self.container.rag_service.answer_stream(question):
+                if event.event_type == "documents":
+                    self.presenter.show_answer_header()
+                elif event.event_type == "token":
+                    self.presenter.show_answer_token(event.token)
+                elif event.event_type == "done" and event.result is not None:
+                    self.presenter.display_streamed_result(event.result)
 
         except Exception as e:
             logger.error(f"Error during question processing: {e}")
@@ -1,3 +1,4 @@
+import argparse
 import logging
 import sys
 
@@ -7,11 +8,21 @@ from presentation.cli.application import CLIApplication
 
 def main() -> None:
     """メインエントリーポイント"""
+    parser = argparse.ArgumentParser(description="TechMart ChatBot")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="起動時間（モジュールの読み込みと初期化）を計測して表示し、目標時間を超えたら終了コード1で終了する",
+    )
+    args = parser.parse_args()
+
     setup_logging()
     logger = logging.getLogger(__name__)
 
     try:
         app = CLIApplication()
+        if args.startup_report:
+            sys.exit(app.report_startup())
         app.initialize()
         app.run()
     except Exception as e:
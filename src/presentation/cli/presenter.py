@@ -1,4 +1,6 @@
-from domain.entities.query_result import QueryResult
+from typing import Any, Dict, List
+
+from domain.entities.query_result import Document, QueryResult
 
 
 class CLIPresenter:
@@ -36,40 +38,92 @@ class CLIPresenter:
 
     def display_query_result(self, result: QueryResult) -> None:
         """検索結果を表示"""
+        self.show_answer_header()
+        print(result.answer)
+        self.display_source_documents(result.source_documents)
+        print("\n" + "=" * 50 + "\n")
+
+    def show_answer_header(self) -> None:
+        """回答の見出しを表示"""
         print("\n" + "=" * 50)
         print("【回答】")
         print("=" * 50)
-        print(result.answer)
 
-        if result.source_documents:
-            print("\n" + "=" * 50)
-            print("【参照した商品情報】")
-            print("=" * 50)
-
-            for i, doc in enumerate(result.source_documents, 1):
-                print(f"\n--- 参照 {i} ---")
-                print(
-                    doc.page_content[:200] + "..."
-                    if len(doc.page_content) > 200
-                    else doc.page_content
-                )
-
-                if doc.metadata:
-                    data_type = doc.metadata.get("data_type", "product")
-                    if data_type == "faq":
-                        faq_id = doc.metadata.get("faq_id", "不明")
-                        category = doc.metadata.get("category", "不明")
-                        print(f"\nFAQ ID: {faq_id}, カテゴリ: {category}")
-                    else:
-                        product_id = doc.metadata.get("product_id", "不明")
-                        product_name = doc.metadata.get("product_name", "不明")
-                        print(f"\n商品ID: {product_id}, 商品名: {product_name}")
-
-                if hasattr(doc, "score") and doc.score:
-                    print(f"関連度スコア: {doc.score:.4f}")
+    def show_answer_token(self, token: str) -> None:
+        """ストリーミング中の回答の断片を表示"""
+        print(token, end="", flush=True)
+
+    def display_streamed_result(self, result: QueryResult) -> None:
+        """ストリーミング完了後に参照情報とレイテンシを表示"""
+        print()
+        self.display_source_documents(result.source_documents)
+
+        if "total_ms" in result.timings:
+            first_token_ms = result.timings.get("first_token_ms", result.timings["total_ms"])
+            print(
+                f"\n(初回トークン: {first_token_ms / 1000:.2f}秒, "
+                f"合計: {result.timings['total_ms'] / 1000:.2f}秒"
+                f"{', キャッシュ' if result.from_cache else ''})"
+            )
 
         print("\n" + "=" * 50 + "\n")
 
+    def display_source_documents(self, documents: List[Document]) -> None:
+        """参照したドキュメントを表示"""
+        if not documents:
+            return
+
+        print("\n" + "=" * 50)
+        print("【参照した商品情報】")
+        print("=" * 50)
+
+        for i, doc in enumerate(documents, 1):
+            print(f"\n--- 参照 {i} ---")
+            print(
+                doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content
+            )
+
+            if doc.metadata:
+                data_type = doc.metadata.get("data_type", "product")
+                if data_type == "faq":
+                    faq_id = doc.metadata.get("faq_id", "不明")
+                    category = doc.metadata.get("category", "不明")
+                    print(f"\nFAQ ID: {faq_id}, カテゴリ: {category}")
+                elif data_type == "support":
+                    document_id = doc.metadata.get("document_id", "不明")
+                    section = doc.metadata.get("section", "不明")
+                    print(f"\n文書: {document_id}, セクション: {section}")
+                else:
+                    product_id = doc.metadata.get("product_id", "不明")
+                    product_name = doc.metadata.get("product_name", "不明")
+                    print(f"\n商品ID: {product_id}, 商品名: {product_name}")
+
+            if hasattr(doc, "score") and doc.score:
+                print(f"関連度スコア: {doc.score:.4f}")
+
     def prompt_question(self) -> str:
         """質問の入力を促す"""
         return input("ご質問をどうぞ: ").strip()
+
+    def show_startup_report(self, report: Dict[str, Any]) -> None:
+        """起動時間のレポートを表示"""
+        print("\n=== 起動時間レポート ===")
+        print(f"モジュール読み込み ({report['entry_module']}): {report['import_ms']:.0f}ms")
+        print(f"初期化（プロンプト表示まで）: {report['initialize_ms']:.0f}ms")
+        status = "OK" if report["within_target"] else "目標超過"
+        print(
+            f"起動時間: {report['startup_ms']:.0f}ms "
+            f"(目標: {report['target_ms']:.0f}ms, {status})"
+        )
+
+        heavy_modules = report["heavy_modules_loaded"]
+        print(f"起動時に読み込まれた重いライブラリ: {', '.join(heavy_modules) or 'なし'}")
+
+        print("\n読み込みに時間のかかったモジュール (累積):")
+        for item in report["slowest_imports"]:
+            print(f"  {item['cumulative_ms']:8.1f}ms  {item['module']}")
+
+        if report["component_timings"]:
+            print("\n初回利用時の構築時間（バックグラウンドで実行）:")
+            for name, ms in report["component_timings"].items():
+                print(f"  {name}: {ms:.0f}ms")
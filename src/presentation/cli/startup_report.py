@@ -0,0 +1,110 @@
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+# 起動時に読み込まれていないことを確認する重いライブラリ
+HEAVY_MODULES = ("langchain_openai", "langchain_chroma", "chromadb", "openai", "tiktoken")
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    """モジュール1つの読み込み時間（python -X importtime の1行）"""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def measure_import_times(module: str) -> List[ImportTiming]:
+    """別プロセスで python -X importtime を実行し、モジュールの読み込み時間を計測
+
+    計測対象のプロセスと同じ sys.path を引き継ぎ、インポート済みのモジュールの
+    影響を受けないよう新しいインタープリタで計測する
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    timings = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(
+                ImportTiming(
+                    module=name,
+                    self_ms=int(self_us) / 1000,
+                    cumulative_ms=int(cumulative_us) / 1000,
+                    depth=max(len(indent) - 1, 0) // 2,
+                )
+            )
+    return timings
+
+
+def loaded_heavy_modules() -> List[str]:
+    """現在のプロセスで読み込み済みの重いライブラリを取得"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def build_startup_report(
+    entry_module: str,
+    initialize_ms: float,
+    heavy_modules_loaded: List[str],
+    component_timings: Dict[str, float],
+    target_ms: float,
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """起動時間のレポートを作成
+
+    起動時間はエントリーポイントの読み込み時間と、プロンプト表示までの初期化時間の合計とする。
+    component_timings には初回の質問時に構築されるコンポーネントの所要時間（参考値）を渡す
+    """
+    timings = measure_import_times(entry_module)
+    entry_index = next(
+        (i for i in range(len(timings) - 1, -1, -1) if timings[i].module == entry_module), None
+    )
+    import_ms = timings[entry_index].cumulative_ms if entry_index is not None else 0.0
+
+    # importtimeは依存モジュールを先に出力するため、エントリーポイントの直前にある
+    # より深い階層の行が、エントリーポイントから読み込まれたモジュールとなる
+    dependencies: List[ImportTiming] = []
+    if entry_index is not None:
+        entry_depth = timings[entry_index].depth
+        for timing in reversed(timings[:entry_index]):
+            if timing.depth <= entry_depth:
+                break
+            dependencies.append(timing)
+
+    slowest = sorted(
+        (t for t in dependencies if t.depth <= 2),
+        key=lambda t: t.cumulative_ms,
+        reverse=True,
+    )[:top_n]
+
+    startup_ms = import_ms + initialize_ms
+    return {
+        "entry_module": entry_module,
+        "import_ms": import_ms,
+        "initialize_ms": initialize_ms,
+        "startup_ms": startup_ms,
+        "target_ms": target_ms,
+        "within_target": startup_ms <= target_ms,
+        "heavy_modules_loaded": heavy_modules_loaded,
+        "slowest_imports": [
+            {"module": t.module, "cumulative_ms": t.cumulative_ms, "self_ms": t.self_ms}
+            for t in slowest
+        ],
+        "component_timings": dict(component_timings),
+    }
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+import sys
+
+from config.logging_config import setup_logging
+from presentation.cli.container import DIContainer
+from presentation.http.server import RAGHTTPServer
+
+
+def main() -> None:
+    """HTTPサーバーのエントリーポイント"""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    container = DIContainer()
+    try:
+        container.initialize()
+
+        server = RAGHTTPServer(
+            container.rag_service, container.settings, container.query_embedding_cache
+        )
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("HTTP server stopped")
+    except Exception as e:
+        logger.error(f"HTTP server failed: {e}")
+        sys.exit(1)
+    finally:
+        container.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import asyncio
+import dataclasses
+import json
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from application.services.rag.rag_service import RAGService
+from config.settings import Settings
+from domain.entities.query_result import QueryResult
+from infrastructure.embeddings.query_embedding_cache import QueryEmbeddingCache
+from infrastructure.tracing.tracer import get_tracer
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    """HTTPエラーレスポンスとして返す例外"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class RAGHTTPServer:
+    """RAGServiceを公開するasyncio製のHTTPサーバー
+
+    - 同時に実行する回答生成は http_max_concurrency 件まで
+    - 実行待ちが http_max_queue 件を超えたリクエストは即座に503で拒否（ロードシェディング）
+    - 待ち時間を含めて http_request_timeout_seconds を超えたリクエストは504で打ち切る
+      （スレッドで実行中の検索・リランキングは中断できないため、回答生成は打ち切らずに
+      最後まで実行し、終了してから実行枠を解放する。実行中の件数は上限を超えない）
+
+    エンドポイント:
+    - POST /answer  {"question": "..."} → 回答と参照ドキュメント
+    - GET  /health  → 稼働状況（実行中・待機中の件数）
+    - GET  /metrics → 処理段階ごとのレイテンシ（p50 / p95 / p99）と、
+      query_cache を渡した場合はクエリ埋め込みのキャッシュの統計（削減できたレイテンシ）
+    """
+
+    def __init__(
+        self,
+        rag_service: RAGService,
+        settings: Settings,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+    ):
+        if settings.http_max_concurrency < 1:
+            raise ValueError("http_max_concurrency must be at least 1")
+
+        self.rag_service = rag_service
+        self.settings = settings
+        self.query_cache = query_cache
+        self._semaphore = asyncio.Semaphore(settings.http_max_concurrency)
+        self._in_flight = 0
+        self._tasks: Set["asyncio.Task[QueryResult]"] = set()
+        self._waiting = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    async def serve_forever(self) -> None:
+        """サーバーを起動してリクエストを処理し続ける"""
+        server = await asyncio.start_server(
+            self._handle_connection,
+            self.settings.http_host,
+            self.settings.http_port,
+            limit=MAX_HEADER_BYTES,
+        )
+        logger.info(
+            f"HTTP server listening on {self.settings.http_host}:{self.settings.http_port} "
+            f"(concurrency: {self.settings.http_max_concurrency}, "
+            f"queue: {self.settings.http_max_queue}, "
+            f"timeout: {self.settings.http_request_timeout_seconds}s)"
+        )
+        async with server:
+            await server.serve_forever()
+
+    def stats(self) -> Dict[str, int]:
+        """サーバーの稼働状況を取得"""
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+        }
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """1接続分のリクエストを処理（1接続1リクエスト）"""
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                status, payload = await self._dispatch(method, path, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                logger.error(f"Unexpected error while handling request: {e}")
+                status, payload = 500, {"error": "Internal server error"}
+
+            await self._write_response(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """パスに応じて処理を振り分け"""
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Method not allowed")
+            return 200, {"status": "ok", **self.stats()}
+
+        if path == "/metrics":
+            if method != "GET":
+                raise HTTPError(405, "Method not allowed")
+            metrics: Dict[str, Any] = {"latency": get_tracer().summary()}
+            if self.query_cache is not None:
+                metrics["query_embedding_cache"] = self.query_cache.stats()
+            return 200, metrics
+
+        if path == "/answer":
+            if method != "POST":
+                raise HTTPError(405, "Method not allowed")
+            return 200, await self._answer(self._parse_question(body))
+
+        raise HTTPError(404, "Not found")
+
+    async def _answer(self, question: str) -> Dict[str, Any]:
+        """同時実行数と待ち行列の上限を守りつつ回答を生成"""
+        if self._semaphore.locked() and self._waiting >= self.settings.http_max_queue:
+            self._rejected += 1
+            raise HTTPError(503, "Server is busy, please retry later")
+
+        try:
+            return await asyncio.wait_for(
+                self._answer_with_slot(question), self.settings.http_request_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.warning(f"Request timed out for question: {question[:50]}...")
+            raise HTTPError(504, "Request timed out")
+
+    async def _answer_with_slot(self, question: str) -> Dict[str, Any]:
+        """実行枠を確保してから回答を生成"""
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        task = asyncio.ensure_future(self.rag_service.aanswer(question))
+        self._tasks.add(task)
+        task.add_done_callback(self._release_slot)
+        # タイムアウトで待機が取り消されても回答生成は続け、終了時に実行枠を解放する
+        result = await asyncio.shield(task)
+        return self._serialize_result(result)
+
+    def _release_slot(self, task: "asyncio.Task[QueryResult]") -> None:
+        """回答生成の終了時に実行枠を解放"""
+        self._tasks.discard(task)
+        self._in_flight -= 1
+        self._semaphore.release()
+        if not task.cancelled() and task.exception() is not None:
+            # 打ち切り済みのリクエストの失敗は待機側に届かないため、ここで記録する
+            logger.warning(f"Answer task finished with an error: {task.exception()}")
+
+    @staticmethod
+    def _parse_question(body: bytes) -> str:
+        """リクエストボディから質問を取り出す"""
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(400, f"Invalid JSON body: {e}")
+
+        question = data.get("question") if isinstance(data, dict) else None
+        if not isinstance(question, str) or not question.strip():
+            raise HTTPError(400, "'question' must be a non-empty string")
+        return question
+
+    @staticmethod
+    def _serialize_result(result: QueryResult) -> Dict[str, Any]:
+        """QueryResultをJSONレスポンス用の辞書に変換"""
+        return {
+            "query": result.query,
+            "answer": result.answer,
+            "from_cache": result.from_cache,
+            "timings": result.timings,
+            "usage": result.usage,
+            "source_documents": [
+                dataclasses.asdict(document) for document in result.source_documents
+            ],
+        }
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        """リクエストライン・ヘッダー・ボディを読み込む"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "Request header too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        content_length: Optional[int] = None
+        if "content-length" in headers:
+            try:
+                content_length = int(headers["content-length"])
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length header")
+
+        if content_length is not None and content_length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+
+        body = await reader.readexactly(content_length) if content_length else b""
+        path = target.split("?", 1)[0]
+        return method.upper(), path, body
+
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]
+    ) -> None:
+        """JSONレスポンスを書き出す"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        reason = HTTP_REASONS.get(status, "")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n"
+        )
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await writer.drain()